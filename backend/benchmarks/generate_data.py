@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator: fills a database with a realistic, referentially
+consistent marketplace (enterprises, GUs, users, jobs, vendors, commitments
+and applications) using batched bulk writes.
+
+Generation is deterministic for a given --seed. Cities and roles follow a
+Zipf-like popularity curve (--city-skew, --role-skew; 0 is uniform) so a few
+hot cities and roles dominate, as in production. Indexes are built, job roles
+seeded and market stats reconciled once the data is in.
+
+Usage:
+    python backend/benchmarks/generate_data.py --db-name setuhub_scale --drop \\
+        [--jobs 1000000] [--applications 2000000] [--seed 7]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from array import array
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+ROLES = [
+    "Last Mile Bike Captain", "Last Mile Van Captain", "Fulfillment Center Picker",
+    "Fulfillment Center Loader", "Warehouse Associate", "Sort Center Coordinator",
+    "Store Operations Executive", "Quality Control Inspector",
+]
+# state -> city -> pin code prefix
+GEOGRAPHY = {
+    "Karnataka": {"Bangalore": "560", "Mysore": "570", "Hubli": "580"},
+    "Maharashtra": {"Mumbai": "400", "Pune": "411", "Nagpur": "440"},
+    "Delhi": {"New Delhi": "110"},
+    "Haryana": {"Gurgaon": "122", "Faridabad": "121"},
+    "Tamil Nadu": {"Chennai": "600", "Coimbatore": "641"},
+    "Telangana": {"Hyderabad": "500"},
+    "West Bengal": {"Kolkata": "700"},
+    "Gujarat": {"Ahmedabad": "380", "Surat": "395"},
+    "Uttar Pradesh": {"Lucknow": "226", "Noida": "201"},
+    "Rajasthan": {"Jaipur": "302"},
+}
+ENTERPRISE_TYPES = ["qcom", "ecomm", "3pl"]
+FACILITY_TYPES = ["dark_store", "fc", "sort_center", "mother_hub"]
+NATURES_OF_JOB = ["full_time", "part_time", "contract"]
+EXPERIENCE = ["Fresher", "0-1 years", "1-2 years", "2-5 years"]
+APPLICATION_STATUSES = ["applied", "reviewed", "shortlisted", "rejected"]
+# Job status mix; committed and fulfilled jobs get a commitment
+JOB_STATUSES = ["open", "vendor_committed", "fulfilled", "cancelled"]
+JOB_STATUS_WEIGHTS = [60, 20, 15, 5]
+ENTITY_KINDS = ["enterprise", "gu", "user", "job", "vendor", "commitment", "application"]
+GENERATED_COLLECTIONS = ["enterprises", "gus", "users", "jobs", "vendors", "commitments", "applications",
+                         "job_roles", "stats"]
+
+
+def zipf_cum_weights(n, skew):
+    """Cumulative weights where rank r has popularity 1 / r**skew"""
+    total, cumulative = 0.0, []
+    for rank in range(1, n + 1):
+        total += 1 / rank ** skew
+        cumulative.append(total)
+    return cumulative
+
+
+class MarketplaceGenerator:
+    """Streams synthetic documents in batches; only small per-entity arrays stay in memory"""
+
+    def __init__(self, database, args):
+        self.database = database
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.span_seconds = args.days * 86400
+        self.counts = defaultdict(int)
+
+        cities = [(state, city, prefix) for state, cities in GEOGRAPHY.items() for city, prefix in cities.items()]
+        self.rng.shuffle(cities)
+        self.cities = cities
+        self.city_weights = zipf_cum_weights(len(cities), args.city_skew)
+        self.roles = self.rng.sample(ROLES, len(ROLES))
+        self.role_weights = zipf_cum_weights(len(self.roles), args.role_skew)
+
+    # Ids are derived from (kind, seed, index) so references never need a lookup
+    def entity_id(self, kind, index):
+        value = (ENTITY_KINDS.index(kind) << 112) | ((self.args.seed & 0xFFFF) << 96) | index
+        return str(uuid.UUID(int=value, version=4))
+
+    def timestamp(self, index, count):
+        return self.start + timedelta(seconds=self.span_seconds * index // max(count, 1))
+
+    def enterprise_user_index(self, enterprise_index):
+        return enterprise_index
+
+    def vendor_user_index(self, vendor_index):
+        return self.args.enterprises + vendor_index
+
+    def seeker_user_index(self, seeker_index):
+        return self.args.enterprises + self.args.vendors + seeker_index
+
+    async def write(self, collection, documents):
+        """insert_many in batches, keeping a few batches in flight while the next is generated"""
+        pending = set()
+        batch = []
+
+        async def flush(docs):
+            nonlocal pending
+            if len(pending) >= self.args.concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            pending.add(asyncio.create_task(self.database[collection].insert_many(docs, ordered=False)))
+
+        for document in documents:
+            batch.append(document)
+            if len(batch) == self.args.batch_size:
+                await flush(batch)
+                batch = []
+        if batch:
+            await flush(batch)
+        for task in asyncio.as_completed(pending):
+            await task
+        self.counts[collection] = await self.database[collection].estimated_document_count()
+
+    def enterprises(self):
+        from server import ENTERPRISE_NAMES
+        names = [name for name in ENTERPRISE_NAMES if name != "Other"]
+        self.enterprise_names = []
+        for i in range(self.args.enterprises):
+            name = names[i % len(names)]
+            self.enterprise_names.append(name if i < len(names) else f"{name} {i // len(names) + 1}")
+            yield {
+                "id": self.entity_id("enterprise", i),
+                "name": self.enterprise_names[-1],
+                "enterprise_type": self.rng.choice(ENTERPRISE_TYPES),
+                "created_at": self.timestamp(i, self.args.enterprises * 10).isoformat(),
+            }
+
+    def gus(self):
+        # Kept in memory (GUs number in the thousands) for jobs and vendor pin codes
+        from server import job_gu_fields
+        self.gu_enterprise = array("I")
+        self.gu_view = []
+        self.gu_city = array("H")
+        self.gu_pins = []
+        city_indexes = self.rng.choices(range(len(self.cities)), cum_weights=self.city_weights, k=self.args.gus)
+        for i, city_index in enumerate(city_indexes):
+            state, city, prefix = self.cities[city_index]
+            enterprise_index = self.rng.randrange(self.args.enterprises)
+            facility_type = self.rng.choice(FACILITY_TYPES)
+            pin_code = f"{prefix}{self.rng.randint(1, 99):03d}"
+            self.gu_enterprise.append(enterprise_index)
+            self.gu_city.append(city_index)
+            self.gu_pins.append(pin_code)
+            gu = {
+                "id": self.entity_id("gu", i),
+                "enterprise_id": self.entity_id("enterprise", enterprise_index),
+                "facility_type": facility_type,
+                "facility_name": f"{city} {facility_type.replace('_', ' ').title()} {i}",
+                "zone_name": f"{city} Zone {self.rng.randint(1, 9)}",
+                "address": f"{self.rng.randint(1, 400)} Industrial Area, {city}",
+                "city": city,
+                "state": state,
+                "pin_code": pin_code,
+                "created_at": self.timestamp(i, self.args.gus * 5).isoformat(),
+            }
+            self.gu_view.append(job_gu_fields(gu))
+            yield gu
+
+    def vendors(self):
+        # (city, role) -> vendor indexes serving it, to pick realistic committers
+        self.vendors_by_city_role = defaultdict(list)
+        pins_by_city = defaultdict(list)
+        for pin_code, city_index in zip(self.gu_pins, self.gu_city):
+            pins_by_city[city_index].append(pin_code)
+        for i in range(self.args.vendors):
+            city_indexes = set(self.rng.choices(range(len(self.cities)), cum_weights=self.city_weights,
+                                                k=self.rng.randint(1, 3)))
+            roles = set(self.rng.choices(self.roles, cum_weights=self.role_weights, k=self.rng.randint(1, 4)))
+            statewide = self.rng.random() < 0.2
+            states = sorted({self.cities[c][0] for c in city_indexes}) if statewide else []
+            if statewide:
+                city_indexes |= {c for c, (state, _, _) in enumerate(self.cities) if state in states}
+            for city_index in city_indexes:
+                for role in roles:
+                    self.vendors_by_city_role[(city_index, role)].append(i)
+            pins = [pin for c in city_indexes for pin in pins_by_city[c]]
+            yield {
+                "id": self.entity_id("vendor", i),
+                "name": f"{self.cities[min(city_indexes)][1]} Staffing Services {i}",
+                "gst_no": f"{self.rng.randint(10, 37)}ABCDE{i % 10000:04d}F1Z{self.rng.randint(1, 9)}"
+                if self.rng.random() < 0.7 else None,
+                "email": f"vendor_{i}@vendors.setuhub.com",
+                "phone": f"8{i:09d}",
+                "operating_states": states,
+                "operating_cities": sorted({self.cities[c][1] for c in city_indexes}),
+                "operating_pin_codes": self.rng.sample(pins, min(len(pins), self.rng.randint(0, 3))),
+                "services_offered": sorted(roles),
+                "created_at": self.timestamp(i, self.args.vendors * 5).isoformat(),
+            }
+
+    def users(self, password_hash):
+        common = {"password": password_hash}
+        for i in range(self.args.enterprises):
+            yield {**common, "id": self.entity_id("user", self.enterprise_user_index(i)),
+                   "username": f"enterprise_{i}@enterprises.setuhub.com",
+                   "email": f"enterprise_{i}@enterprises.setuhub.com", "user_type": "enterprise",
+                   "full_name": f"Enterprise Admin {i}", "phone": f"7{i:09d}",
+                   "enterprise_id": self.entity_id("enterprise", i),
+                   "created_at": self.timestamp(i, self.args.enterprises * 10).isoformat()}
+        for i in range(self.args.vendors):
+            yield {**common, "id": self.entity_id("user", self.vendor_user_index(i)),
+                   "username": f"vendor_{i}@vendors.setuhub.com", "email": f"vendor_{i}@vendors.setuhub.com",
+                   "user_type": "vendor", "full_name": f"Vendor Admin {i}", "phone": f"8{i:09d}",
+                   "vendor_id": self.entity_id("vendor", i),
+                   "created_at": self.timestamp(i, self.args.vendors * 5).isoformat()}
+        for i in range(self.args.job_seekers):
+            user_id = self.entity_id("user", self.seeker_user_index(i))
+            phone = f"9{i:09d}"
+            yield {**common, "id": user_id, "username": phone, "email": f"worker_{user_id}@setuhub.com",
+                   "user_type": "job_seeker", "full_name": f"Worker {i}", "phone": phone,
+                   "created_at": self.timestamp(i, self.args.job_seekers).isoformat()}
+
+    def jobs(self):
+        n = self.args.jobs
+        self.job_gu = array("I")
+        self.job_commitments = []  # (job index, vendor index, quantity, status, committed at)
+        for start in range(0, n, self.args.batch_size):
+            size = min(self.args.batch_size, n - start)
+            roles = self.rng.choices(self.roles, cum_weights=self.role_weights, k=size)
+            statuses = self.rng.choices(JOB_STATUSES, weights=JOB_STATUS_WEIGHTS, k=size)
+            for offset, (role, status) in enumerate(zip(roles, statuses)):
+                i = start + offset
+                gu_index = self.rng.randrange(self.args.gus)
+                enterprise_index = self.gu_enterprise[gu_index]
+                created_at = self.timestamp(i, n)
+                quantity = self.rng.randint(1, 50)
+                job = {
+                    "id": self.entity_id("job", i),
+                    "enterprise_id": self.entity_id("enterprise", enterprise_index),
+                    "gu_id": self.entity_id("gu", gu_index),
+                    "role": role,
+                    "quantity_required": quantity,
+                    "remaining_quantity": quantity if status == "open" else 0,
+                    "nature_of_job": self.rng.choice(NATURES_OF_JOB),
+                    "description": f"{role} needed at {self.cities[self.gu_city[gu_index]][1]}",
+                    "salary": f"₹{self.rng.randint(15, 40)},000/month",
+                    "experience_required": self.rng.choice(EXPERIENCE),
+                    "status": status,
+                    "created_by": self.entity_id("user", self.enterprise_user_index(enterprise_index)),
+                    "created_at": created_at.isoformat(),
+                    # Denormalized as the API writes them
+                    **self.gu_view[gu_index],
+                    "enterprise_name": self.enterprise_names[enterprise_index],
+                }
+                vendors = self.vendors_by_city_role.get((self.gu_city[gu_index], role))
+                if status in ("vendor_committed", "fulfilled") and vendors:
+                    vendor_index = self.rng.choice(vendors)
+                    committed_at = (created_at + timedelta(minutes=self.rng.randint(10, 72 * 60))).isoformat()
+                    job["committed_vendor_id"] = self.entity_id("vendor", vendor_index)
+                    job["commitment_timestamp"] = committed_at
+                    self.job_commitments.append((i, vendor_index, quantity,
+                                                 "fulfilled" if status == "fulfilled" else "committed",
+                                                 committed_at))
+                elif status in ("vendor_committed", "fulfilled"):
+                    # Nobody serves this city and role; leave it open
+                    job["status"] = "open"
+                    job["remaining_quantity"] = quantity
+                self.job_gu.append(gu_index)
+                yield job
+
+    def commitments(self):
+        for i, (job_index, vendor_index, quantity, status, committed_at) in enumerate(self.job_commitments):
+            yield {
+                "id": self.entity_id("commitment", i),
+                "job_id": self.entity_id("job", job_index),
+                "vendor_id": self.entity_id("vendor", vendor_index),
+                "poc_name": f"Vendor POC {vendor_index}",
+                "poc_contact": f"8{vendor_index:09d}",
+                "quantity": quantity,
+                "commitment_timestamp": committed_at,
+                "status": status,
+            }
+        self.job_commitments = []
+
+    def applications(self):
+        n = self.args.applications
+        for start in range(0, n, self.args.batch_size):
+            size = min(self.args.batch_size, n - start)
+            # Newer jobs draw more applicants: bias job choice towards the end of the range
+            job_indexes = [int(self.args.jobs * self.rng.random() ** 0.5) for _ in range(size)]
+            for offset, job_index in enumerate(job_indexes):
+                i = start + offset
+                seeker_index = self.rng.randrange(self.args.job_seekers)
+                enterprise_index = self.gu_enterprise[self.job_gu[job_index]]
+                applied_at = self.timestamp(job_index, self.args.jobs) + timedelta(
+                    minutes=self.rng.randint(5, 14 * 24 * 60))
+                yield {
+                    "id": self.entity_id("application", i),
+                    "job_id": self.entity_id("job", job_index),
+                    "user_id": self.entity_id("user", self.seeker_user_index(seeker_index)),
+                    "enterprise_id": self.entity_id("enterprise", enterprise_index),
+                    "applicant_name": f"Worker {seeker_index}",
+                    "applicant_phone": f"9{seeker_index:09d}",
+                    "experience": self.rng.choice(EXPERIENCE),
+                    "status": self.rng.choice(APPLICATION_STATUSES),
+                    "applied_at": applied_at.isoformat(),
+                }
+
+    async def generate(self, password_hash):
+        steps = [
+            ("enterprises", self.enterprises()),
+            ("gus", self.gus()),
+            ("vendors", self.vendors()),
+            ("users", self.users(password_hash)),
+            ("jobs", self.jobs()),
+            ("commitments", self.commitments()),
+            ("applications", self.applications()),
+        ]
+        for collection, documents in steps:
+            start = time.perf_counter()
+            await self.write(collection, documents)
+            print(f"  {collection:14} {self.counts[collection]:>10} docs in {time.perf_counter() - start:6.1f}s",
+                  file=sys.stderr)
+        return dict(self.counts)
+
+    def sample(self):
+        """Ids of a few generated entities, for benchmarks that need logged-in users"""
+        return {
+            "enterprise_id": self.entity_id("enterprise", 0),
+            "enterprise_user_id": self.entity_id("user", self.enterprise_user_index(0)),
+            "vendor_user_id": self.entity_id("user", self.vendor_user_index(0)),
+            "job_seeker_user_id": self.entity_id("user", self.seeker_user_index(0)),
+            "job_ids": [self.entity_id("job", i) for i in range(0, self.args.jobs, max(1, self.args.jobs // 1000))],
+            "cities": sorted({city for _, city, _ in self.cities}),
+        }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--enterprises", type=int, default=24)
+    parser.add_argument("--gus", type=int, default=5000)
+    parser.add_argument("--vendors", type=int, default=20000)
+    parser.add_argument("--job-seekers", type=int, default=200000)
+    parser.add_argument("--jobs", type=int, default=1000000)
+    parser.add_argument("--applications", type=int, default=2000000)
+    parser.add_argument("--city-skew", type=float, default=1.1, help="Zipf exponent for city popularity")
+    parser.add_argument("--role-skew", type=float, default=0.8, help="Zipf exponent for role popularity")
+    parser.add_argument("--days", type=int, default=180, help="spread creation times over this many days")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=4, help="insert_many batches in flight")
+    parser.add_argument("--password", default="SetuHub123!", help="password for every generated user")
+    return parser
+
+
+async def populate(database, args):
+    """Generate everything into `database`, then index it; returns (counts, sample ids)"""
+    import server
+
+    print(f"Generating into {database.name} (seed {args.seed})...", file=sys.stderr)
+    generator = MarketplaceGenerator(database, args)
+    # One bcrypt hash shared by all users; hashing per user would dominate the run
+    counts = await generator.generate(server.pwd_context.hash(args.password))
+
+    await server.ensure_indexes(database)
+    # seed_job_roles works on the module-level database
+    server.db = database
+    await server.seed_job_roles()
+    if getattr(args, "mongomock", False):
+        # mongomock has no $dateFromString; market stats keep their write-time counters
+        print("Skipping market stats reconciliation under mongomock", file=sys.stderr)
+    else:
+        await server.reconcile_market_stats(database)
+    return counts, generator.sample()
+
+
+async def main():
+    parser = build_parser()
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME"), required="DB_NAME" not in os.environ)
+    parser.add_argument("--drop", action="store_true", help="drop the generated collections first")
+    args = parser.parse_args()
+
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = args.db_name
+    import server
+
+    database = server.client[args.db_name]
+    if args.drop:
+        for collection in GENERATED_COLLECTIONS:
+            await database.drop_collection(collection)
+    elif await database.jobs.estimated_document_count():
+        sys.exit(f"{args.db_name} already has jobs; pass --drop to replace the generated collections")
+
+    start = time.perf_counter()
+    counts, _ = await populate(database, args)
+    print(f"Inserted {sum(counts.values())} documents in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    server.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Index benchmark: seeds a scratch database, times the hot lookups without
+indexes, provisions INDEX_SPECS and times them again.
+
+Usage: python backend/benchmarks/indexes.py [--jobs 200000] [--users 200000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import ensure_indexes  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+STATUSES = ["open", "vendor_committed", "fulfilled", "cancelled"]
+BATCH_SIZE = 10000
+
+
+async def seed(database, n_jobs, n_users):
+    enterprise_ids = [str(uuid.uuid4()) for _ in range(50)]
+    job_ids, user_ids = [], []
+
+    batch = []
+    for i in range(n_jobs):
+        job_id = str(uuid.uuid4())
+        job_ids.append(job_id)
+        batch.append({
+            "id": job_id,
+            "enterprise_id": random.choice(enterprise_ids),
+            "status": random.choice(STATUSES),
+            "created_at": f"2025-01-01T00:00:{i:012d}",
+        })
+        if len(batch) == BATCH_SIZE:
+            await database.jobs.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await database.jobs.insert_many(batch, ordered=False)
+
+    batch = []
+    for i in range(n_users):
+        user_id = str(uuid.uuid4())
+        user_ids.append(user_id)
+        batch.append({
+            "id": user_id,
+            "email": f"user_{i}@bench.setuhub.com",
+            "phone": f"9{i:09d}",
+            "user_type": "job_seeker",
+        })
+        if len(batch) == BATCH_SIZE:
+            await database.users.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await database.users.insert_many(batch, ordered=False)
+
+    return enterprise_ids, job_ids, user_ids
+
+
+async def time_queries(database, enterprise_ids, job_ids, user_ids, samples):
+    queries = {
+        "users.find_one(id)": lambda: database.users.find_one({"id": random.choice(user_ids)}),
+        "users.find_one(email)": lambda: database.users.find_one(
+            {"email": f"user_{random.randrange(len(user_ids))}@bench.setuhub.com"}),
+        "jobs.find_one(id)": lambda: database.jobs.find_one({"id": random.choice(job_ids)}),
+        "jobs.count(enterprise_id, status)": lambda: database.jobs.count_documents(
+            {"enterprise_id": random.choice(enterprise_ids), "status": "open"}),
+        "jobs.find(status).sort(created_at)": lambda: database.jobs.find(
+            {"status": "open"}).sort("created_at", -1).limit(10).to_list(10),
+    }
+    results = {}
+    for name, query in queries.items():
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            await query()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        results[name] = {
+            "p50_ms": round(timings[len(timings) // 2], 3),
+            "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        }
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--samples", type=int, default=50)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    db_name = f"{os.environ['DB_NAME']}_index_bench"
+    await client.drop_database(db_name)
+    database = client[db_name]
+
+    try:
+        print(f"Seeding {args.jobs} jobs and {args.users} users into {db_name}...")
+        ids = await seed(database, args.jobs, args.users)
+
+        before = await time_queries(database, *ids, args.samples)
+        await ensure_indexes(database)
+        after = await time_queries(database, *ids, args.samples)
+
+        print(f"\n{'query':40} {'before p50':>12} {'after p50':>12} {'speedup':>9}")
+        for name in before:
+            b, a = before[name]["p50_ms"], after[name]["p50_ms"]
+            speedup = f"{b / a:.1f}x" if a else "-"
+            print(f"{name:40} {b:>10.3f}ms {a:>10.3f}ms {speedup:>9}")
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
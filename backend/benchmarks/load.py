@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Load benchmark: runs the API in-process against a scratch database, seeds a
+synthetic marketplace and drives concurrent load at the hot read routes.
+Reports throughput, p50/p95/p99 latency and DB round trips per request as
+JSON, tagged with the commit so runs can be compared.
+
+Usage:
+    python backend/benchmarks/load.py [--mongo-url mongodb://localhost:27017] [--jobs 100000]
+    python backend/benchmarks/load.py --mongomock --jobs 5000 --output load.json
+
+Without --mongomock the MONGO_URL database `<DB_NAME>_load_bench` is used and
+dropped afterwards. mongomock-motor issues no driver commands, so DB ops per
+request are only reported against a real mongod.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_data import build_parser, populate  # noqa: E402
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def scenarios(ids):
+    """name -> (user type or None, url factory)"""
+    return {
+        "jobs": ("enterprise", lambda rng: "/api/jobs?limit=100"),
+        "jobs (city filter)": ("enterprise", lambda rng: f"/api/jobs?limit=100&city={rng.choice(ids['cities'])}"),
+        "jobs/{job_id}": ("enterprise", lambda rng: f"/api/jobs/{rng.choice(ids['job_ids'])}"),
+        "jobs/vendor-view": ("vendor", lambda rng: "/api/jobs/vendor-view?limit=100"),
+        "applications": ("job_seeker", lambda rng: "/api/applications?limit=100"),
+        "dashboard/enterprise": ("enterprise", lambda rng: f"/api/dashboard/enterprise/{ids['enterprise_id']}"),
+        "homepage/recent-jobs": (None, lambda rng: "/api/homepage/recent-jobs"),
+        "homepage/market-stats": (None, lambda rng: "/api/homepage/market-stats"),
+    }
+
+
+def db_commands_total(server):
+    """Total DB round trips recorded by the metrics middleware so far"""
+    with server.REQUEST_DB_COMMANDS.lock:
+        return sum(total for _, total, _ in server.REQUEST_DB_COMMANDS.values.values())
+
+
+async def run_scenario(server, http, user_type, make_url, tokens, args, rng):
+    headers = {"Authorization": f"Bearer {tokens[user_type]}"} if user_type else {}
+    urls = [make_url(rng) for _ in range(args.requests)]
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            url = queue.get_nowait()
+            start = time.perf_counter()
+            response = await http.get(url, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    db_before = db_commands_total(server)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.workers)))
+    elapsed = time.perf_counter() - start
+    db_ops = db_commands_total(server) - db_before
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2),
+        "db_ops_per_request": round(db_ops / len(latencies), 2) if not args.mongomock else None,
+    }
+
+
+async def main():
+    # Dataset options come from the data generator, scaled down by default
+    parser = build_parser()
+    parser.description = __doc__
+    parser.set_defaults(gus=2000, vendors=5000, job_seekers=10000, jobs=100000, applications=50000)
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--mongomock", action="store_true", help="use mongomock-motor instead of a mongod")
+    parser.add_argument("--requests", type=int, default=500, help="requests per route")
+    parser.add_argument("--workers", type=int, default=32, help="concurrent clients per route")
+    parser.add_argument("--routes", nargs="*", help="only run these scenarios")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = f"{os.environ.get('DB_NAME', 'setuhub')}_load_bench"
+    import server
+    # One log line per request would drown the report
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.mongomock:
+        from mongomock_motor import AsyncMongoMockClient
+        server.client = AsyncMongoMockClient()
+        server.db = server.client[os.environ["DB_NAME"]]
+    await server.client.drop_database(os.environ["DB_NAME"])
+
+    rng = random.Random(args.seed)
+    try:
+        seed_start = time.perf_counter()
+        _, ids = await populate(server.db, args)
+        seed_seconds = time.perf_counter() - seed_start
+
+        # Migrations, match index and stats, as on a real boot
+        await server.app.router.startup()
+        tokens = {user_type: server.create_token({"user_id": ids[f"{user_type}_user_id"], "user_type": user_type})
+                  for user_type in ("enterprise", "vendor", "job_seeker")}
+
+        results = {}
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for name, (user_type, make_url) in scenarios(ids).items():
+                if args.routes and name not in args.routes:
+                    continue
+                print(f"Driving {args.requests} requests at {name}...", file=sys.stderr)
+                results[name] = await run_scenario(server, http, user_type, make_url, tokens, args, rng)
+    finally:
+        await server.client.drop_database(os.environ["DB_NAME"])
+        await server.app.router.shutdown()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "backend": "mongomock" if args.mongomock else "mongod",
+        "dataset": {"enterprises": args.enterprises, "gus": args.gus, "jobs": args.jobs, "vendors": args.vendors,
+                    "job_seekers": args.job_seekers, "applications": args.applications,
+                    "city_skew": args.city_skew, "role_skew": args.role_skew, "seed": args.seed,
+                    "seed_seconds": round(seed_seconds, 1)},
+        "load": {"requests_per_route": args.requests, "workers": args.workers},
+        "routes": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Login burst load test: measures latency of an unrelated endpoint while a
+burst of concurrent logins hits the password hashing pool.
+
+Run the API first, then:
+    python backend/benchmarks/login_burst.py --base-url http://localhost:8001/api --logins 400
+"""
+
+import argparse
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def summarize(samples):
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50), 1),
+        "p99_ms": round(percentile(samples, 99), 1),
+        "max_ms": round(max(samples), 1),
+        "mean_ms": round(statistics.mean(samples), 1),
+    }
+
+
+def probe(url, stop_event, samples):
+    """Hit the unrelated endpoint back to back until told to stop"""
+    session = requests.Session()
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        session.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+
+
+def probe_for(url, seconds, probes):
+    samples, stop_event = [], threading.Event()
+    threads = [threading.Thread(target=probe, args=(url, stop_event, samples)) for _ in range(probes)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8001/api")
+    parser.add_argument("--probe-path", default="enterprise-list")
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--probes", type=int, default=4)
+    parser.add_argument("--baseline-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    email = f"burst_{uuid.uuid4().hex[:8]}@bench.setuhub.com"
+    password = "BurstPass123!"
+    requests.post(f"{args.base_url}/auth/register", json={
+        "email": email,
+        "password": password,
+        "user_type": "vendor",
+        "full_name": "Burst Test",
+        "phone": "9000000000",
+    }).raise_for_status()
+
+    probe_url = f"{args.base_url}/{args.probe_path}"
+    print(f"Baseline: probing {probe_url} for {args.baseline_seconds}s...")
+    baseline = probe_for(probe_url, args.baseline_seconds, args.probes)
+
+    print(f"Burst: {args.logins} logins at concurrency {args.concurrency}...")
+    burst_samples, stop_event = [], threading.Event()
+    probe_threads = [threading.Thread(target=probe, args=(probe_url, stop_event, burst_samples))
+                     for _ in range(args.probes)]
+    for thread in probe_threads:
+        thread.start()
+
+    login_statuses = []
+
+    def login(_):
+        response = requests.post(f"{args.base_url}/auth/login", json={"email": email, "password": password})
+        login_statuses.append(response.status_code)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(login, range(args.logins)))
+    burst_seconds = time.perf_counter() - start
+
+    stop_event.set()
+    for thread in probe_threads:
+        thread.join()
+
+    pool_stats = requests.get(f"{args.base_url}/admin/password-pool").json()
+
+    print(f"\nUnrelated endpoint /{args.probe_path}")
+    print(f"  baseline:     {summarize(baseline)}")
+    print(f"  during burst: {summarize(burst_samples)}")
+    print(f"\nLogins: {login_statuses.count(200)} ok, {login_statuses.count(429)} rejected (429), "
+          f"{len(login_statuses) - login_statuses.count(200) - login_statuses.count(429)} other "
+          f"in {burst_seconds:.1f}s")
+    print(f"Password pool: {pool_stats}")
+
+
+if __name__ == "__main__":
+    main()
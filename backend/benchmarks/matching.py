@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Matching benchmark: compares the JobMatchIndex against the per-job Python
+loop the vendor view used to run, on a synthetic in-memory marketplace.
+
+Usage: python backend/benchmarks/matching.py [--jobs 100000] [--vendors 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# The index is pure Python; no database is contacted
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "setuhub_bench")
+
+from server import JobMatchIndex  # noqa: E402
+
+ROLES = [
+    "Last Mile Bike Captain", "Last Mile Van Captain", "Fulfillment Center Picker",
+    "Fulfillment Center Loader", "Warehouse Associate", "Sort Center Coordinator",
+    "Store Operations Executive", "Quality Control Inspector",
+]
+STATES = {
+    "Karnataka": ["Bangalore", "Mysore", "Hubli"],
+    "Maharashtra": ["Mumbai", "Pune", "Nagpur"],
+    "Delhi": ["New Delhi"],
+    "Tamil Nadu": ["Chennai", "Coimbatore"],
+    "Telangana": ["Hyderabad"],
+    "West Bengal": ["Kolkata"],
+    "Gujarat": ["Ahmedabad", "Surat"],
+    "Uttar Pradesh": ["Lucknow", "Noida"],
+}
+
+
+def generate(n_jobs, n_vendors, n_gus, seed):
+    rng = random.Random(seed)
+    gus = []
+    for i in range(n_gus):
+        state = rng.choice(list(STATES))
+        gus.append({
+            "id": f"gu-{i}",
+            "city": rng.choice(STATES[state]),
+            "state": state,
+            "pin_code": f"{rng.randint(110000, 855000)}",
+        })
+    jobs = [{
+        "id": f"job-{i}",
+        "gu_id": rng.choice(gus)["id"],
+        "role": rng.choice(ROLES),
+        "created_at": f"2025-01-01T00:00:{i:09d}",
+    } for i in range(n_jobs)]
+    vendors = []
+    for i in range(n_vendors):
+        states = rng.sample(list(STATES), rng.randint(1, 2))
+        cities = [city for state in states for city in rng.sample(STATES[state], 1)]
+        vendors.append({
+            "id": f"vendor-{i}",
+            "operating_states": states if rng.random() < 0.2 else [],
+            "operating_cities": cities,
+            "operating_pin_codes": [rng.choice(gus)["pin_code"] for _ in range(rng.randint(0, 5))],
+            "services_offered": rng.sample(ROLES, rng.randint(1, 4)),
+        })
+    return {gu["id"]: gu for gu in gus}, jobs, vendors
+
+
+def loop_match(vendor, jobs, gus):
+    """The original get_vendor_jobs filter, one job at a time"""
+    matched = []
+    for job in jobs:
+        gu = gus.get(job["gu_id"])
+        if gu and (
+            gu["city"] in vendor["operating_cities"] or
+            gu["pin_code"] in vendor["operating_pin_codes"] or
+            gu["state"] in vendor["operating_states"]
+        ) and job["role"] in vendor["services_offered"]:
+            matched.append(job["id"])
+    return matched
+
+
+def timed(fn, samples):
+    timings = []
+    for sample in samples:
+        start = time.perf_counter()
+        fn(sample)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--vendors", type=int, default=5000)
+    parser.add_argument("--gus", type=int, default=2000)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    gus, jobs, vendors = generate(args.jobs, args.vendors, args.gus, args.seed)
+
+    start = time.perf_counter()
+    index = JobMatchIndex()
+    for job in jobs:
+        index.add_job(job, gus[job["gu_id"]])
+    for vendor in vendors:
+        index.add_vendor(vendor)
+    build_seconds = time.perf_counter() - start
+    print(f"Built index over {args.jobs} jobs and {args.vendors} vendors in {build_seconds:.2f}s: {index.stats()}")
+
+    rng = random.Random(args.seed)
+    vendor_samples = rng.sample(vendors, min(args.samples, len(vendors)))
+    job_samples = rng.sample(jobs, min(args.samples, len(jobs)))
+
+    for vendor in vendor_samples[:5]:
+        assert set(loop_match(vendor, jobs, gus)) == index.jobs_for_vendor(vendor)
+
+    results = {
+        "vendor -> jobs (python loop)": timed(lambda vendor: loop_match(vendor, jobs, gus), vendor_samples),
+        "vendor -> jobs (index, all)": timed(index.jobs_for_vendor, vendor_samples),
+        "vendor -> jobs (index, first page)": timed(lambda vendor: index.page_for_vendor(vendor, 0, 100),
+                                                    vendor_samples),
+        "job -> vendors (index)": timed(lambda job: index.vendors_for_job(job, gus[job["gu_id"]]), job_samples),
+    }
+    print(f"\n{'query':40} {'p50':>10} {'p95':>10}")
+    for name, result in results.items():
+        print(f"{name:40} {result['p50_ms']:>8.3f}ms {result['p95_ms']:>8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
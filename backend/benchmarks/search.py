@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Search benchmark: seeds a synthetic marketplace (1M jobs by default) into a
+scratch database and drives /api/jobs/search in-process with a mix of
+free-text, filtered and faceted queries. Reports p50/p95/p99 per query type
+as JSON and exits non-zero if any p95 is over --p95-budget-ms.
+
+Usage:
+    python backend/benchmarks/search.py [--mongo-url mongodb://localhost:27017] [--jobs 1000000]
+
+Needs a real mongod: mongomock has no $text. The database
+`<DB_NAME>_search_bench` is dropped afterwards.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlencode
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_data import GEOGRAPHY, NATURES_OF_JOB, ROLES, build_parser, populate  # noqa: E402
+from load import git_commit, run_scenario  # noqa: E402
+
+ROLE_TERMS = sorted({word.lower() for role in ROLES for word in role.split()})
+CITIES = [city for cities in GEOGRAPHY.values() for city in cities]
+
+
+def scenarios():
+    """name -> query string factory; every query is for open jobs"""
+    def search(**params):
+        return "/api/jobs/search?" + urlencode({key: value for key, value in params.items() if value})
+
+    return {
+        # The default call: every open job, newest first
+        "browse: unfiltered": lambda rng: search(),
+        "browse: unfiltered, later page": lambda rng: search(skip=rng.choice([20, 100, 500])),
+        "text: one term": lambda rng: search(q=rng.choice(ROLE_TERMS)),
+        "text: term + city": lambda rng: search(q=f"{rng.choice(ROLE_TERMS)} {rng.choice(CITIES)}"),
+        "text: phrase": lambda rng: search(q=f'"{rng.choice(ROLES).lower()}"'),
+        "text + city filter": lambda rng: search(q=rng.choice(ROLE_TERMS), city=rng.choice(CITIES)),
+        "text + state, nature filters": lambda rng: search(q=rng.choice(ROLE_TERMS), state=rng.choice(list(GEOGRAPHY)),
+                                                           nature_of_job=rng.choice(NATURES_OF_JOB)),
+        "browse: role + city": lambda rng: search(role=rng.choice(ROLES), city=rng.choice(CITIES)),
+        "text: second page": lambda rng: search(q=rng.choice(ROLE_TERMS), skip=20),
+    }
+
+
+async def main():
+    parser = build_parser()
+    parser.description = __doc__
+    # Search only reads jobs; keep the rest of the marketplace small
+    parser.set_defaults(jobs=1000000, vendors=2000, job_seekers=1000, applications=10000)
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--requests", type=int, default=300, help="requests per query type")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent clients per query type")
+    parser.add_argument("--p95-budget-ms", type=float, default=50.0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    args.mongomock = False
+
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = f"{os.environ.get('DB_NAME', 'setuhub')}_search_bench"
+    import server
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    await server.client.drop_database(os.environ["DB_NAME"])
+
+    rng = random.Random(args.seed)
+    try:
+        seed_start = time.perf_counter()
+        _, ids = await populate(server.db, args)
+        seed_seconds = time.perf_counter() - seed_start
+        await server.app.router.startup()
+        tokens = {"job_seeker": server.create_token({"user_id": ids["job_seeker_user_id"], "user_type": "job_seeker"})}
+
+        results = {}
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            # One untimed pass so the text index and working set are in memory
+            for make_url in scenarios().values():
+                (await http.get(make_url(rng), headers={"Authorization": f"Bearer {tokens['job_seeker']}"})).raise_for_status()
+            for name, make_url in scenarios().items():
+                print(f"Driving {args.requests} searches: {name}...", file=sys.stderr)
+                results[name] = await run_scenario(server, http, "job_seeker", make_url, tokens, args, rng)
+    finally:
+        await server.client.drop_database(os.environ["DB_NAME"])
+        await server.app.router.shutdown()
+
+    over_budget = [name for name, result in results.items() if result["p95_ms"] > args.p95_budget_ms]
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "dataset": {"jobs": args.jobs, "gus": args.gus, "enterprises": args.enterprises,
+                    "city_skew": args.city_skew, "role_skew": args.role_skew, "seed": args.seed,
+                    "seed_seconds": round(seed_seconds, 1)},
+        "load": {"requests_per_query_type": args.requests, "workers": args.workers},
+        "p95_budget_ms": args.p95_budget_ms,
+        "over_budget": over_budget,
+        "queries": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Maintain the GU and enterprise fields denormalized onto jobs.
+
+Usage:
+    python backend/job_view.py check      # exits 1 if any job is missing or stale
+    python backend/job_view.py rebuild [--only-missing]
+
+Uses the same MONGO_URL/DB_NAME environment as the API.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from server import check_job_view, client, db, password_pool, rebuild_job_view
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("check", help="compare every job against its GU and enterprise")
+    rebuild = subcommands.add_parser("rebuild", help="recompute the fields on every job")
+    rebuild.add_argument("--only-missing", action="store_true", help="only jobs that have never been filled")
+    parser.add_argument("--max-examples", type=int, default=20, help="stale jobs to list when checking")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "rebuild":
+            updated = await rebuild_job_view(db, only_missing=args.only_missing)
+            print(json.dumps({"jobs_updated": updated}))
+            return 0
+        report = await check_job_view(db, max_examples=args.max_examples)
+        print(json.dumps(report, indent=2))
+        return 0 if report["consistent"] else 1
+    finally:
+        client.close()
+        password_pool.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
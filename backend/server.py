@@ -1,34 +1,251 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Query, Response, Request
+from fastapi import WebSocket, WebSocketDisconnect, params
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse, JSONResponse
 from dotenv import load_dotenv
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, ReturnDocument, UpdateMany, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError, ExecutionTimeout, OperationFailure, PyMongoError
+from pymongo.read_preferences import make_read_preference, read_pref_mode_from_name
 import os
+import random
+import socket
+import time
+import threading
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional, Dict
+from typing import Any, Awaitable, Callable, List, Optional, Dict, Tuple
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, defaultdict, deque
 from passlib.context import CryptContext
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 import csv
-import io
+import json
+import base64
+import codecs
+import shutil
+import tempfile
+import hashlib
+import heapq
+import math
+import inspect
+import functools
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+
+# Connection pool settings, per uvicorn worker; unset values keep the driver defaults
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS')
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '30000'))
+# Comma-separated, e.g. "zstd,snappy" (needs the zstandard / python-snappy packages)
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS')
+MONGO_READ_PREFERENCE = os.environ.get('MONGO_READ_PREFERENCE', 'primary')
+# Connections opened at startup; defaults to the minimum pool size
+MONGO_PREWARM_CONNECTIONS = int(os.environ.get('MONGO_PREWARM_CONNECTIONS', str(MONGO_MIN_POOL_SIZE)))
+
+# Dashboard/analytics routes read from secondaries with bounded staleness (90s is the server minimum)
+ANALYTICS_READ_PREFERENCE = os.environ.get('ANALYTICS_READ_PREFERENCE', 'secondaryPreferred')
+ANALYTICS_MAX_STALENESS_SECONDS = int(os.environ.get('ANALYTICS_MAX_STALENESS_SECONDS', '90'))
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Feeds every driver command into the request/DB metrics (see METRICS)"""
+    
+    def started(self, event):
+        if QUERY_BUDGET_MODE != "off":
+            record_db_query_shape(event.command_name, event.command)
+    
+    def succeeded(self, event):
+        record_db_command(event.command_name, event.duration_micros, "succeeded")
+    
+    def failed(self, event):
+        record_db_command(event.command_name, event.duration_micros, "failed")
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Connection pool occupancy and checkout counters, for /health and /metrics"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.open_connections = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.checkouts = 0
+        self.checkout_failures = defaultdict(int)
+        self.pool_clears = 0
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        with self.lock:
+            self.pool_clears += 1
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_created(self, event):
+        with self.lock:
+            self.open_connections += 1
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        with self.lock:
+            self.open_connections -= 1
+    
+    def connection_check_out_started(self, event):
+        with self.lock:
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+    
+    def connection_check_out_failed(self, event):
+        with self.lock:
+            self.waiting -= 1
+            self.checkout_failures[str(event.reason)] += 1
+    
+    def connection_checked_out(self, event):
+        with self.lock:
+            self.waiting -= 1
+            self.checked_out += 1
+            self.checkouts += 1
+    
+    def connection_checked_in(self, event):
+        with self.lock:
+            self.checked_out -= 1
+    
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "max_pool_size": MONGO_MAX_POOL_SIZE,
+                "min_pool_size": MONGO_MIN_POOL_SIZE,
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "wait_queue_depth": self.waiting,
+                "peak_wait_queue_depth": self.peak_waiting,
+                "checkouts": self.checkouts,
+                "checkout_failures": sum(self.checkout_failures.values()),
+                "checkout_failure_reasons": dict(self.checkout_failures),
+                "pool_clears": self.pool_clears,
+            }
+
+def mongo_client_options() -> dict:
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "readPreference": MONGO_READ_PREFERENCE,
+    }
+    if MONGO_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = int(MONGO_WAIT_QUEUE_TIMEOUT_MS)
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    return options
+
+pool_monitor = PoolMonitor()
+client = AsyncIOMotorClient(mongo_url, event_listeners=[CommandMetricsListener(), pool_monitor],
+                            **mongo_client_options())
 db = client[os.environ['DB_NAME']]
 
+def analytics_read_preference():
+    mode = read_pref_mode_from_name(ANALYTICS_READ_PREFERENCE)
+    if ANALYTICS_READ_PREFERENCE == "primary":
+        return make_read_preference(mode, None)
+    return make_read_preference(mode, None, ANALYTICS_MAX_STALENESS_SECONDS)
+
 # Security
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
 ALGORITHM = "HS256"
 
+# Password hashing runs on a bounded pool so bcrypt never blocks the event loop
+PASSWORD_POOL_SIZE = int(os.environ.get('PASSWORD_POOL_SIZE', '4'))
+PASSWORD_QUEUE_LIMIT = int(os.environ.get('PASSWORD_QUEUE_LIMIT', '64'))
+
+# Authenticated-user cache; set USER_CACHE_REDIS_URL to share it across workers
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', '30'))
+USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', '10000'))
+USER_CACHE_REDIS_URL = os.environ.get('USER_CACHE_REDIS_URL')
+
+# Bulk job uploads are streamed and inserted in batches; large files are spooled
+# to BULK_UPLOAD_SPOOL_DIR (shared with task workers) and imported by the task queue
+BULK_UPLOAD_SPOOL_DIR = os.environ.get('BULK_UPLOAD_SPOOL_DIR') or tempfile.gettempdir()
+BULK_UPLOAD_BATCH_SIZE = int(os.environ.get('BULK_UPLOAD_BATCH_SIZE', '1000'))
+BULK_UPLOAD_CHUNK_BYTES = int(os.environ.get('BULK_UPLOAD_CHUNK_BYTES', str(64 * 1024)))
+BULK_UPLOAD_ASYNC_THRESHOLD_BYTES = int(os.environ.get('BULK_UPLOAD_ASYNC_THRESHOLD_BYTES', str(1024 * 1024)))
+
+# Full recount interval for the materialized homepage market stats
+MARKET_STATS_RECONCILE_SECONDS = float(os.environ.get('MARKET_STATS_RECONCILE_SECONDS', '600'))
+
+# Public homepage responses are cached; stale entries are served while one request refreshes them
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_TTL_SECONDS', '30'))
+RESPONSE_CACHE_STALE_SECONDS = float(os.environ.get('RESPONSE_CACHE_STALE_SECONDS', '300'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '1000'))
+
+# Wrap the job claim and commitment insert in a transaction (requires a replica set)
+COMMITMENT_TRANSACTIONS = os.environ.get('COMMITMENT_TRANSACTIONS', 'false').lower() == 'true'
+
+# Job search: results per page, buckets per facet, top matches the facets and total
+# are counted over, and a server-side time limit
+SEARCH_PAGE_SIZE = int(os.environ.get('SEARCH_PAGE_SIZE', '20'))
+SEARCH_FACET_SIZE = int(os.environ.get('SEARCH_FACET_SIZE', '20'))
+SEARCH_FACET_SCAN_LIMIT = int(os.environ.get('SEARCH_FACET_SCAN_LIMIT', '1000'))
+SEARCH_MAX_TIME_MS = int(os.environ.get('SEARCH_MAX_TIME_MS', '2000'))
+
+# In-memory vendor/job matching index; follows the jobs change stream for writes
+# from other workers, and is only trusted without it for a few seconds after a rebuild
+MATCH_INDEX_ENABLED = os.environ.get('MATCH_INDEX_ENABLED', 'true').lower() == 'true'
+MATCH_INDEX_REBUILD_SECONDS = float(os.environ.get('MATCH_INDEX_REBUILD_SECONDS', '300'))
+MATCH_INDEX_MAX_STALENESS_SECONDS = float(os.environ.get('MATCH_INDEX_MAX_STALENESS_SECONDS', '5'))
+
+# Job lifecycle events from MongoDB change streams (requires a replica set),
+# fanned out to SSE/WebSocket subscribers with bounded per-connection queues
+EVENTS_ENABLED = os.environ.get('EVENTS_ENABLED', 'true').lower() == 'true'
+EVENTS_QUEUE_SIZE = int(os.environ.get('EVENTS_QUEUE_SIZE', '100'))
+EVENTS_REPLAY_SIZE = int(os.environ.get('EVENTS_REPLAY_SIZE', '1000'))
+EVENTS_HEARTBEAT_SECONDS = float(os.environ.get('EVENTS_HEARTBEAT_SECONDS', '15'))
+EVENTS_RESUME_TOKEN_FLUSH_SECONDS = float(os.environ.get('EVENTS_RESUME_TOKEN_FLUSH_SECONDS', '1'))
+
+# Durable task queue in the `tasks` collection. Run consumers with
+# `python backend/worker.py --concurrency N`; TASK_INLINE_WORKERS consumers also
+# run inside each API process (set it to 0 once dedicated workers are deployed)
+TASK_INLINE_WORKERS = int(os.environ.get('TASK_INLINE_WORKERS', '1'))
+TASK_MAX_ATTEMPTS = int(os.environ.get('TASK_MAX_ATTEMPTS', '5'))
+TASK_VISIBILITY_TIMEOUT_SECONDS = float(os.environ.get('TASK_VISIBILITY_TIMEOUT_SECONDS', '300'))
+TASK_RETRY_BASE_SECONDS = float(os.environ.get('TASK_RETRY_BASE_SECONDS', '5'))
+TASK_RETRY_MAX_SECONDS = float(os.environ.get('TASK_RETRY_MAX_SECONDS', '900'))
+TASK_POLL_SECONDS = float(os.environ.get('TASK_POLL_SECONDS', '1'))
+
+# Add a Server-Timing header (total and DB time) to every API response
+SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'false').lower() == 'true'
+
+# Query budget debug mode: off, log (warn on violations) or raise (fail the
+# request with a 500). Routes may declare their own budget with @query_budget;
+# when enabled, clients may tighten it per request with X-Query-Budget
+QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE', 'off').lower()
+QUERY_BUDGET_DEFAULT = int(os.environ.get('QUERY_BUDGET_DEFAULT', '25'))
+# Same-shape queries allowed in one request before it's flagged as an N+1
+QUERY_REPEAT_LIMIT = int(os.environ.get('QUERY_REPEAT_LIMIT', '3'))
+
 # Create the main app
 app = FastAPI()
 api_router = APIRouter(prefix="/api")
@@ -122,6 +339,7 @@ class Job(BaseModel):
     status: str  # "open", "vendor_committed", "fulfilled", "cancelled"
     created_by: str
     created_at: str
+    remaining_quantity: Optional[int] = None  # Not yet covered by vendor commitments
     committed_vendor_id: Optional[str] = None
     commitment_timestamp: Optional[str] = None
 
@@ -153,6 +371,7 @@ class CommitmentCreate(BaseModel):
     vendor_id: str
     poc_name: str
     poc_contact: str
+    quantity: Optional[int] = None  # Defaults to everything still required
 
 class Commitment(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -161,6 +380,7 @@ class Commitment(BaseModel):
     vendor_id: str
     poc_name: str
     poc_contact: str
+    quantity: Optional[int] = None
     commitment_timestamp: str
     status: str  # "committed", "fulfilled"
 
@@ -201,13 +421,91 @@ class MarketStats(BaseModel):
     active_workers: int
     enterprise_clients: int
 
+class MarketplaceEvent(BaseModel):
+    id: str = ""  # The change's resume token, the same on every worker; sent as the SSE event id
+    type: str  # "job_created", "job_committed", "job_status_changed", "job_moved", "application_status_changed", "vendor_updated"
+    job_id: Optional[str] = None
+    enterprise_id: Optional[str] = None
+    vendor_id: Optional[str] = None
+    user_id: Optional[str] = None
+    data: Dict[str, Any] = {}
+    occurred_at: str
+    # (role, area type, area) of the job's GU, for matching vendors; not sent to clients
+    match_keys: List[Tuple[str, str, Optional[str]]] = Field(default_factory=list, exclude=True)
+    # The same before the change, when the job moved and a pre-image was available,
+    # so vendors it left are told too
+    previous_match_keys: List[Tuple[str, str, Optional[str]]] = Field(default_factory=list, exclude=True)
+
 # ==================== UTILITIES ====================
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+class PasswordPool:
+    """Thread pool for bcrypt work with a queue-depth limit and latency metrics"""
+    
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    
+    def __init__(self, size: int, queue_limit: int):
+        self.size = size
+        self.queue_limit = queue_limit
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="password")
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.latency_buckets = [0] * len(self.LATENCY_BUCKETS)
+    
+    async def run(self, fn, *args):
+        if self.in_flight >= self.size + self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication requests, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.observe(time.perf_counter() - start)
+    
+    def observe(self, elapsed: float):
+        self.completed += 1
+        self.latency_sum += elapsed
+        self.latency_max = max(self.latency_max, elapsed)
+        for i, bound in enumerate(self.LATENCY_BUCKETS):
+            if elapsed <= bound:
+                self.latency_buckets[i] += 1
+    
+    def stats(self) -> dict:
+        capacity = self.size + self.queue_limit
+        return {
+            "pool_size": self.size,
+            "queue_limit": self.queue_limit,
+            "in_flight": self.in_flight,
+            "queued": max(self.in_flight - self.size, 0),
+            "peak_in_flight": self.peak_in_flight,
+            "saturation": round(self.in_flight / capacity, 3),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "latency_avg_seconds": round(self.latency_sum / self.completed, 4) if self.completed else 0.0,
+            "latency_max_seconds": round(self.latency_max, 4),
+            "latency_buckets": {f"le_{bound}": count for bound, count in zip(self.LATENCY_BUCKETS, self.latency_buckets)},
+        }
+    
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+password_pool = PasswordPool(PASSWORD_POOL_SIZE, PASSWORD_QUEUE_LIMIT)
+
+async def hash_password(password: str) -> str:
+    return await password_pool.run(pwd_context.hash, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(pwd_context.verify, plain_password, hashed_password)
 
 def create_token(data: dict) -> str:
     return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
@@ -218,16 +516,1585 @@ def decode_token(token: str) -> dict:
     except:
         return None
 
+class LocalCacheBackend:
+    """In-process LRU with per-key expiry, exposing the subset of the redis.asyncio API we use"""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+    
+    async def get(self, key: str) -> Optional[str]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+    
+    async def set(self, key: str, value: str, ex: Optional[float] = None):
+        self.entries[key] = (value, time.monotonic() + ex if ex else None)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    async def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self.entries.pop(key, None) is not None)
+
+class UserCache:
+    """User documents keyed by user_id over a Redis-compatible backend
+    
+    The cache is an optimization only: a backend error counts as a miss (or a
+    skipped write) so auth falls back to `db.users` instead of failing.
+    """
+    
+    def __init__(self, backend, ttl: float, prefix: str = "user:"):
+        self.backend = backend
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+    
+    def backend_failed(self, operation: str, error: Exception):
+        self.errors += 1
+        logger.warning(f"User cache {operation} failed, using the database: {error!r}")
+    
+    async def get(self, user_id: str) -> Optional[dict]:
+        try:
+            value = await self.backend.get(self.prefix + user_id)
+        except Exception as e:
+            self.backend_failed("get", e)
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+    
+    async def set(self, user: dict):
+        try:
+            # Redis takes whole seconds only; a float `ex` is rejected client-side
+            await self.backend.set(self.prefix + user["id"], json.dumps(user), ex=max(1, math.ceil(self.ttl)))
+        except Exception as e:
+            self.backend_failed("set", e)
+    
+    async def invalidate(self, user_id: str):
+        self.invalidations += 1
+        try:
+            await self.backend.delete(self.prefix + user_id)
+        except Exception as e:
+            self.backend_failed("delete", e)
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+def create_user_cache() -> UserCache:
+    if USER_CACHE_REDIS_URL:
+        import redis.asyncio as redis  # Optional dependency, only needed for a shared cache
+        backend = redis.from_url(USER_CACHE_REDIS_URL, decode_responses=True)
+    else:
+        # Per-process cache: writes in another worker are only seen after the TTL
+        backend = LocalCacheBackend(USER_CACHE_MAX_ENTRIES)
+    return UserCache(backend, USER_CACHE_TTL_SECONDS)
+
+user_cache = create_user_cache()
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
+    return await user_from_token(credentials.credentials)
+
+async def user_from_token(token: str) -> dict:
     payload = decode_token(token)
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user = await db.users.find_one({"id": payload.get("user_id")}, {"_id": 0})
+    user_id = payload.get("user_id")
+    user = await user_cache.get(user_id) if user_id else None
+    if user:
+        return user
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    await user_cache.set(user)
     return user
 
+# ==================== METRICS ====================
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Metric:
+    """A labelled metric family rendered in Prometheus text format"""
+    
+    def __init__(self, kind: str, name: str, help_text: str, label_names=()):
+        self.kind = kind
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.lock = threading.Lock()
+        self.values = defaultdict(float)
+    
+    def inc(self, labels: tuple = (), amount: float = 1.0):
+        with self.lock:
+            self.values[labels] += amount
+    
+    def dec(self, labels: tuple = (), amount: float = 1.0):
+        self.inc(labels, -amount)
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{format_labels(self.label_names, labels)} {value:g}")
+        return lines
+
+class Histogram(Metric):
+    def __init__(self, name: str, help_text: str, label_names=(), buckets=LATENCY_BUCKETS):
+        super().__init__("histogram", name, help_text, label_names)
+        self.buckets = buckets
+        self.values = {}
+    
+    def observe(self, labels: tuple, value: float):
+        with self.lock:
+            series = self.values.get(labels)
+            if series is None:
+                series = self.values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for labels, (counts, total, count) in sorted(self.values.items()):
+                # Bucket counts are kept cumulative by observe()
+                for bound, bucket_count in zip(self.buckets, counts):
+                    bucket_labels = format_labels(self.label_names, labels, f'le="{bound:g}"')
+                    lines.append(f"{self.name}_bucket{bucket_labels} {bucket_count}")
+                inf_labels = format_labels(self.label_names, labels, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf_labels} {count}")
+                lines.append(f"{self.name}_sum{format_labels(self.label_names, labels)} {total:g}")
+                lines.append(f"{self.name}_count{format_labels(self.label_names, labels)} {count}")
+        return lines
+
+HTTP_REQUESTS = Metric("counter", "http_requests_total", "HTTP requests by route and status code",
+                       ["method", "route", "status"])
+HTTP_IN_FLIGHT = Metric("gauge", "http_requests_in_flight", "HTTP requests currently being served")
+HTTP_STREAMS_OPEN = Metric("gauge", "http_event_streams_open",
+                           "Server-Sent Event streams currently open (not counted as in flight)")
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency", ["method", "route"])
+HTTP_RESPONSE_SIZE = Histogram("http_response_size_bytes", "HTTP response body size", ["method", "route"],
+                               SIZE_BUCKETS)
+REQUEST_DB_COMMANDS = Histogram("http_request_db_commands", "MongoDB round trips per HTTP request",
+                                ["method", "route"], COUNT_BUCKETS)
+REQUEST_DB_SECONDS = Histogram("http_request_db_duration_seconds", "MongoDB time per HTTP request",
+                               ["method", "route"])
+DB_COMMAND_SECONDS = Histogram("mongodb_command_duration_seconds", "MongoDB command latency",
+                               ["command", "outcome"])
+METRICS = [HTTP_REQUESTS, HTTP_IN_FLIGHT, HTTP_STREAMS_OPEN, HTTP_LATENCY, HTTP_RESPONSE_SIZE,
+           REQUEST_DB_COMMANDS, REQUEST_DB_SECONDS, DB_COMMAND_SECONDS]
+
+class RequestDBStats:
+    """DB round trips issued while serving one request"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.commands = 0
+        self.seconds = 0.0
+        self.shapes = defaultdict(int)
+    
+    def add(self, seconds: float):
+        with self.lock:
+            self.commands += 1
+            self.seconds += seconds
+    
+    def add_shape(self, shape: str):
+        with self.lock:
+            self.shapes[shape] += 1
+    
+    def repeated_shapes(self, limit: int) -> Dict[str, int]:
+        with self.lock:
+            return {shape: count for shape, count in self.shapes.items() if count > limit}
+
+# Motor runs driver calls on executor threads with a copy of the caller's
+# context, so command events can be attributed to the request that issued them
+request_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+def record_db_command(command_name: str, duration_micros: int, outcome: str):
+    seconds = duration_micros / 1_000_000
+    DB_COMMAND_SECONDS.observe((command_name, outcome), seconds)
+    stats = request_db_stats.get()
+    if stats is not None:
+        stats.add(seconds)
+
+# Commands whose repetition is batching or housekeeping rather than an N+1
+UNSHAPED_COMMANDS = {"getMore", "killCursors", "endSessions", "hello", "isMaster", "ping"}
+QUERY_FILTER_FIELDS = {"find": "filter", "count": "query", "distinct": "query", "findAndModify": "query"}
+
+def query_shape(value) -> str:
+    """Filter structure with every value replaced by ?"""
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{key}:{query_shape(item)}" for key, item in value.items()) + "}"
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        return "[" + ",".join(query_shape(item) for item in value) + "]"
+    return "?"
+
+def command_filter(command_name: str, command) -> Optional[dict]:
+    if command_name in QUERY_FILTER_FIELDS:
+        return command.get(QUERY_FILTER_FIELDS[command_name])
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or [{}]
+        return pipeline[0].get("$match")
+    if command_name in ("update", "delete"):
+        statements = command.get(f"{command_name}s") or [{}]
+        return statements[0].get("q")
+    return None
+
+def record_db_query_shape(command_name: str, command):
+    stats = request_db_stats.get()
+    if stats is None or command_name in UNSHAPED_COMMANDS:
+        return
+    filter_shape = query_shape(command_filter(command_name, command) or {})
+    stats.add_shape(f"{command_name} {command.get(command_name)} {filter_shape}")
+
+def query_budget(limit: int):
+    """Declare the most DB round trips a route may issue per request"""
+    def decorator(endpoint):
+        endpoint.query_budget = limit
+        return endpoint
+    return decorator
+
+def query_budget_violation(scope, stats: RequestDBStats) -> Optional[str]:
+    route = scope.get("route")
+    budget = getattr(getattr(route, "endpoint", None), "query_budget", QUERY_BUDGET_DEFAULT)
+    requested = Headers(scope=scope).get("x-query-budget")
+    if requested and requested.isdigit():
+        budget = min(budget, int(requested))
+    
+    problems = []
+    if stats.commands > budget:
+        problems.append(f"{stats.commands} queries (budget {budget})")
+    problems += [f"{count}x {shape}" for shape, count in stats.repeated_shapes(QUERY_REPEAT_LIMIT).items()]
+    return "; ".join(problems) or None
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency, status, size and DB usage"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        stats = RequestDBStats()
+        token = request_db_stats.set(stats)
+        status_code, response_size = 500, 0
+        
+        budget_failed = False
+        # SSE responses stay open for the whole session; they would pin the
+        # in-flight gauge and flood the latency histograms with connection lifetimes
+        event_stream = False
+        
+        async def send_with_metrics(message):
+            nonlocal status_code, response_size, budget_failed, event_stream
+            if budget_failed:
+                # The handler's own response was replaced by the budget error
+                return
+            if message["type"] == "http.response.start":
+                if MutableHeaders(scope=message).get("content-type", "").startswith("text/event-stream"):
+                    event_stream = True
+                    HTTP_IN_FLIGHT.dec()
+                    HTTP_STREAMS_OPEN.inc()
+                error_body = None
+                if QUERY_BUDGET_MODE != "off":
+                    violation = query_budget_violation(scope, stats)
+                    if violation:
+                        logger.warning(f"Query budget exceeded on {scope['method']} {scope['path']}: {violation}")
+                    if violation and QUERY_BUDGET_MODE == "raise":
+                        error = JSONResponse(status_code=500, content={"detail": f"Query budget exceeded: {violation}"})
+                        message = {"type": "http.response.start", "status": 500, "headers": error.raw_headers}
+                        error_body = error.body
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-Query-Count", str(stats.commands))
+                    headers.append("X-Query-Repeats", str(max(stats.shapes.values(), default=0)))
+                status_code = message["status"]
+                if SERVER_TIMING_ENABLED:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f'app;dur={elapsed_ms:.1f}, db;dur={stats.seconds * 1000:.1f};desc="{stats.commands} commands"'
+                    )
+                if error_body is not None:
+                    await send(message)
+                    await send({"type": "http.response.body", "body": error_body})
+                    response_size = len(error_body)
+                    budget_failed = True
+                    return
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+        
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            (HTTP_STREAMS_OPEN if event_stream else HTTP_IN_FLIGHT).dec()
+            request_db_stats.reset(token)
+            # Label by route template, not raw path, to keep cardinality bounded
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route else "unmatched")
+            HTTP_REQUESTS.inc((*labels, str(status_code)))
+            if not event_stream:
+                HTTP_LATENCY.observe(labels, time.perf_counter() - start)
+                HTTP_RESPONSE_SIZE.observe(labels, response_size)
+                REQUEST_DB_COMMANDS.observe(labels, stats.commands)
+                REQUEST_DB_SECONDS.observe(labels, stats.seconds)
+
+def render_component_stats(component: str, stats: dict) -> List[str]:
+    """Numeric fields of a component's stats() as gauges"""
+    lines = []
+    for key, value in stats.items():
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            name = f"setuhub_{component}_{key}"
+            lines += [f"# TYPE {name} gauge", f"{name} {value:g}"]
+    return lines
+
+# ==================== INDEXES ====================
+
+# Fields covered by the job search text index, and their relative weights
+SEARCH_TEXT_WEIGHTS = {
+    "role": 10,
+    "facility_name": 5,
+    "enterprise_name": 5,
+    "city": 5,
+    "state": 3,
+    "description": 2,
+    "salary": 1,
+}
+
+# Declared indexes per collection. Keys mirror the filters the routes below
+# actually issue; every collection is looked up by its string `id`.
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email"),
+        IndexModel([("phone", ASCENDING), ("user_type", ASCENDING)], name="phone_user_type"),
+    ],
+    "jobs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("enterprise_id", ASCENDING), ("status", ASCENDING)], name="enterprise_status"),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+                   name="status_created_at_id"),
+        IndexModel([("gu_id", ASCENDING)], name="gu_id"),
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="created_at_id"),
+        IndexModel([("city", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], name="city_created_at_id"),
+        IndexModel([("city_normalized", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+                   name="city_normalized_created_at_id"),
+        # Job search: filtered browsing and its exact counts
+        IndexModel([("status", ASCENDING), ("role", ASCENDING), ("city", ASCENDING)], name="status_role_city"),
+        # Job search; the status prefix confines each text query to one status
+        IndexModel([("status", ASCENDING)] + [(field, TEXT) for field in SEARCH_TEXT_WEIGHTS],
+                   name="status_text", weights=SEARCH_TEXT_WEIGHTS, default_language="english"),
+    ],
+    "gus": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("enterprise_id", ASCENDING)], name="enterprise_id"),
+        IndexModel([("city", ASCENDING)], name="city"),
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="created_at_id"),
+    ],
+    "vendors": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # Matching vendors for a job when the match index may be stale
+        IndexModel([("services_offered", ASCENDING)], name="services_offered"),
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="created_at_id"),
+    ],
+    "enterprises": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="created_at_id"),
+    ],
+    "commitments": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("vendor_id", ASCENDING), ("status", ASCENDING)], name="vendor_status"),
+        IndexModel([("job_id", ASCENDING)], name="job_id"),
+        # At most one active commitment per vendor and job
+        IndexModel([("job_id", ASCENDING), ("vendor_id", ASCENDING)], name="job_vendor_active_unique",
+                   unique=True, partialFilterExpression={"status": "committed"}),
+        IndexModel([("commitment_timestamp", ASCENDING), ("id", ASCENDING)], name="commitment_timestamp_id"),
+    ],
+    "applications": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("job_id", ASCENDING), ("user_id", ASCENDING)], name="job_user"),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING)], name="user_status"),
+        IndexModel([("applied_at", ASCENDING), ("id", ASCENDING)], name="applied_at_id"),
+        IndexModel([("enterprise_id", ASCENDING)], name="enterprise_id"),
+    ],
+    "job_roles": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "bulk_uploads": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "stats": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "event_offsets": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "tasks": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("run_at", ASCENDING)], name="status_run_at"),
+        IndexModel([("status", ASCENDING), ("visible_until", ASCENDING)], name="status_visible_until"),
+        # At most one pending task per dedupe key; the key is dropped when the task finishes
+        IndexModel([("dedupe_key", ASCENDING)], name="dedupe_key_unique", unique=True, sparse=True),
+    ],
+    "tasks_dead_letter": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("failed_at", ASCENDING)], name="failed_at"),
+    ],
+}
+
+async def ensure_indexes(database) -> Dict[str, List[str]]:
+    """Create all declared indexes, returning the names created per collection"""
+    created = {}
+    for collection, models in INDEX_SPECS.items():
+        created[collection] = []
+        for model in models:
+            try:
+                created[collection] += await database[collection].create_indexes([model])
+            except Exception as e:
+                # A conflicting or unbuildable index (e.g. duplicates under a unique
+                # key) must not keep the API from starting; it shows up as drift
+                logger.error(f"Index {model.document['name']} failed for {collection}: {e}")
+    return created
+
+def reported_index_key(spec: dict) -> List[tuple]:
+    """An index key as index_information() reports it: text fields collapse into _fts/_ftsx"""
+    key = []
+    for field, direction in spec["key"].items():
+        if direction != TEXT:
+            key.append((field, direction))
+        elif ("_fts", TEXT) not in key:
+            key += [("_fts", TEXT), ("_ftsx", 1)]
+    return key
+
+def text_index_weights(spec: dict) -> Optional[Dict[str, int]]:
+    fields = [field for field, direction in spec["key"].items() if direction == TEXT]
+    if not fields:
+        return None
+    return {field: spec.get("weights", {}).get(field, 1) for field in fields}
+
+async def get_index_drift(database) -> Dict[str, Dict]:
+    """Compare declared indexes with what exists in the database"""
+    drift = {}
+    for collection, models in INDEX_SPECS.items():
+        existing = await database[collection].index_information()
+        existing.pop("_id_", None)
+        declared = {model.document["name"]: model.document for model in models}
+        
+        missing = [name for name in declared if name not in existing]
+        extra = [name for name in existing if name not in declared]
+        mismatched = []
+        for name, spec in declared.items():
+            if name not in existing:
+                continue
+            actual = existing[name]
+            if reported_index_key(spec) != [tuple(k) for k in actual["key"]] or \
+                    spec.get("unique", False) != actual.get("unique", False) or \
+                    spec.get("partialFilterExpression") != actual.get("partialFilterExpression") or \
+                    text_index_weights(spec) != actual.get("weights"):
+                mismatched.append(name)
+        
+        if missing or extra or mismatched:
+            drift[collection] = {"missing": missing, "extra": extra, "mismatched": mismatched}
+    return drift
+
+# ==================== MIGRATIONS ====================
+
+async def backfill_application_enterprise_ids(database, batch_size: int = 1000) -> int:
+    """Copy enterprise_id from each job onto applications created before it was denormalized"""
+    updated = 0
+    while True:
+        job_ids = await database.applications.aggregate([
+            {"$match": {"enterprise_id": {"$exists": False}}},
+            {"$group": {"_id": "$job_id"}},
+            {"$limit": batch_size},
+        ]).to_list(batch_size)
+        if not job_ids:
+            return updated
+        jobs = await database.jobs.find(
+            {"id": {"$in": [row["_id"] for row in job_ids]}}, {"_id": 0, "id": 1, "enterprise_id": 1}
+        ).to_list(batch_size)
+        enterprise_by_job = {job["id"]: job["enterprise_id"] for job in jobs}
+        for row in job_ids:
+            # Applications whose job no longer exists get an explicit null so they are not revisited
+            result = await database.applications.update_many(
+                {"job_id": row["_id"], "enterprise_id": {"$exists": False}},
+                {"$set": {"enterprise_id": enterprise_by_job.get(row["_id"])}}
+            )
+            updated += result.modified_count
+
+async def backfill_job_remaining_quantity(database) -> int:
+    """Set remaining_quantity on jobs created before partial commitments existed"""
+    missing = {"remaining_quantity": {"$exists": False}}
+    open_jobs = await database.jobs.update_many(
+        {**missing, "status": "open"}, [{"$set": {"remaining_quantity": "$quantity_required"}}]
+    )
+    closed_jobs = await database.jobs.update_many(
+        {**missing, "status": {"$ne": "open"}}, {"$set": {"remaining_quantity": 0}}
+    )
+    return open_jobs.modified_count + closed_jobs.modified_count
+
+# ==================== PAGINATION ====================
+
+# List endpoints page with opaque keyset cursors over (sort_field, id). The
+# cursor for the next page is returned in the X-Next-Cursor header so the
+# response body stays a plain list; `stream=true` returns NDJSON instead.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+def encode_cursor(doc: dict, sort_field: str) -> str:
+    raw = json.dumps([doc.get(sort_field), doc["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, doc_id = json.loads(raw)
+        return sort_value, doc_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_query(query: dict, sort_field: str, cursor: Optional[str]) -> dict:
+    if not cursor:
+        return query
+    sort_value, doc_id = decode_cursor(cursor)
+    after = {"$or": [
+        {sort_field: {"$gt": sort_value}},
+        {sort_field: sort_value, "id": {"$gt": doc_id}},
+    ]}
+    return {"$and": [query, after]} if query else after
+
+def keyset_find(collection, query: dict, sort_field: str, cursor: Optional[str]):
+    return collection.find(keyset_query(query, sort_field, cursor), {"_id": 0}).sort(
+        [(sort_field, ASCENDING), ("id", ASCENDING)])
+
+async def paginate(collection, query: dict, sort_field: str, cursor: Optional[str],
+                   limit: Optional[int], response: Response) -> List[dict]:
+    """Fetch one page, setting the next-page cursor header when more rows exist"""
+    limit = limit or DEFAULT_PAGE_SIZE
+    docs = await keyset_find(collection, query, sort_field, cursor).limit(limit + 1).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(docs[-1], sort_field)
+    return docs
+
+def stream_ndjson(collection, query: dict, sort_field: str, cursor: Optional[str],
+                  limit: Optional[int] = None, enrich=None) -> StreamingResponse:
+    """Stream matching documents as NDJSON straight off the Motor cursor
+    
+    `enrich` receives each batch of documents and returns the documents to emit.
+    """
+    mongo_cursor = keyset_find(collection, query, sort_field, cursor).batch_size(STREAM_BATCH_SIZE)
+    if limit:
+        mongo_cursor = mongo_cursor.limit(limit)
+    
+    async def emit(batch):
+        if enrich:
+            batch = await enrich(batch)
+        return "".join(json.dumps(doc, default=str) + "\n" for doc in batch)
+    
+    async def generate():
+        batch = []
+        async for doc in mongo_cursor:
+            batch.append(doc)
+            if len(batch) >= STREAM_BATCH_SIZE:
+                yield await emit(batch)
+                batch = []
+        if batch:
+            yield await emit(batch)
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+# ==================== READ ROUTING ====================
+
+def get_analytics_db():
+    """Database handle for read-only analytical queries, served by secondaries.
+    
+    Routes opt in by depending on this; everything else, including writes and
+    read-your-writes flows like create_commitment, stays on `db` (primary).
+    Built from the current `client` on each call so swapping the client (tests,
+    benchmarks) swaps this too; get_database only wraps, it opens nothing.
+    """
+    return client.get_database(db.name, read_preference=analytics_read_preference())
+
+def dependency_calls(dependant):
+    for dependency in dependant.dependencies:
+        yield dependency.call
+        yield from dependency_calls(dependency)
+
+def route_read_preferences() -> Dict[str, str]:
+    """Routes declared as analytics reads, with where they are served from"""
+    routes = {}
+    for route in app.routes:
+        if isinstance(route, APIRoute) and get_analytics_db in dependency_calls(route.dependant):
+            for method in sorted(route.methods):
+                routes[f"{method} {route.path}"] = analytics_read_preference().mongos_mode
+    return routes
+
+# ==================== JOB VIEW ====================
+
+# Jobs carry a copy of their GU's location fields and their enterprise's name,
+# so job reads and filters stay on the jobs collection. The copy is written with
+# the job and pushed to existing jobs when a GU or enterprise is written;
+# rebuild_job_view and check_job_view repair and audit it (backend/job_view.py).
+JOB_VIEW_GU_FIELDS = ("facility_name", "facility_type", "address", "city", "state", "pin_code")
+
+def normalize_city(city: Optional[str]) -> Optional[str]:
+    """City as stored in `city_normalized`, so case-insensitive filters are index equality matches"""
+    return city.strip().lower() if city else None
+
+def job_gu_fields(gu: Optional[dict]) -> dict:
+    fields = {field: gu.get(field) if gu else None for field in JOB_VIEW_GU_FIELDS}
+    fields["city_normalized"] = normalize_city(fields["city"])
+    return fields
+
+def job_view_fields(gu: Optional[dict], enterprise: Optional[dict]) -> dict:
+    return {**job_gu_fields(gu), "enterprise_name": enterprise["name"] if enterprise else None}
+
+async def sync_job_view_gu(database, gu: dict) -> int:
+    result = await database.jobs.update_many({"gu_id": gu["id"]}, {"$set": job_gu_fields(gu)})
+    return result.modified_count
+
+async def sync_job_view_enterprise(database, enterprise: dict) -> int:
+    result = await database.jobs.update_many({"enterprise_id": enterprise["id"]},
+                                             {"$set": {"enterprise_name": enterprise["name"]}})
+    return result.modified_count
+
+async def rebuild_job_view(database, only_missing: bool = False) -> int:
+    """Recompute the denormalized fields on every job (or only jobs that lack them)"""
+    scope = {"$or": [{"enterprise_name": {"$exists": False}},
+                     {"city_normalized": {"$exists": False}}]} if only_missing else {}
+    pairs = [row["_id"] for row in await database.jobs.aggregate([
+        {"$match": scope},
+        {"$group": {"_id": {"gu_id": "$gu_id", "enterprise_id": "$enterprise_id"}}},
+    ]).to_list(None)]
+    if not pairs:
+        return 0
+    gus = {gu["id"]: gu async for gu in database.gus.find(
+        {"id": {"$in": list({pair.get("gu_id") for pair in pairs})}}, {"_id": 0})}
+    enterprises = {enterprise["id"]: enterprise async for enterprise in database.enterprises.find(
+        {"id": {"$in": list({pair.get("enterprise_id") for pair in pairs})}}, {"_id": 0, "id": 1, "name": 1})}
+    # One update per (GU, enterprise) pair; GUs belong to one enterprise, so about one per GU
+    requests = [
+        UpdateMany({**scope, "gu_id": pair.get("gu_id"), "enterprise_id": pair.get("enterprise_id")},
+                   {"$set": job_view_fields(gus.get(pair.get("gu_id")), enterprises.get(pair.get("enterprise_id")))})
+        for pair in pairs
+    ]
+    updated = 0
+    for start in range(0, len(requests), 1000):
+        result = await database.jobs.bulk_write(requests[start:start + 1000], ordered=False)
+        updated += result.modified_count
+    return updated
+
+async def check_job_view(database, max_examples: int = 20) -> dict:
+    """Compare every job's denormalized fields against its GU and enterprise"""
+    gus = {gu["id"]: gu async for gu in database.gus.find({}, {"_id": 0})}
+    enterprises = {enterprise["id"]: enterprise async for enterprise in database.enterprises.find(
+        {}, {"_id": 0, "id": 1, "name": 1})}
+    projection = {"_id": 0, "id": 1, "gu_id": 1, "enterprise_id": 1, "enterprise_name": 1, "city_normalized": 1,
+                  **{field: 1 for field in JOB_VIEW_GU_FIELDS}}
+    report = {"checked": 0, "missing": 0, "stale": 0, "examples": []}
+    async for job in database.jobs.find({}, projection):
+        report["checked"] += 1
+        if "enterprise_name" not in job or "city_normalized" not in job:
+            report["missing"] += 1
+            stale_fields = ["*"]
+        else:
+            expected = job_view_fields(gus.get(job["gu_id"]), enterprises.get(job["enterprise_id"]))
+            stale_fields = [field for field, value in expected.items() if job.get(field) != value]
+            if not stale_fields:
+                continue
+            report["stale"] += 1
+        if len(report["examples"]) < max_examples:
+            report["examples"].append({"job_id": job["id"], "fields": stale_fields})
+    report["consistent"] = not report["missing"] and not report["stale"]
+    return report
+
+def job_view_details(job: dict) -> Tuple[Optional[dict], Optional[dict]]:
+    """gu_details and enterprise_details as served to clients, from a job's denormalized fields"""
+    gu = None
+    if job.get("facility_name") is not None:
+        gu = {"id": job["gu_id"], "enterprise_id": job["enterprise_id"],
+              **{field: job.get(field) for field in JOB_VIEW_GU_FIELDS}}
+    enterprise = None
+    if job.get("enterprise_name") is not None:
+        enterprise = {"id": job["enterprise_id"], "name": job["enterprise_name"]}
+    return gu, enterprise
+
+# ==================== ENRICHMENT ====================
+
+class EntityLoader:
+    """Batches lookups by `id` per collection and memoizes them for one request"""
+    
+    def __init__(self, database):
+        self.database = database
+        self.memo: Dict[str, Dict[str, Optional[dict]]] = {}
+    
+    async def load_many(self, collection: str, ids) -> Dict[str, Optional[dict]]:
+        memo = self.memo.setdefault(collection, {})
+        wanted = {doc_id for doc_id in ids if doc_id is not None}
+        missing = [doc_id for doc_id in wanted if doc_id not in memo]
+        if missing:
+            async for doc in self.database[collection].find({"id": {"$in": missing}}, {"_id": 0}):
+                memo[doc["id"]] = doc
+            for doc_id in missing:
+                memo.setdefault(doc_id, None)
+        return {doc_id: memo[doc_id] for doc_id in wanted}
+
+def get_entity_loader() -> EntityLoader:
+    return EntityLoader(db)
+
+async def attach_job_details(jobs: List[dict], loader: EntityLoader) -> List[dict]:
+    """Attach gu_details and enterprise_details to each job from its denormalized fields
+    
+    Jobs written before those fields existed fall back to one query per collection.
+    """
+    missing = [job for job in jobs if "enterprise_name" not in job]
+    if missing:
+        gus, enterprises = await asyncio.gather(
+            loader.load_many("gus", [job["gu_id"] for job in missing]),
+            loader.load_many("enterprises", [job["enterprise_id"] for job in missing]),
+        )
+        jobs = [
+            job if "enterprise_name" in job else
+            {**job, **job_view_fields(gus.get(job["gu_id"]), enterprises.get(job["enterprise_id"]))}
+            for job in jobs
+        ]
+    enriched = []
+    for job in jobs:
+        gu, enterprise = job_view_details(job)
+        enriched.append({**job, "gu_details": gu, "enterprise_details": enterprise})
+    return enriched
+
+async def enrich_applications(applications: List[dict], loader: EntityLoader) -> List[dict]:
+    """Attach job, GU and enterprise details; applications for deleted jobs are dropped"""
+    jobs = await loader.load_many("jobs", [app["job_id"] for app in applications])
+    found = [job for job in jobs.values() if job]
+    details = {job["id"]: job for job in await attach_job_details(found, loader)}
+    enriched = []
+    for app in applications:
+        job = details.get(app["job_id"])
+        if job:
+            enriched.append({
+                **app,
+                "job_details": jobs[app["job_id"]],
+                "gu_details": job["gu_details"],
+                "enterprise_details": job["enterprise_details"]
+            })
+    return enriched
+
+# ==================== MARKET STATS ====================
+
+# The homepage market stats are served from one materialized document in
+# `stats`. Writes bump its counters with $inc; reconcile_market_stats
+# recounts everything periodically to correct any drift.
+MARKET_STATS_ID = "market_stats"
+FILLED_JOB_STATUSES = ("vendor_committed", "fulfilled")
+
+def job_status_increments(old_status: Optional[str], new_status: Optional[str]) -> Dict[str, int]:
+    increments = {"active_jobs": 0, "filled_jobs": 0}
+    for job_status, sign in ((old_status, -1), (new_status, 1)):
+        if job_status == "open":
+            increments["active_jobs"] += sign
+        elif job_status in FILLED_JOB_STATUSES:
+            increments["filled_jobs"] += sign
+    return {field: delta for field, delta in increments.items() if delta}
+
+async def bump_market_stats(**increments):
+    increments = {field: delta for field, delta in increments.items() if delta}
+    if not increments:
+        return
+    await db.stats.update_one({"id": MARKET_STATS_ID}, {"$inc": increments}, upsert=True)
+
+def response_time_hours(job_created_at: str, commitment_timestamp: str) -> float:
+    elapsed = datetime.fromisoformat(commitment_timestamp) - datetime.fromisoformat(job_created_at)
+    return elapsed.total_seconds() / 3600
+
+async def reconcile_market_stats(database) -> dict:
+    """Recount every market stat from the source collections"""
+    job_counts = await database.jobs.aggregate([
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ]).to_list(None)
+    by_status = {row["_id"]: row["count"] for row in job_counts}
+    
+    cities = await database.gus.distinct("city")
+    
+    # Response time: job creation to vendor commitment, summed server-side;
+    # timestamps that are missing or unparseable are skipped like the
+    # incremental path in create_commitment would
+    def parsed(field: str) -> dict:
+        return {"$dateFromString": {"dateString": field, "onError": None, "onNull": None}}
+    
+    response_times = await database.commitments.aggregate([
+        {"$project": {"_id": 0, "job_id": 1, "commitment_timestamp": 1}},
+        {"$lookup": {"from": "jobs", "localField": "job_id", "foreignField": "id", "as": "job"}},
+        {"$unwind": "$job"},
+        {"$project": {"hours": {"$divide": [
+            {"$subtract": [parsed("$commitment_timestamp"), parsed("$job.created_at")]}, 3600 * 1000]}}},
+        {"$match": {"hours": {"$ne": None}}},
+        {"$group": {"_id": None, "sum": {"$sum": "$hours"}, "count": {"$sum": 1}}},
+    ]).to_list(1)
+    response_hours_sum = response_times[0]["sum"] if response_times else 0.0
+    response_count = response_times[0]["count"] if response_times else 0
+    
+    stats = {
+        "total_jobs": sum(by_status.values()),
+        "active_jobs": by_status.get("open", 0),
+        "filled_jobs": sum(by_status.get(job_status, 0) for job_status in FILLED_JOB_STATUSES),
+        "total_locations": len(cities),
+        "total_vendors": await database.vendors.count_documents({}),
+        "active_workers": await database.users.count_documents({"user_type": "job_seeker"}),
+        "enterprise_clients": await database.enterprises.count_documents({}),
+        "response_hours_sum": response_hours_sum,
+        "response_count": response_count,
+        "reconciled_at": datetime.now(timezone.utc).isoformat(),
+    }
+    await database.stats.update_one({"id": MARKET_STATS_ID}, {"$set": stats}, upsert=True)
+    return stats
+
+async def schedule_market_stats_reconcile():
+    # Every API process schedules the recount; the dedupe key keeps one in the queue
+    try:
+        await enqueue_task("reconcile_market_stats", {}, dedupe_key="reconcile_market_stats")
+    except Exception:
+        logger.exception("Scheduling market stats reconciliation failed")
+
+async def reconcile_market_stats_periodically():
+    while True:
+        await schedule_market_stats_reconcile()
+        await asyncio.sleep(MARKET_STATS_RECONCILE_SECONDS)
+
+# ==================== RESPONSE CACHE ====================
+
+class CachedResponse:
+    def __init__(self, body: bytes, created_at: float):
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self.created_at = created_at
+
+class ResponseCache:
+    """JSON response bodies keyed by path and declared parameters, LRU-bounded, with request coalescing"""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def store(self, key: str, entry: CachedResponse):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def refresh(self, key: str, compute) -> asyncio.Task:
+        """Start (or join) the single recomputation for `key`"""
+        task = self.inflight.get(key)
+        if task is None:
+            async def run():
+                try:
+                    body = json.dumps(jsonable_encoder(await compute())).encode()
+                    entry = CachedResponse(body, time.monotonic())
+                    self.store(key, entry)
+                    return entry
+                finally:
+                    self.inflight.pop(key, None)
+            task = asyncio.create_task(run())
+            # Background refreshes may have no waiter; keep their failures out of "never retrieved" warnings
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self.inflight[key] = task
+        return task
+    
+    async def get(self, key: str, compute, ttl: float, stale_ttl: float) -> tuple:
+        entry = self.entries.get(key)
+        if entry:
+            self.entries.move_to_end(key)
+            age = time.monotonic() - entry.created_at
+            if age < ttl:
+                self.hits += 1
+                return entry, "HIT"
+            if age < ttl + stale_ttl:
+                self.stale_hits += 1
+                self.refresh(key, compute)
+                return entry, "STALE"
+        self.misses += 1
+        return await asyncio.shield(self.refresh(key, compute)), "MISS"
+    
+    def purge(self, prefix: Optional[str] = None) -> int:
+        keys = [key for key in self.entries if prefix is None or key.startswith(prefix)]
+        for key in keys:
+            del self.entries[key]
+        return len(keys)
+    
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "inflight": len(self.inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES)
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+def cached_response(ttl: float = RESPONSE_CACHE_TTL_SECONDS, stale_ttl: float = RESPONSE_CACHE_STALE_SECONDS):
+    """Cache a public GET route's JSON body with stale-while-revalidate and ETag support"""
+    def decorator(handler):
+        signature = inspect.signature(handler)
+        # Only the handler's own parameters shape the response; stray query
+        # strings (cache busters, tracking tags) must not mint new entries
+        key_params = [name for name, param in signature.parameters.items()
+                      if not isinstance(param.default, params.Depends)]
+        
+        @functools.wraps(handler)
+        async def wrapper(request: Request, **kwargs):
+            key = request.url.path
+            if key_params:
+                key += "?" + "&".join(f"{name}={kwargs[name]}" for name in key_params)
+            entry, cache_status = await response_cache.get(key, lambda: handler(**kwargs), ttl, stale_ttl)
+            headers = {
+                "ETag": entry.etag,
+                "Cache-Control": f"public, max-age={int(ttl)}, stale-while-revalidate={int(stale_ttl)}",
+                "X-Cache": cache_status,
+            }
+            if etag_matches(request.headers.get("if-none-match"), entry.etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            return Response(content=entry.body, media_type="application/json", headers=headers)
+        
+        # Expose the handler's own parameters to FastAPI alongside the request
+        request_param = inspect.Parameter("request", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=Request)
+        wrapper.__signature__ = signature.replace(parameters=[request_param, *signature.parameters.values()])
+        return wrapper
+    return decorator
+
+# ==================== MATCHING ====================
+
+class JobMatchIndex:
+    """Open jobs and vendors keyed by (role, area type, area)
+    
+    A vendor matches a job when it offers the job's role and operates in the
+    job's GU city, pin code or state, so both directions are unions of sets.
+    """
+    
+    def __init__(self):
+        self.ready = False
+        self.reset()
+        self.journal = None
+        self.rebuilt_at = 0.0
+        self.live = set()  # collections whose change stream events are being applied
+    
+    def reset(self):
+        self.jobs: Dict[str, tuple] = {}  # job_id -> (sort key, match keys)
+        self.jobs_by_key = defaultdict(set)
+        self.vendors: Dict[str, List[tuple]] = {}
+        self.vendors_by_key = defaultdict(set)
+    
+    @staticmethod
+    def job_keys(role: str, gu: dict) -> List[tuple]:
+        return [(role, "city", gu.get("city")), (role, "pin", gu.get("pin_code")), (role, "state", gu.get("state"))]
+    
+    @staticmethod
+    def vendor_keys(vendor: dict) -> set:
+        areas = [("city", city) for city in vendor.get("operating_cities") or []]
+        areas += [("pin", pin_code) for pin_code in vendor.get("operating_pin_codes") or []]
+        areas += [("state", state) for state in vendor.get("operating_states") or []]
+        return {(role, area_type, area) for role in vendor.get("services_offered") or [] for area_type, area in areas}
+    
+    def record(self, op: str, *args):
+        # Writes that land while a rebuild is loading are replayed onto the new index
+        if self.journal is not None:
+            self.journal.append((op, args))
+    
+    def add_job(self, job: dict, gu: Optional[dict]):
+        self.put_job(job["id"], job["created_at"], self.job_keys(job["role"], gu) if gu else [])
+    
+    def put_job(self, job_id: str, created_at: str, keys: List[tuple]):
+        self.record("put_job", job_id, created_at, keys)
+        self.discard_job(job_id, journal=False)
+        if not keys:
+            return
+        self.jobs[job_id] = ((created_at, job_id), keys)
+        for key in keys:
+            self.jobs_by_key[key].add(job_id)
+    
+    def apply_event(self, event: MarketplaceEvent):
+        """Mirror a job or vendor change from any worker; events carry the document as it is now"""
+        if event.type == "vendor_updated":
+            self.add_vendor({"id": event.vendor_id, **event.data})
+        elif event.data.get("status") == "open":
+            self.put_job(event.job_id, event.data["created_at"], event.match_keys)
+        else:
+            self.discard_job(event.job_id)
+    
+    def fresh(self, collection: str = "jobs") -> bool:
+        """Whether the index's jobs (or vendors) can stand in for the DB query"""
+        if not self.ready:
+            return False
+        return collection in self.live or time.monotonic() - self.rebuilt_at <= MATCH_INDEX_MAX_STALENESS_SECONDS
+    
+    def discard_job(self, job_id: str, journal: bool = True):
+        if journal:
+            self.record("discard_job", job_id)
+        entry = self.jobs.pop(job_id, None)
+        if entry:
+            for key in entry[1]:
+                self.jobs_by_key[key].discard(job_id)
+                if not self.jobs_by_key[key]:
+                    del self.jobs_by_key[key]
+    
+    def add_vendor(self, vendor: dict):
+        self.record("add_vendor", vendor)
+        self.discard_vendor(vendor["id"], journal=False)
+        keys = self.vendor_keys(vendor)
+        self.vendors[vendor["id"]] = list(keys)
+        for key in keys:
+            self.vendors_by_key[key].add(vendor["id"])
+    
+    def discard_vendor(self, vendor_id: str, journal: bool = True):
+        if journal:
+            self.record("discard_vendor", vendor_id)
+        for key in self.vendors.pop(vendor_id, []):
+            self.vendors_by_key[key].discard(vendor_id)
+            if not self.vendors_by_key[key]:
+                del self.vendors_by_key[key]
+    
+    def jobs_for_vendor(self, vendor: dict) -> set:
+        matched = set()
+        for key in self.vendor_keys(vendor):
+            matched |= self.jobs_by_key.get(key, set())
+        return matched
+    
+    def page_for_vendor(self, vendor: dict, skip: int, limit: int) -> List[str]:
+        """Matching job ids ordered by (created_at, id)"""
+        matched = self.jobs_for_vendor(vendor)
+        ordered = heapq.nsmallest(skip + limit, matched, key=lambda job_id: self.jobs[job_id][0])
+        return ordered[skip:]
+    
+    def vendors_for_job(self, job: dict, gu: dict) -> set:
+        matched = set()
+        for key in self.job_keys(job["role"], gu):
+            matched |= self.vendors_by_key.get(key, set())
+        return matched
+    
+    async def rebuild(self, database):
+        self.journal = []
+        try:
+            gus = {}
+            async for gu in database.gus.find({}, {"_id": 0, "id": 1, "city": 1, "state": 1, "pin_code": 1}):
+                gus[gu["id"]] = gu
+            fresh = JobMatchIndex()
+            async for job in database.jobs.find(
+                {"status": "open"}, {"_id": 0, "id": 1, "role": 1, "gu_id": 1, "created_at": 1}
+            ):
+                fresh.add_job(job, gus.get(job["gu_id"]))
+            async for vendor in database.vendors.find({}, {"_id": 0}):
+                fresh.add_vendor(vendor)
+            for op, args in self.journal:
+                getattr(fresh, op)(*args)
+            self.jobs, self.jobs_by_key = fresh.jobs, fresh.jobs_by_key
+            self.vendors, self.vendors_by_key = fresh.vendors, fresh.vendors_by_key
+            self.ready = True
+            self.rebuilt_at = time.monotonic()
+        finally:
+            self.journal = None
+    
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "live": sorted(self.live),
+            "fresh": self.fresh(),
+            "vendors_fresh": self.fresh("vendors"),
+            "open_jobs": len(self.jobs),
+            "job_keys": len(self.jobs_by_key),
+            "vendors": len(self.vendors),
+            "vendor_keys": len(self.vendors_by_key),
+        }
+
+job_match_index = JobMatchIndex()
+
+async def rebuild_match_index_periodically():
+    while True:
+        await asyncio.sleep(MATCH_INDEX_REBUILD_SECONDS)
+        try:
+            await job_match_index.rebuild(db)
+        except Exception:
+            logger.exception("Match index rebuild failed")
+
+async def follow_job_events():
+    """Keep the index in step with every worker's job and vendor writes via the event bus"""
+    subscription = event_bus.subscribe(lambda event: event.type in JOB_MATCH_EVENTS + VENDOR_MATCH_EVENTS)
+    try:
+        while True:
+            event = await subscription.queue.get()
+            job_match_index.apply_event(event)
+            if subscription.dropped:
+                # Fell behind and lost events; only a rebuild is safe
+                event_bus.dropped += subscription.dropped
+                subscription.dropped = 0
+                await job_match_index.rebuild(db)
+    finally:
+        event_bus.unsubscribe(subscription)
+
+# ==================== EVENTS ====================
+
+class Subscription:
+    """One subscriber's bounded event queue; a slow consumer loses its oldest events"""
+    
+    def __init__(self, accepts: Callable[[MarketplaceEvent], bool], queue_size: int):
+        self.accepts = accepts
+        self.queue = asyncio.Queue(queue_size)
+        self.dropped = 0
+    
+    def offer(self, event: MarketplaceEvent):
+        if not self.accepts(event):
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+class EventBus:
+    """In-process pub/sub for marketplace events, with a short replay buffer"""
+    
+    def __init__(self, replay_size: int, queue_size: int):
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.recent = deque(maxlen=replay_size)
+        self.published = 0
+        self.dropped = 0
+    
+    def publish(self, event: MarketplaceEvent):
+        self.published += 1
+        self.recent.append(event)
+        for subscription in self.subscribers:
+            subscription.offer(event)
+    
+    def subscribe(self, accepts: Callable[[MarketplaceEvent], bool], last_event_id: Optional[str] = None) -> Subscription:
+        subscription = Subscription(accepts, self.queue_size)
+        # Ids are resume tokens, which sort in change stream order on every
+        # worker, so a client can resume on any of them; anything older than
+        # the buffer is gone
+        if last_event_id is not None:
+            for event in self.recent:
+                if event.id > last_event_id:
+                    subscription.offer(event)
+        self.subscribers.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        self.subscribers.discard(subscription)
+        self.dropped += subscription.dropped
+    
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "subscribers": len(self.subscribers),
+            "queued": sum(subscription.queue.qsize() for subscription in self.subscribers),
+            "dropped": self.dropped + sum(subscription.dropped for subscription in self.subscribers),
+        }
+
+event_bus = EventBus(EVENTS_REPLAY_SIZE, EVENTS_QUEUE_SIZE)
+
+# Job events that change which vendors a job matches
+JOB_MATCH_EVENTS = ("job_created", "job_status_changed", "job_moved")
+JOB_EVENT_FIELDS = {"status", "gu_id", "role"}
+# Vendor events that change which jobs a vendor matches
+VENDOR_MATCH_EVENTS = ("vendor_updated",)
+VENDOR_EVENT_FIELDS = ("services_offered", "operating_cities", "operating_pin_codes", "operating_states")
+
+async def job_match_keys(database, job: dict) -> List[tuple]:
+    gu = await database.gus.find_one({"id": job.get("gu_id")}, {"_id": 0, "city": 1, "state": 1, "pin_code": 1})
+    return JobMatchIndex.job_keys(job["role"], gu) if gu and job.get("role") else []
+
+async def change_to_events(database, collection: str, change: dict) -> List[MarketplaceEvent]:
+    """Typed events for one change stream document"""
+    operation = change["operationType"]
+    document = change.get("fullDocument") or {}
+    updated = (change.get("updateDescription") or {}).get("updatedFields") or {}
+    occurred_at = datetime.now(timezone.utc).isoformat()
+    
+    if collection == "jobs" and document and (operation == "insert" or not updated.keys().isdisjoint(JOB_EVENT_FIELDS)):
+        job_fields = {key: document.get(key) for key in
+                      ("role", "gu_id", "status", "quantity_required", "remaining_quantity", "created_at")}
+        if operation == "insert":
+            event_type = "job_created"
+        else:
+            event_type = "job_status_changed" if "status" in updated else "job_moved"
+        match_keys = await job_match_keys(database, document)
+        previous_match_keys = []
+        before = change.get("fullDocumentBeforeChange")
+        if before and (before.get("gu_id"), before.get("role")) != (document.get("gu_id"), document.get("role")):
+            previous_match_keys = await job_match_keys(database, before)
+        return [MarketplaceEvent(
+            type=event_type,
+            job_id=document["id"],
+            enterprise_id=document.get("enterprise_id"),
+            vendor_id=document.get("committed_vendor_id"),
+            data=job_fields,
+            occurred_at=occurred_at,
+            match_keys=match_keys,
+            previous_match_keys=previous_match_keys,
+        )]
+    
+    if collection == "vendors" and document and (
+        operation != "update" or any(field.split(".")[0] in VENDOR_EVENT_FIELDS for field in updated)
+    ):
+        return [MarketplaceEvent(
+            type="vendor_updated",
+            vendor_id=document["id"],
+            data={field: document.get(field) or [] for field in VENDOR_EVENT_FIELDS},
+            occurred_at=occurred_at,
+        )]
+    
+    if collection == "commitments" and operation == "insert":
+        job = await database.jobs.find_one({"id": document["job_id"]}, {"_id": 0, "enterprise_id": 1})
+        return [MarketplaceEvent(
+            type="job_committed",
+            job_id=document["job_id"],
+            enterprise_id=job.get("enterprise_id") if job else None,
+            vendor_id=document["vendor_id"],
+            data={"commitment_id": document["id"], "quantity": document.get("quantity"),
+                  "status": document.get("status")},
+            occurred_at=occurred_at,
+        )]
+    
+    if collection == "applications" and operation == "update" and "status" in updated and document:
+        return [MarketplaceEvent(
+            type="application_status_changed",
+            job_id=document["job_id"],
+            enterprise_id=document.get("enterprise_id"),
+            user_id=document.get("user_id"),
+            data={"application_id": document["id"], "status": document["status"]},
+            occurred_at=occurred_at,
+        )]
+    return []
+
+async def save_resume_token(database, collection: str, token):
+    await database.event_offsets.update_one(
+        {"id": collection},
+        {"$set": {"resume_token": token, "updated_at": datetime.now(timezone.utc).isoformat()}},
+        upsert=True
+    )
+
+CHANGE_STREAM_HISTORY_LOST = 286
+CHANGE_STREAM_UNSUPPORTED = 40573
+
+async def enable_pre_images(database, collection: str) -> bool:
+    """Record pre-images for `collection` (MongoDB 6.0+) so changes can be matched on their old values too"""
+    try:
+        await database.command("collMod", collection, changeStreamPreAndPostImages={"enabled": True})
+        return True
+    except Exception as e:
+        logger.warning(f"No change stream pre-images for {collection} ({e}); moves only reach the new area")
+        return False
+
+async def watch_collection(database, collection: str, pre_images: bool = False):
+    """Publish events from one collection's change stream, resuming where the last run stopped"""
+    saved = await database.event_offsets.find_one({"id": collection})
+    resume_token = saved["resume_token"] if saved else None
+    saved_token, saved_at = resume_token, time.monotonic()
+    
+    while True:
+        try:
+            options = {"full_document_before_change": "whenAvailable"} if pre_images else {}
+            stream = database[collection].watch(full_document="updateLookup", resume_after=resume_token, **options)
+        except (NotImplementedError, TypeError, AttributeError):
+            # e.g. mongomock, whose collections have no watch(); retrying can't help
+            logger.warning(f"Change streams are not supported by this client; no events for {collection}")
+            return
+        try:
+            async with stream:
+                job_match_index.live.add(collection)
+                async for change in stream:
+                    for event in await change_to_events(database, collection, change):
+                        event.id = change["_id"]["_data"]
+                        event_bus.publish(event)
+                    resume_token = stream.resume_token
+                    if time.monotonic() - saved_at >= EVENTS_RESUME_TOKEN_FLUSH_SECONDS:
+                        await save_resume_token(database, collection, resume_token)
+                        saved_token, saved_at = resume_token, time.monotonic()
+        except asyncio.CancelledError:
+            if resume_token != saved_token:
+                await save_resume_token(database, collection, resume_token)
+            raise
+        except OperationFailure as e:
+            if e.code == CHANGE_STREAM_UNSUPPORTED:
+                logger.warning(f"Change streams need a replica set; no events for {collection}")
+                return
+            if e.code == CHANGE_STREAM_HISTORY_LOST:
+                logger.warning(f"Resume token for {collection} fell off the oplog; events were missed")
+                resume_token = None
+                continue
+            logger.exception(f"Change stream on {collection} failed")
+        except Exception:
+            logger.exception(f"Change stream on {collection} failed")
+        finally:
+            job_match_index.live.discard(collection)
+        await asyncio.sleep(5)
+
+def event_filter(user: dict, vendor: Optional[dict]) -> Callable[[MarketplaceEvent], bool]:
+    """Which events a user sees: their enterprise's, their vendor's (plus matching jobs) or their own"""
+    if user["user_type"] == "enterprise":
+        return lambda event: event.enterprise_id is not None and event.enterprise_id == user.get("enterprise_id")
+    if user["user_type"] == "vendor":
+        if vendor is None:
+            # Browsing mode: every job, like the vendor view
+            return lambda event: event.type in JOB_MATCH_EVENTS
+        keys = JobMatchIndex.vendor_keys(vendor)
+        return lambda event: event.vendor_id == vendor["id"] or (
+            event.type in JOB_MATCH_EVENTS and not (keys.isdisjoint(event.match_keys) and
+                                                    keys.isdisjoint(event.previous_match_keys)))
+    return lambda event: event.user_id == user["id"]
+
+async def get_stream_user(request: Request, token: Optional[str] = None) -> dict:
+    """Bearer header, or ?token= for EventSource clients that can't set headers"""
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[len("bearer "):]
+    if not token:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated")
+    return await user_from_token(token)
+
+async def subscribe_user(user: dict, last_event_id: Optional[str] = None) -> Subscription:
+    vendor = None
+    if user["user_type"] == "vendor" and user.get("vendor_id"):
+        vendor = await db.vendors.find_one({"id": user["vendor_id"]}, {"_id": 0})
+    return event_bus.subscribe(event_filter(user, vendor), last_event_id)
+
+async def next_event(subscription: Subscription) -> Optional[MarketplaceEvent]:
+    """The next event, or None when it's time for a heartbeat"""
+    try:
+        return await asyncio.wait_for(subscription.queue.get(), EVENTS_HEARTBEAT_SECONDS)
+    except asyncio.TimeoutError:
+        return None
+
+def format_sse(event_type: str, data: str, event_id: Optional[str] = None) -> str:
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event_type}\ndata: {data}\n\n"
+
+SSE_HEARTBEAT = ": keepalive\n\n"
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# ==================== TASK QUEUE ====================
+
+TaskHandler = Callable[[dict], Awaitable[Optional[dict]]]
+task_handlers: Dict[str, TaskHandler] = {}
+
+def task_handler(task_type: str):
+    """Register the coroutine that runs tasks of `task_type`; it gets the payload and may return a result dict"""
+    def register(fn: TaskHandler) -> TaskHandler:
+        task_handlers[task_type] = fn
+        return fn
+    return register
+
+def task_time(delay_seconds: float = 0) -> str:
+    # Fixed-width timestamps so run_at/visible_until compare correctly as strings
+    return (datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)).isoformat(timespec="microseconds")
+
+def task_retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter, capped at TASK_RETRY_MAX_SECONDS"""
+    delay = min(TASK_RETRY_BASE_SECONDS * 2 ** (attempts - 1), TASK_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+async def enqueue_task(task_type: str, payload: dict, max_attempts: int = TASK_MAX_ATTEMPTS,
+                       delay_seconds: float = 0, dedupe_key: Optional[str] = None) -> Optional[dict]:
+    """
+    Queue a task for the workers. With a dedupe_key, returns None instead if a
+    task with that key is still queued or running.
+    """
+    if task_type not in task_handlers:
+        raise ValueError(f"Unknown task type: {task_type}")
+    now = task_time()
+    task = {
+        "id": str(uuid.uuid4()),
+        "type": task_type,
+        "payload": payload,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "run_at": task_time(delay_seconds),
+        "created_at": now,
+        "updated_at": now,
+    }
+    if dedupe_key:
+        task["dedupe_key"] = dedupe_key
+    try:
+        await db.tasks.insert_one(task)
+    except DuplicateKeyError:
+        return None
+    task.pop("_id", None)
+    return task
+
+async def claim_task(worker_id: str) -> Optional[dict]:
+    """
+    Atomically take the oldest due task: queued tasks whose run_at has passed,
+    or running tasks whose worker let the visibility timeout lapse.
+    """
+    now = task_time()
+    task = await db.tasks.find_one_and_update(
+        {"$or": [
+            {"status": "queued", "run_at": {"$lte": now}},
+            {"status": "running", "visible_until": {"$lte": now}},
+        ]},
+        {
+            "$set": {"status": "running", "worker_id": worker_id, "started_at": now, "updated_at": now,
+                     "visible_until": task_time(TASK_VISIBILITY_TIMEOUT_SECONDS)},
+            "$inc": {"attempts": 1},
+        },
+        sort=[("run_at", ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+    if task:
+        task.pop("_id")
+    return task
+
+def owned_task(task: dict) -> dict:
+    # Writes only land while this worker still holds the task, so a worker that
+    # lost it to a visibility timeout can't overwrite the new owner's outcome
+    return {"id": task["id"], "status": "running", "worker_id": task["worker_id"], "attempts": task["attempts"]}
+
+async def extend_task_visibility(task: dict):
+    """Keep a long-running task invisible to other workers until it finishes"""
+    while True:
+        await asyncio.sleep(TASK_VISIBILITY_TIMEOUT_SECONDS / 3)
+        await db.tasks.update_one(owned_task(task), {"$set": {
+            "visible_until": task_time(TASK_VISIBILITY_TIMEOUT_SECONDS), "updated_at": task_time()}})
+
+async def dead_letter_task(task: dict, error: str):
+    now = task_time()
+    result = await db.tasks.update_one(owned_task(task), {
+        "$set": {"status": "dead", "error": error, "finished_at": now, "updated_at": now},
+        "$unset": {"dedupe_key": "", "visible_until": ""},
+    })
+    if result.modified_count:
+        await db.tasks_dead_letter.insert_one({**task, "status": "dead", "error": error, "failed_at": now})
+    logger.error(f"Task {task['id']} ({task['type']}) dead-lettered after {task['attempts']} attempts: {error}")
+
+async def fail_task(task: dict, error: str):
+    if task["attempts"] >= task["max_attempts"]:
+        await dead_letter_task(task, error)
+        return
+    delay = task_retry_delay(task["attempts"])
+    await db.tasks.update_one(owned_task(task), {
+        "$set": {"status": "queued", "error": error, "run_at": task_time(delay), "updated_at": task_time()},
+        "$unset": {"visible_until": ""},
+    })
+    logger.warning(f"Task {task['id']} ({task['type']}) failed on attempt {task['attempts']}, "
+                   f"retrying in {delay:.0f}s: {error}")
+
+async def run_task(task: dict):
+    handler = task_handlers.get(task["type"])
+    if handler is None:
+        await dead_letter_task(task, f"No handler for task type {task['type']}")
+        return
+    if task["attempts"] > task["max_attempts"]:
+        # The previous worker died (or stalled) holding the final attempt
+        await dead_letter_task(task, task.get("error") or "Visibility timeout expired")
+        return
+    heartbeat = asyncio.create_task(extend_task_visibility(task))
+    try:
+        result = await handler(task["payload"])
+    except Exception as e:
+        logger.exception(f"Task {task['id']} ({task['type']}) raised")
+        await fail_task(task, f"{type(e).__name__}: {e}")
+        return
+    finally:
+        heartbeat.cancel()
+    now = task_time()
+    await db.tasks.update_one(owned_task(task), {
+        "$set": {"status": "succeeded", "result": result, "finished_at": now, "updated_at": now},
+        "$unset": {"dedupe_key": "", "visible_until": "", "error": ""},
+    })
+
+async def consume_tasks(worker_id: str):
+    """One consumer: claim and run tasks until cancelled, polling when the queue is empty"""
+    while True:
+        try:
+            task = await claim_task(worker_id)
+        except Exception:
+            logger.exception("Claiming a task failed")
+            task = None
+        if task is None:
+            await asyncio.sleep(TASK_POLL_SECONDS)
+            continue
+        try:
+            await run_task(task)
+        except Exception:
+            # Bookkeeping writes failed; the task resurfaces when its visibility timeout lapses
+            logger.exception(f"Task {task['id']} ({task['type']}) could not be recorded")
+
+def start_task_consumers(concurrency: int, name: str) -> List[asyncio.Task]:
+    prefix = f"{name}-{socket.gethostname()}-{os.getpid()}"
+    return [asyncio.create_task(consume_tasks(f"{prefix}-{i}")) for i in range(concurrency)]
+
+async def task_queue_stats() -> dict:
+    counts = await db.tasks.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]).to_list(None)
+    return {
+        "tasks": {row["_id"]: row["count"] for row in counts},
+        "dead_letter": await db.tasks_dead_letter.count_documents({}),
+        "handlers": sorted(task_handlers),
+        "inline_workers": TASK_INLINE_WORKERS,
+    }
+
+@task_handler("reconcile_market_stats")
+async def reconcile_market_stats_task(payload: dict) -> dict:
+    return await reconcile_market_stats(db)
+
+@task_handler("rebuild_job_view")
+async def rebuild_job_view_task(payload: dict) -> dict:
+    return {"jobs_updated": await rebuild_job_view(db)}
+
 # ==================== AUTH ROUTES ====================
 
 @api_router.post("/auth/register")
@@ -245,7 +2112,7 @@ async def register(user_data: UserCreate):
             "id": user_id,
             "username": user_data.email or user_data.phone,  # Use phone as username for workers
             "email": user_data.email or f"worker_{user_id}@setuhub.com",  # Temp email
-            "password": hash_password(user_data.password or "temp123"),  # Temp password
+            "password": await hash_password(user_data.password or "temp123"),  # Temp password
             "user_type": user_data.user_type,
             "full_name": user_data.full_name,
             "phone": user_data.phone,
@@ -260,7 +2127,7 @@ async def register(user_data: UserCreate):
         if existing:
             raise HTTPException(status_code=400, detail="User with this email already exists")
         
-        hashed_pwd = hash_password(user_data.password)
+        hashed_pwd = await hash_password(user_data.password)
         
         user_doc = {
             "id": user_id,
@@ -280,6 +2147,8 @@ async def register(user_data: UserCreate):
             user_doc["vendor_name_selected"] = user_data.vendor_name
     
     await db.users.insert_one(user_doc)
+    if user_data.user_type == "job_seeker":
+        await bump_market_stats(active_workers=1)
     token = create_token({"user_id": user_id, "user_type": user_data.user_type})
     
     return {"token": token, "user": User(**{k: v for k, v in user_doc.items() if k != "password"})}
@@ -298,7 +2167,7 @@ async def login(credentials: UserLogin):
         query["phone"] = credentials.phone
     
     user = await db.users.find_one(query, {"_id": 0})
-    if not user or not verify_password(credentials.password, user["password"]):
+    if not user or not await verify_password(credentials.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     token = create_token({"user_id": user["id"], "user_type": user["user_type"]})
@@ -308,38 +2177,41 @@ async def login(credentials: UserLogin):
 async def get_me(current_user: dict = Depends(get_current_user)):
     return User(**{k: v for k, v in current_user.items() if k != "password"})
 
+# Enterprises offered in the registration dropdown; for now a predefined list
+# (can be fetched from Google Sheets or admin panel)
+ENTERPRISE_NAMES = [
+    "Flipkart",
+    "Amazon India",
+    "Meesho",
+    "Zepto",
+    "Blinkit",
+    "Swiggy Instamart",
+    "Zomato",
+    "Swiggy",
+    "BigBasket",
+    "Dunzo",
+    "Delhivery",
+    "Shadowfax",
+    "Ecom Express",
+    "Blue Dart",
+    "DTDC",
+    "Ekart Logistics",
+    "Myntra",
+    "Nykaa",
+    "FirstCry",
+    "Licious",
+    "Milk Basket",
+    "JioMart",
+    "Reliance Retail",
+    "DMart Ready",
+    "Other"
+]
+
 # Get list of enterprises for dropdown (can be integrated with Google Sheets)
 @api_router.get("/enterprise-list")
+@cached_response(ttl=3600)
 async def get_enterprise_list():
-    # For now, return predefined list (can be fetched from Google Sheets or admin panel)
-    enterprises = [
-        "Flipkart",
-        "Amazon India",
-        "Meesho",
-        "Zepto",
-        "Blinkit",
-        "Swiggy Instamart",
-        "Zomato",
-        "Swiggy",
-        "BigBasket",
-        "Dunzo",
-        "Delhivery",
-        "Shadowfax",
-        "Ecom Express",
-        "Blue Dart",
-        "DTDC",
-        "Ekart Logistics",
-        "Myntra",
-        "Nykaa",
-        "FirstCry",
-        "Licious",
-        "Milk Basket",
-        "JioMart",
-        "Reliance Retail",
-        "DMart Ready",
-        "Other"
-    ]
-    return {"enterprises": sorted(enterprises)}
+    return {"enterprises": sorted(ENTERPRISE_NAMES)}
 
 # ==================== ENTERPRISE ROUTES ====================
 
@@ -352,18 +2224,30 @@ async def create_enterprise(enterprise: EnterpriseCreate, current_user: dict = D
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.enterprises.insert_one(enterprise_doc)
+    await bump_market_stats(enterprise_clients=1)
+    # Normally a no-op; covers jobs imported ahead of their enterprise
+    await sync_job_view_enterprise(db, enterprise_doc)
     
     # Update user record with enterprise_id
     await db.users.update_one(
         {"id": current_user["id"]},
         {"$set": {"enterprise_id": enterprise_id}}
     )
+    await user_cache.invalidate(current_user["id"])
     
     return Enterprise(**enterprise_doc)
 
 @api_router.get("/enterprises", response_model=List[Enterprise])
-async def get_enterprises(current_user: dict = Depends(get_current_user)):
-    enterprises = await db.enterprises.find({}, {"_id": 0}).to_list(1000)
+async def get_enterprises(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=DEFAULT_PAGE_SIZE),
+    stream: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    if stream:
+        return stream_ndjson(db.enterprises, {}, "created_at", cursor, limit)
+    enterprises = await paginate(db.enterprises, {}, "created_at", cursor, limit, response)
     return enterprises
 
 @api_router.get("/enterprises/{enterprise_id}", response_model=Enterprise)
@@ -384,12 +2268,26 @@ async def create_gu(gu: GUCreate, current_user: dict = Depends(get_current_user)
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.gus.insert_one(gu_doc)
+    # Normally a no-op; covers jobs imported ahead of their GU
+    await sync_job_view_gu(db, gu_doc)
+    # A city counts as a new location only for its first GU
+    if await db.gus.count_documents({"city": gu_doc["city"]}, limit=2) == 1:
+        await bump_market_stats(total_locations=1)
     return GU(**gu_doc)
 
 @api_router.get("/gus", response_model=List[GU])
-async def get_gus(enterprise_id: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+async def get_gus(
+    response: Response,
+    enterprise_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=DEFAULT_PAGE_SIZE),
+    stream: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
     query = {"enterprise_id": enterprise_id} if enterprise_id else {}
-    gus = await db.gus.find(query, {"_id": 0}).to_list(1000)
+    if stream:
+        return stream_ndjson(db.gus, query, "created_at", cursor, limit)
+    gus = await paginate(db.gus, query, "created_at", cursor, limit, response)
     return gus
 
 # ==================== JOB ROUTES ====================
@@ -397,73 +2295,241 @@ async def get_gus(enterprise_id: Optional[str] = None, current_user: dict = Depe
 @api_router.post("/jobs", response_model=Job)
 async def create_job(job: JobCreate, current_user: dict = Depends(get_current_user)):
     job_id = str(uuid.uuid4())
+    gu, enterprise = await asyncio.gather(
+        db.gus.find_one({"id": job.gu_id}, {"_id": 0}),
+        db.enterprises.find_one({"id": job.enterprise_id}, {"_id": 0, "name": 1}),
+    )
     job_doc = {
         "id": job_id,
         **job.model_dump(),
         "status": "open",
         "created_by": current_user["id"],
         "created_at": datetime.now(timezone.utc).isoformat(),
+        "remaining_quantity": job.quantity_required,
         "committed_vendor_id": None,
-        "commitment_timestamp": None
+        "commitment_timestamp": None,
+        **job_view_fields(gu, enterprise)
     }
     await db.jobs.insert_one(job_doc)
+    await bump_market_stats(total_jobs=1, active_jobs=1)
+    job_match_index.add_job(job_doc, gu)
     return Job(**job_doc)
 
+class CSVRecordSplitter:
+    """Incrementally decodes CSV bytes into complete records, keeping quoted newlines intact"""
+    
+    def __init__(self):
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+    
+    def feed(self, chunk: bytes, final: bool = False) -> List[str]:
+        self.buffer += self.decoder.decode(chunk, final=final)
+        records = []
+        start = search = 0
+        while True:
+            newline = self.buffer.find("\n", search)
+            if newline == -1:
+                break
+            # An odd number of quotes means the newline sits inside a quoted field
+            if self.buffer.count('"', start, newline) % 2 == 0:
+                records.append(self.buffer[start:newline + 1])
+                start = newline + 1
+            search = newline + 1
+        self.buffer = self.buffer[start:]
+        if final and self.buffer:
+            records.append(self.buffer)
+            self.buffer = ""
+        return records
+
+class BulkJobImporter:
+    """Validates CSV rows in batches against gus/enterprises and writes them with insert_many"""
+    
+    REQUIRED_FIELDS = ['enterprise_id', 'gu_id', 'role', 'quantity_required']
+    
+    def __init__(self, created_by: str, batch_size: int = BULK_UPLOAD_BATCH_SIZE):
+        self.created_by = created_by
+        self.batch_size = batch_size
+        self.fieldnames = None
+        self.batch = []
+        self.enterprises = {}
+        self.gus = {}
+        self.jobs_created = 0
+        self.errors = []
+        self.total_rows = 0
+    
+    async def add_records(self, records: List[str]):
+        for values in csv.reader(records):
+            if not values:
+                continue
+            if self.fieldnames is None:
+                self.fieldnames = values
+                continue
+            self.total_rows += 1
+            row = {field: values[i] if i < len(values) else None for i, field in enumerate(self.fieldnames)}
+            self.batch.append((self.total_rows, row))
+            if len(self.batch) >= self.batch_size:
+                await self.flush()
+    
+    async def resolve_references(self, rows: List[tuple]):
+        enterprise_ids = {row.get('enterprise_id') for _, row in rows} - self.enterprises.keys()
+        gu_ids = {row.get('gu_id') for _, row in rows} - self.gus.keys()
+        if enterprise_ids:
+            async for enterprise in db.enterprises.find({"id": {"$in": list(enterprise_ids)}},
+                                                        {"_id": 0, "id": 1, "name": 1}):
+                self.enterprises[enterprise["id"]] = enterprise
+        if gu_ids:
+            async for gu in db.gus.find({"id": {"$in": list(gu_ids)}}, {"_id": 0}):
+                self.gus[gu["id"]] = gu
+    
+    async def flush(self):
+        rows, self.batch = self.batch, []
+        if not rows:
+            return
+        await self.resolve_references(rows)
+        
+        docs, doc_rows = [], []
+        for idx, row in rows:
+            try:
+                # Validate required fields
+                missing_fields = [field for field in self.REQUIRED_FIELDS if not row.get(field)]
+                if missing_fields:
+                    self.errors.append({"row": idx, "error": f"Missing fields: {', '.join(missing_fields)}"})
+                    continue
+                if row['enterprise_id'] not in self.enterprises:
+                    self.errors.append({"row": idx, "error": f"Unknown enterprise_id: {row['enterprise_id']}"})
+                    continue
+                if row['gu_id'] not in self.gus:
+                    self.errors.append({"row": idx, "error": f"Unknown gu_id: {row['gu_id']}"})
+                    continue
+                if self.gus[row['gu_id']]["enterprise_id"] != row['enterprise_id']:
+                    self.errors.append({"row": idx, "error": "GU does not belong to the given enterprise"})
+                    continue
+                
+                quantity_required = int(row['quantity_required'])
+                docs.append({
+                    "id": str(uuid.uuid4()),
+                    "enterprise_id": row['enterprise_id'],
+                    "gu_id": row['gu_id'],
+                    "role": row['role'],
+                    "quantity_required": quantity_required,
+                    "shift_time": row.get('shift_time'),
+                    "description": row.get('description'),
+                    "salary": row.get('salary'),
+                    "experience_required": row.get('experience_required'),
+                    "status": "open",
+                    "created_by": self.created_by,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "remaining_quantity": quantity_required,
+                    "committed_vendor_id": None,
+                    "commitment_timestamp": None,
+                    **job_view_fields(self.gus[row['gu_id']], self.enterprises[row['enterprise_id']])
+                })
+                doc_rows.append(idx)
+            except Exception as e:
+                self.errors.append({"row": idx, "error": str(e)})
+        
+        if not docs:
+            return
+        failed = set()
+        try:
+            result = await db.jobs.insert_many(docs, ordered=False)
+            inserted = len(result.inserted_ids)
+        except BulkWriteError as e:
+            inserted = e.details.get("nInserted", 0)
+            for write_error in e.details.get("writeErrors", []):
+                failed.add(write_error["index"])
+                self.errors.append({"row": doc_rows[write_error["index"]], "error": write_error["errmsg"]})
+        for i, doc in enumerate(docs):
+            if i not in failed:
+                job_match_index.add_job(doc, self.gus[doc["gu_id"]])
+        self.jobs_created += inserted
+        await bump_market_stats(total_jobs=inserted, active_jobs=inserted)
+    
+    def result(self) -> dict:
+        self.errors.sort(key=lambda error: error["row"])
+        return {
+            "jobs_created": self.jobs_created,
+            "errors": self.errors,
+            "total_rows": self.total_rows
+        }
+
+async def import_jobs_csv(read_chunk, created_by: str) -> dict:
+    """Stream CSV bytes from `read_chunk` through the batched importer"""
+    splitter = CSVRecordSplitter()
+    importer = BulkJobImporter(created_by)
+    while True:
+        chunk = await read_chunk(BULK_UPLOAD_CHUNK_BYTES)
+        await importer.add_records(splitter.feed(chunk, final=not chunk))
+        if not chunk:
+            break
+    await importer.flush()
+    return importer.result()
+
+@task_handler("bulk_upload")
+async def run_background_upload(payload: dict) -> dict:
+    upload_id, path = payload["upload_id"], payload["path"]
+    await db.bulk_uploads.update_one({"id": upload_id}, {"$set": {"status": "processing"}})
+    try:
+        with open(path, "rb") as f:
+            result = await import_jobs_csv(lambda size: asyncio.to_thread(f.read, size), payload["created_by"])
+    except Exception as e:
+        await db.bulk_uploads.update_one({"id": upload_id}, {"$set": {
+            "status": "failed", "error": str(e), "finished_at": datetime.now(timezone.utc).isoformat()}})
+        raise
+    finally:
+        os.unlink(path)
+    await db.bulk_uploads.update_one({"id": upload_id}, {"$set": {
+        "status": "completed", **result, "finished_at": datetime.now(timezone.utc).isoformat()}})
+    return {"jobs_created": result["jobs_created"], "errors": len(result["errors"])}
+
 @api_router.post("/jobs/bulk-upload")
 async def bulk_upload_jobs(file: UploadFile = File(...), current_user: dict = Depends(get_current_user)):
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="Only CSV files are supported")
     
-    contents = await file.read()
-    csv_data = contents.decode('utf-8')
-    csv_reader = csv.DictReader(io.StringIO(csv_data))
+    if file.size is None or file.size <= BULK_UPLOAD_ASYNC_THRESHOLD_BYTES:
+        return await import_jobs_csv(file.read, current_user["id"])
     
-    jobs_created = 0
-    errors = []
+    # Large upload: copy out of the request's spooled file and hand it to the task queue
+    with tempfile.NamedTemporaryFile(prefix="bulk_upload_", suffix=".csv", dir=BULK_UPLOAD_SPOOL_DIR,
+                                     delete=False) as tmp:
+        await asyncio.to_thread(shutil.copyfileobj, file.file, tmp)
     
-    for idx, row in enumerate(csv_reader, start=1):
-        try:
-            # Validate required fields
-            required_fields = ['enterprise_id', 'gu_id', 'role', 'quantity_required']
-            missing_fields = [field for field in required_fields if not row.get(field)]
-            if missing_fields:
-                errors.append({"row": idx, "error": f"Missing fields: {', '.join(missing_fields)}"})
-                continue
-            
-            job_id = str(uuid.uuid4())
-            job_doc = {
-                "id": job_id,
-                "enterprise_id": row['enterprise_id'],
-                "gu_id": row['gu_id'],
-                "role": row['role'],
-                "quantity_required": int(row['quantity_required']),
-                "shift_time": row.get('shift_time'),
-                "description": row.get('description'),
-                "salary": row.get('salary'),
-                "experience_required": row.get('experience_required'),
-                "status": "open",
-                "created_by": current_user["id"],
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "committed_vendor_id": None,
-                "commitment_timestamp": None
-            }
-            await db.jobs.insert_one(job_doc)
-            jobs_created += 1
-        except Exception as e:
-            errors.append({"row": idx, "error": str(e)})
+    upload_id = str(uuid.uuid4())
+    await db.bulk_uploads.insert_one({
+        "id": upload_id,
+        "filename": file.filename,
+        "size": file.size,
+        "status": "queued",
+        "created_by": current_user["id"],
+        "created_at": datetime.now(timezone.utc).isoformat()
+    })
+    # A retry after a partial import would insert duplicate jobs, so one attempt only
+    task = await enqueue_task("bulk_upload", {"upload_id": upload_id, "path": tmp.name,
+                                              "created_by": current_user["id"]}, max_attempts=1)
+    await db.bulk_uploads.update_one({"id": upload_id}, {"$set": {"task_id": task["id"]}})
     
-    return {
-        "jobs_created": jobs_created,
-        "errors": errors,
-        "total_rows": idx if 'idx' in locals() else 0
-    }
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED,
+                        content={"upload_id": upload_id, "task_id": task["id"], "status": "queued"})
+
+@api_router.get("/jobs/bulk-upload/{upload_id}")
+async def get_bulk_upload(upload_id: str, current_user: dict = Depends(get_current_user)):
+    upload = await db.bulk_uploads.find_one({"id": upload_id}, {"_id": 0})
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
 
 @api_router.get("/jobs", response_model=List[Job])
+@query_budget(4)
 async def get_jobs(
+    response: Response,
     enterprise_id: Optional[str] = None,
     status: Optional[str] = None,
     role: Optional[str] = None,
     city: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=DEFAULT_PAGE_SIZE),
+    stream: bool = False,
     current_user: dict = Depends(get_current_user)
 ):
     query = {}
@@ -474,62 +2540,234 @@ async def get_jobs(
     if role:
         query["role"] = role
     
-    jobs = await db.jobs.find(query, {"_id": 0}).to_list(1000)
-    
-    # Filter by city if provided
+    # Filter by city if provided (case-insensitive), on the job's lowercased copy of its GU's city
     if city:
-        filtered_jobs = []
-        for job in jobs:
-            gu = await db.gus.find_one({"id": job["gu_id"]}, {"_id": 0})
-            if gu and gu.get("city", "").lower() == city.lower():
-                filtered_jobs.append(job)
-        jobs = filtered_jobs
+        query["city_normalized"] = normalize_city(city)
     
+    if stream:
+        return stream_ndjson(db.jobs, query, "created_at", cursor, limit)
+    jobs = await paginate(db.jobs, query, "created_at", cursor, limit, response)
     return jobs
 
 @api_router.get("/jobs/vendor-view", response_model=List[Dict])
-async def get_vendor_jobs(current_user: dict = Depends(get_current_user)):
+@query_budget(6)
+async def get_vendor_jobs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user),
+    loader: EntityLoader = Depends(get_entity_loader)
+):
     if current_user["user_type"] != "vendor":
         raise HTTPException(status_code=403, detail="Only vendors can access this")
     
-    # Get all open jobs
-    jobs = await db.jobs.find({"status": "open"}, {"_id": 0}).to_list(1000)
-    
     # Check if vendor profile exists
     vendor = None
     if current_user.get("vendor_id"):
         vendor = await db.vendors.find_one({"id": current_user["vendor_id"]}, {"_id": 0})
     
-    # If no vendor profile, show all jobs (browsing mode)
-    if not vendor:
-        enriched_jobs = []
-        for job in jobs:
-            gu = await db.gus.find_one({"id": job["gu_id"]}, {"_id": 0})
-            enterprise = await db.enterprises.find_one({"id": job["enterprise_id"]}, {"_id": 0})
-            enriched_jobs.append({
-                **job,
-                "gu_details": gu,
-                "enterprise_details": enterprise
-            })
-        return enriched_jobs
+    jobs = await find_vendor_jobs(vendor, skip, limit)
+    return await attach_job_details(jobs, loader)
+
+async def find_vendor_jobs(vendor: Optional[dict], skip: int, limit: int) -> List[dict]:
+    """Open jobs matching a vendor, ordered by (created_at, id)"""
+    # If no vendor profile, show all open jobs (browsing mode)
+    query = {"status": "open"}
     
     # If vendor profile exists, filter jobs based on operating areas and services
-    filtered_jobs = []
-    for job in jobs:
-        gu = await db.gus.find_one({"id": job["gu_id"]}, {"_id": 0})
-        if gu and (
-            gu["city"] in vendor["operating_cities"] or
-            gu["pin_code"] in vendor["operating_pin_codes"] or
-            gu["state"] in vendor["operating_states"]
-        ) and job["role"] in vendor["services_offered"]:
-            enterprise = await db.enterprises.find_one({"id": job["enterprise_id"]}, {"_id": 0})
-            filtered_jobs.append({
-                **job,
-                "gu_details": gu,
-                "enterprise_details": enterprise
-            })
+    if vendor and MATCH_INDEX_ENABLED and job_match_index.fresh():
+        page_ids = job_match_index.page_for_vendor(vendor, skip, limit)
+        jobs = await db.jobs.find({"id": {"$in": page_ids}, "status": "open"}, {"_id": 0}).to_list(limit)
+        position = {job_id: i for i, job_id in enumerate(page_ids)}
+        jobs.sort(key=lambda job: position[job["id"]])
+        return jobs
+    
+    if vendor:
+        query["$or"] = [
+            {"city": {"$in": vendor.get("operating_cities") or []}},
+            {"pin_code": {"$in": vendor.get("operating_pin_codes") or []}},
+            {"state": {"$in": vendor.get("operating_states") or []}},
+        ]
+        query["role"] = {"$in": vendor.get("services_offered") or []}
     
-    return filtered_jobs
+    return await db.jobs.find(query, {"_id": 0}).sort(
+        [("created_at", ASCENDING), ("id", ASCENDING)]).skip(skip).limit(limit).to_list(limit)
+
+
+class EventPayloads:
+    """Per-event memo: work every subscriber of an event needs is done once, not once per connection"""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.tasks: "OrderedDict[str, asyncio.Task]" = OrderedDict()
+    
+    async def get(self, event: MarketplaceEvent, compute: Callable[[], Awaitable[Any]]):
+        if not event.id:
+            return await compute()
+        task = self.tasks.get(event.id)
+        if task is None:
+            task = asyncio.create_task(compute())
+            # Failures reach every waiter; keep them out of "never retrieved" warnings
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self.tasks[event.id] = task
+            while len(self.tasks) > self.max_entries:
+                self.tasks.popitem(last=False)
+        # One subscriber disconnecting must not cancel the read the others wait on
+        return await asyncio.shield(task)
+
+vendor_feed_payloads = EventPayloads(EVENTS_REPLAY_SIZE)
+
+async def vendor_feed_job(event: MarketplaceEvent) -> Optional[str]:
+    """The event's job, enriched and serialized, or None once it is no longer open"""
+    async def load():
+        job = await db.jobs.find_one({"id": event.job_id}, {"_id": 0})
+        if not job or job["status"] != "open":
+            return None
+        enriched = await attach_job_details([job], EntityLoader(db))
+        return json.dumps(jsonable_encoder(enriched[0]))
+    return await vendor_feed_payloads.get(event, load)
+
+@api_router.get("/jobs/vendor-view/stream")
+async def stream_vendor_jobs(
+    limit: int = Query(1000, ge=1, le=1000),
+    current_user: dict = Depends(get_stream_user)
+):
+    """SSE feed of the vendor view: the matching open jobs once, then only changes
+    
+    Events: `snapshot` (a batch of enriched jobs), `ready` (snapshot complete),
+    `job_added` (an enriched job) and `job_removed` ({"id": ...}). Both deltas
+    are idempotent by job id; the connection holds no per-job state.
+    """
+    if current_user["user_type"] != "vendor":
+        raise HTTPException(status_code=403, detail="Only vendors can access this")
+    
+    vendor = None
+    if current_user.get("vendor_id"):
+        vendor = await db.vendors.find_one({"id": current_user["vendor_id"]}, {"_id": 0})
+    matches = event_filter(current_user, vendor)
+    keys = JobMatchIndex.vendor_keys(vendor) if vendor else None
+    
+    async def feed():
+        # Subscribed here, not in the endpoint, so a response that is never
+        # iterated holds no subscription; still before the snapshot is read so
+        # nothing created meanwhile is missed
+        subscription = event_bus.subscribe(lambda event: event.type in JOB_MATCH_EVENTS and matches(event))
+        try:
+            for skip in range(0, limit, STREAM_BATCH_SIZE):
+                jobs = await find_vendor_jobs(vendor, skip, min(STREAM_BATCH_SIZE, limit - skip))
+                if jobs:
+                    # A fresh loader per batch keeps memory flat
+                    enriched = await attach_job_details(jobs, EntityLoader(db))
+                    yield format_sse("snapshot", json.dumps(jsonable_encoder(enriched)))
+                if len(jobs) < STREAM_BATCH_SIZE:
+                    break
+            yield format_sse("ready", "{}")
+            
+            while True:
+                event = await next_event(subscription)
+                if event is None:
+                    yield SSE_HEARTBEAT
+                    continue
+                job_json = await vendor_feed_job(event)
+                # A job that moved out of the vendor's areas is delivered (on its old keys) to be removed
+                if job_json is not None and (keys is None or not keys.isdisjoint(event.match_keys)):
+                    yield format_sse("job_added", job_json, event.id)
+                else:
+                    yield format_sse("job_removed", json.dumps({"id": event.job_id}), event.id)
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return StreamingResponse(feed(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+SEARCH_FACETS = ("role", "city", "state", "nature_of_job")
+
+def search_facet(group: dict) -> List[dict]:
+    return [
+        {"$group": {"count": {"$sum": 1}, **group}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": SEARCH_FACET_SIZE},
+    ]
+
+@api_router.get("/jobs/search")
+@query_budget(6)
+async def search_jobs(
+    q: Optional[str] = Query(None, max_length=200),
+    role: Optional[str] = None,
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    nature_of_job: Optional[str] = None,
+    enterprise_id: Optional[str] = None,
+    status: str = "open",
+    skip: int = Query(0, ge=0, le=1000),
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+    loader: EntityLoader = Depends(get_entity_loader)
+):
+    """Free-text job search, ranked by text score, with facet counts over the top matches
+    
+    `q` uses MongoDB text search syntax ("exact phrase", -excluded). Filters are
+    exact matches, so facet values can be passed straight back as filters.
+    `total` is an exact count of every match. Facet counts cover the best
+    `facet_sample_size` matches only, and `facets_approximate` says when that
+    was fewer than `total`.
+    """
+    query = {"status": status}
+    for field, value in (("role", role), ("city", city), ("state", state),
+                         ("nature_of_job", nature_of_job), ("enterprise_id", enterprise_id)):
+        if value:
+            query[field] = value
+    order = {"created_at": -1, "id": -1}
+    if q and q.strip():
+        query["$text"] = {"$search": q}
+        order = {"score": {"$meta": "textScore"}, **order}
+    
+    # Rank first and count facets over the top of the ranking only: exact facets
+    # over every open job would group the whole collection on each call. Browsing
+    # walks status_created_at_id; a text query sorts its matches top-k. The exact
+    # total is a separate count, covered by status_role_city or status_text.
+    # Facets only need a handful of fields; the page's full documents are fetched after
+    projection = {"_id": 0, "id": 1, "created_at": 1, "enterprise_id": 1, "enterprise_name": 1,
+                  **{field: 1 for field in SEARCH_FACETS}}
+    if "$text" in query:
+        projection["score"] = {"$meta": "textScore"}
+    scan_limit = max(SEARCH_FACET_SCAN_LIMIT, skip + limit)
+    pipeline = [
+        {"$match": query},
+        {"$sort": order},
+        {"$limit": scan_limit},
+        {"$project": projection},
+        {"$facet": {
+            # Already in rank order
+            "results": [{"$skip": skip}, {"$limit": limit}, {"$project": {"id": 1, "score": 1}}],
+            "sampled": [{"$count": "count"}],
+            **{field: search_facet({"_id": f"${field}"}) for field in SEARCH_FACETS},
+            "enterprise": search_facet({"_id": "$enterprise_id", "name": {"$first": "$enterprise_name"}}),
+        }},
+    ]
+    try:
+        [facets], total = await asyncio.gather(
+            db.jobs.aggregate(pipeline, maxTimeMS=SEARCH_MAX_TIME_MS).to_list(1),
+            db.jobs.count_documents(query, maxTimeMS=SEARCH_MAX_TIME_MS),
+        )
+    except ExecutionTimeout:
+        raise HTTPException(status_code=503, detail="Search took too long; narrow it with more terms or filters")
+    
+    hits = facets.pop("results")
+    jobs = {job["id"]: job for job in await db.jobs.find(
+        {"id": {"$in": [hit["id"] for hit in hits]}}, {"_id": 0}).to_list(len(hits))}
+    results = [{**jobs[hit["id"]], "score": hit.get("score")} for hit in hits if hit["id"] in jobs]
+    sampled = facets.pop("sampled")
+    sampled = sampled[0]["count"] if sampled else 0
+    return {
+        "total": total,
+        "facet_sample_size": sampled,
+        "facets_approximate": sampled < total,
+        "results": await attach_job_details(results, loader),
+        # Buckets are {"value", "count"}; enterprise buckets also carry the name
+        "facets": {
+            field: [{"value": bucket.pop("_id"), **bucket} for bucket in buckets if bucket["_id"] is not None]
+            for field, buckets in facets.items()
+        },
+    }
 
 @api_router.get("/jobs/{job_id}", response_model=Job)
 async def get_job(job_id: str, current_user: dict = Depends(get_current_user)):
@@ -538,11 +2776,69 @@ async def get_job(job_id: str, current_user: dict = Depends(get_current_user)):
         raise HTTPException(status_code=404, detail="Job not found")
     return Job(**job)
 
+async def reopened_job_fields(job_id: str, quantity_required: int) -> dict:
+    """Claim state for a job going back to open; no claims race this while it is not open"""
+    committed = await db.commitments.aggregate([
+        {"$match": {"job_id": job_id, "status": "committed"}},
+        {"$group": {"_id": None, "quantity": {"$sum": "$quantity"}}},
+    ]).to_list(1)
+    return {
+        "remaining_quantity": max(quantity_required - (committed[0]["quantity"] if committed else 0), 0),
+        "committed_vendor_id": None,
+        "commitment_timestamp": None,
+    }
+
 @api_router.put("/jobs/{job_id}/status")
 async def update_job_status(job_id: str, status_data: dict, current_user: dict = Depends(get_current_user)):
-    await db.jobs.update_one({"id": job_id}, {"$set": status_data})
+    if status_data.get("status") == "open":
+        current = await db.jobs.find_one({"id": job_id}, {"_id": 0, "status": 1, "quantity_required": 1})
+        if current and current.get("status") != "open":
+            # Re-opened: only the quantity active commitments don't already cover is claimable
+            quantity_required = status_data.get("quantity_required", current.get("quantity_required", 0))
+            status_data = {**status_data, **await reopened_job_fields(job_id, quantity_required)}
+    previous = await db.jobs.find_one_and_update({"id": job_id}, {"$set": status_data}, projection={"_id": 0})
+    if previous and ("gu_id" in status_data or "enterprise_id" in status_data):
+        # Moved to another GU or enterprise: refresh the denormalized copy
+        job = {**previous, **status_data}
+        gu, enterprise = await asyncio.gather(
+            db.gus.find_one({"id": job["gu_id"]}, {"_id": 0}),
+            db.enterprises.find_one({"id": job["enterprise_id"]}, {"_id": 0, "name": 1}),
+        )
+        await db.jobs.update_one({"id": job_id}, {"$set": job_view_fields(gu, enterprise)})
+    if previous and "status" in status_data:
+        await bump_market_stats(**job_status_increments(previous.get("status"), status_data["status"]))
+    if previous and not status_data.keys().isdisjoint(JOB_EVENT_FIELDS):
+        # Re-key on a move to another GU or role too, not only on open/close
+        job = {**previous, **status_data}
+        if job.get("status") == "open":
+            job_match_index.add_job(job, await db.gus.find_one({"id": job["gu_id"]}, {"_id": 0}))
+        else:
+            job_match_index.discard_job(job_id)
     return {"message": "Job updated successfully"}
 
+@api_router.get("/jobs/{job_id}/matching-vendors")
+async def get_matching_vendors(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Vendors whose services and operating areas match a job (notification targets)"""
+    job = await db.jobs.find_one({"id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    gu = await db.gus.find_one({"id": job["gu_id"]}, {"_id": 0})
+    if not gu:
+        return {"job_id": job_id, "vendor_ids": []}
+    if MATCH_INDEX_ENABLED and job_match_index.fresh("vendors"):
+        return {"job_id": job_id, "vendor_ids": sorted(job_match_index.vendors_for_job(job, gu))}
+    # Without the vendors change stream, vendors registered on other workers
+    # only reach the index on its next rebuild
+    vendors = await db.vendors.find({
+        "services_offered": job["role"],
+        "$or": [
+            {"operating_cities": gu.get("city")},
+            {"operating_pin_codes": gu.get("pin_code")},
+            {"operating_states": gu.get("state")},
+        ],
+    }, {"_id": 0, "id": 1}).to_list(None)
+    return {"job_id": job_id, "vendor_ids": sorted(vendor["id"] for vendor in vendors)}
+
 # ==================== VENDOR ROUTES ====================
 
 @api_router.post("/vendors", response_model=Vendor)
@@ -554,18 +2850,29 @@ async def create_vendor(vendor: VendorCreate, current_user: dict = Depends(get_c
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.vendors.insert_one(vendor_doc)
+    await bump_market_stats(total_vendors=1)
+    job_match_index.add_vendor(vendor_doc)
     
     # Update user record with vendor_id
     await db.users.update_one(
         {"id": current_user["id"]},
         {"$set": {"vendor_id": vendor_id}}
     )
+    await user_cache.invalidate(current_user["id"])
     
     return Vendor(**vendor_doc)
 
 @api_router.get("/vendors", response_model=List[Vendor])
-async def get_vendors(current_user: dict = Depends(get_current_user)):
-    vendors = await db.vendors.find({}, {"_id": 0}).to_list(1000)
+async def get_vendors(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=DEFAULT_PAGE_SIZE),
+    stream: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    if stream:
+        return stream_ndjson(db.vendors, {}, "created_at", cursor, limit)
+    vendors = await paginate(db.vendors, {}, "created_at", cursor, limit, response)
     return vendors
 
 @api_router.get("/vendors/{vendor_id}", response_model=Vendor)
@@ -577,12 +2884,71 @@ async def get_vendor(vendor_id: str, current_user: dict = Depends(get_current_us
 
 # ==================== COMMITMENT ROUTES ====================
 
+async def claim_job(commitment: CommitmentCreate, commitment_doc: dict, session=None) -> Optional[tuple]:
+    """Atomically take quantity from an open job and record the commitment
+    
+    Returns the job as it was before the claim and whether this claim covered
+    it fully, or None if the job is not open or lacks the requested quantity.
+    """
+    timestamp = commitment_doc["commitment_timestamp"]
+    covered = {
+        "status": "vendor_committed",
+        "committed_vendor_id": commitment.vendor_id,
+        "commitment_timestamp": timestamp
+    }
+    if commitment.quantity is None:
+        # Take everything that is left in one step
+        job = await db.jobs.find_one_and_update(
+            {"id": commitment.job_id, "status": "open", "remaining_quantity": {"$gt": 0}},
+            {"$set": {"remaining_quantity": 0, **covered}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.BEFORE,
+            session=session
+        )
+        if not job:
+            return None
+        quantity, fully_covered = job["remaining_quantity"], True
+    else:
+        # Guarded decrement: only succeeds while enough quantity remains
+        quantity = commitment.quantity
+        job = await db.jobs.find_one_and_update(
+            {"id": commitment.job_id, "status": "open", "remaining_quantity": {"$gte": quantity}},
+            {"$inc": {"remaining_quantity": -quantity}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.BEFORE,
+            session=session
+        )
+        if not job:
+            return None
+        fully_covered = job["remaining_quantity"] == quantity
+        if fully_covered:
+            # Only the claim that reached zero can flip the status
+            await db.jobs.update_one(
+                {"id": commitment.job_id, "status": "open", "remaining_quantity": 0},
+                {"$set": covered},
+                session=session
+            )
+    
+    commitment_doc["quantity"] = quantity
+    try:
+        await db.commitments.insert_one(commitment_doc, session=session)
+    except Exception as e:
+        # No commitment was recorded, so give the quantity back (a transaction
+        # rolls back on its own)
+        if session is None:
+            release = {"$inc": {"remaining_quantity": quantity}}
+            if fully_covered:
+                release["$set"] = {"status": "open", "committed_vendor_id": None, "commitment_timestamp": None}
+            await db.jobs.update_one({"id": commitment.job_id}, release)
+        if isinstance(e, DuplicateKeyError):
+            raise HTTPException(status_code=400, detail="Vendor already has an active commitment for this job")
+        raise
+    return job, fully_covered
+
 @api_router.post("/commitments", response_model=Commitment)
 async def create_commitment(commitment: CommitmentCreate, current_user: dict = Depends(get_current_user)):
-    # Check if job is still open
-    job = await db.jobs.find_one({"id": commitment.job_id}, {"_id": 0})
-    if not job or job["status"] != "open":
-        raise HTTPException(status_code=400, detail="Job is not available")
+    if commitment.quantity is not None and commitment.quantity < 1:
+        raise HTTPException(status_code=400, detail="Quantity must be at least 1")
     
     commitment_id = str(uuid.uuid4())
     timestamp = datetime.now(timezone.utc).isoformat()
@@ -594,24 +2960,44 @@ async def create_commitment(commitment: CommitmentCreate, current_user: dict = D
         "status": "committed"
     }
     
-    await db.commitments.insert_one(commitment_doc)
+    # Claim quantity only from an open job, so concurrent commits never overbook it
+    if COMMITMENT_TRANSACTIONS:
+        async def claim_in_transaction(session):
+            return await claim_job(commitment, commitment_doc, session=session)
+        
+        # with_transaction retries on write conflicts with concurrent claims;
+        # the retry then finds the job taken and returns None like any loser
+        try:
+            async with await client.start_session() as session:
+                claim = await session.with_transaction(claim_in_transaction)
+        except PyMongoError as e:
+            if e.has_error_label("TransientTransactionError") or e.has_error_label("UnknownTransactionCommitResult"):
+                raise HTTPException(status_code=409, detail="Job is being claimed concurrently; try again")
+            raise
+    else:
+        claim = await claim_job(commitment, commitment_doc)
+    if not claim:
+        raise HTTPException(status_code=400, detail="Job is not available")
     
-    # Update job status
-    await db.jobs.update_one(
-        {"id": commitment.job_id},
-        {"$set": {
-            "status": "vendor_committed",
-            "committed_vendor_id": commitment.vendor_id,
-            "commitment_timestamp": timestamp
-        }}
+    job, fully_covered = claim
+    if fully_covered:
+        job_match_index.discard_job(job["id"])
+    await bump_market_stats(
+        **(job_status_increments("open", "vendor_committed") if fully_covered else {}),
+        response_hours_sum=response_time_hours(job["created_at"], timestamp),
+        response_count=1
     )
     
     return Commitment(**commitment_doc)
 
 @api_router.get("/commitments", response_model=List[Commitment])
 async def get_commitments(
+    response: Response,
     vendor_id: Optional[str] = None,
     job_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=DEFAULT_PAGE_SIZE),
+    stream: bool = False,
     current_user: dict = Depends(get_current_user)
 ):
     query = {}
@@ -620,7 +3006,9 @@ async def get_commitments(
     if job_id:
         query["job_id"] = job_id
     
-    commitments = await db.commitments.find(query, {"_id": 0}).to_list(1000)
+    if stream:
+        return stream_ndjson(db.commitments, query, "commitment_timestamp", cursor, limit)
+    commitments = await paginate(db.commitments, query, "commitment_timestamp", cursor, limit, response)
     return commitments
 
 # ==================== APPLICATION ROUTES ====================
@@ -647,6 +3035,7 @@ async def create_application(application: ApplicationCreate, current_user: dict
         "id": application_id,
         "user_id": current_user["id"],
         **application.model_dump(),
+        "enterprise_id": job["enterprise_id"],  # Denormalized for dashboard counts
         "status": "applied",
         "applied_at": datetime.now(timezone.utc).isoformat()
     }
@@ -685,10 +3074,16 @@ async def update_application_status(
     return {"message": "Application status updated successfully"}
 
 @api_router.get("/applications")
+@query_budget(8)
 async def get_applications(
+    response: Response,
     job_id: Optional[str] = None,
     user_id: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=DEFAULT_PAGE_SIZE),
+    stream: bool = False,
+    current_user: dict = Depends(get_current_user),
+    loader: EntityLoader = Depends(get_entity_loader)
 ):
     query = {}
     if job_id:
@@ -698,23 +3093,15 @@ async def get_applications(
     elif current_user["user_type"] == "job_seeker":
         query["user_id"] = current_user["id"]
     
-    applications = await db.applications.find(query, {"_id": 0}).to_list(1000)
+    if stream:
+        # A fresh loader per batch keeps memory flat for long exports
+        return stream_ndjson(db.applications, query, "applied_at", cursor, limit,
+                             enrich=lambda batch: enrich_applications(batch, EntityLoader(db)))
     
-    # Enrich with job details
-    enriched = []
-    for app in applications:
-        job = await db.jobs.find_one({"id": app["job_id"]}, {"_id": 0})
-        if job:
-            gu = await db.gus.find_one({"id": job["gu_id"]}, {"_id": 0})
-            enterprise = await db.enterprises.find_one({"id": job["enterprise_id"]}, {"_id": 0})
-            enriched.append({
-                **app,
-                "job_details": job,
-                "gu_details": gu,
-                "enterprise_details": enterprise
-            })
+    applications = await paginate(db.applications, query, "applied_at", cursor, limit, response)
     
-    return enriched
+    # Enrich with job details
+    return await enrich_applications(applications, loader)
 
 @api_router.get("/applications/job/{job_id}")
 async def get_job_applications(job_id: str, current_user: dict = Depends(get_current_user)):
@@ -732,34 +3119,44 @@ async def get_job_applications(job_id: str, current_user: dict = Depends(get_cur
 # ==================== DASHBOARD ROUTES ====================
 
 @api_router.get("/dashboard/enterprise/{enterprise_id}")
-async def get_enterprise_dashboard(enterprise_id: str, current_user: dict = Depends(get_current_user)):
-    total_jobs = await db.jobs.count_documents({"enterprise_id": enterprise_id})
-    open_jobs = await db.jobs.count_documents({"enterprise_id": enterprise_id, "status": "open"})
-    committed_jobs = await db.jobs.count_documents({"enterprise_id": enterprise_id, "status": "vendor_committed"})
-    fulfilled_jobs = await db.jobs.count_documents({"enterprise_id": enterprise_id, "status": "fulfilled"})
-    
-    total_gus = await db.gus.count_documents({"enterprise_id": enterprise_id})
-    
-    # Get all jobs for this enterprise
-    jobs = await db.jobs.find({"enterprise_id": enterprise_id}, {"_id": 0}).to_list(1000)
-    job_ids = [job["id"] for job in jobs]
-    
-    total_applications = await db.applications.count_documents({"job_id": {"$in": job_ids}})
+async def get_enterprise_dashboard(
+    enterprise_id: str,
+    current_user: dict = Depends(get_current_user),
+    read_db=Depends(get_analytics_db)
+):
+    # Constant number of round trips regardless of how many jobs the enterprise has
+    job_stats, total_gus, total_applications = await asyncio.gather(
+        read_db.jobs.aggregate([
+            {"$match": {"enterprise_id": enterprise_id}},
+            {"$facet": {
+                "total": [{"$count": "count"}],
+                "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            }},
+        ]).to_list(1),
+        read_db.gus.count_documents({"enterprise_id": enterprise_id}),
+        read_db.applications.count_documents({"enterprise_id": enterprise_id}),
+    )
+    facets = job_stats[0]
+    by_status = {row["_id"]: row["count"] for row in facets["by_status"]}
     
     return {
-        "total_jobs": total_jobs,
-        "open_jobs": open_jobs,
-        "committed_jobs": committed_jobs,
-        "fulfilled_jobs": fulfilled_jobs,
+        "total_jobs": facets["total"][0]["count"] if facets["total"] else 0,
+        "open_jobs": by_status.get("open", 0),
+        "committed_jobs": by_status.get("vendor_committed", 0),
+        "fulfilled_jobs": by_status.get("fulfilled", 0),
         "total_facilities": total_gus,
         "total_applications": total_applications
     }
 
 @api_router.get("/dashboard/vendor/{vendor_id}")
-async def get_vendor_dashboard(vendor_id: str, current_user: dict = Depends(get_current_user)):
-    total_commitments = await db.commitments.count_documents({"vendor_id": vendor_id})
-    active_commitments = await db.commitments.count_documents({"vendor_id": vendor_id, "status": "committed"})
-    fulfilled_commitments = await db.commitments.count_documents({"vendor_id": vendor_id, "status": "fulfilled"})
+async def get_vendor_dashboard(
+    vendor_id: str,
+    current_user: dict = Depends(get_current_user),
+    read_db=Depends(get_analytics_db)
+):
+    total_commitments = await read_db.commitments.count_documents({"vendor_id": vendor_id})
+    active_commitments = await read_db.commitments.count_documents({"vendor_id": vendor_id, "status": "committed"})
+    fulfilled_commitments = await read_db.commitments.count_documents({"vendor_id": vendor_id, "status": "fulfilled"})
     
     return {
         "total_commitments": total_commitments,
@@ -782,66 +3179,105 @@ async def get_job_seeker_dashboard(user_id: str, current_user: dict = Depends(ge
         "shortlisted_applications": shortlisted_applications
     }
 
+# ==================== EVENT ROUTES ====================
+
+@api_router.get("/events/stream")
+async def stream_events(request: Request, current_user: dict = Depends(get_stream_user)):
+    """Server-Sent Events feed of job lifecycle events relevant to the current user"""
+    last_event_id = request.headers.get("last-event-id") or None
+    
+    async def events():
+        # Subscribed on first iteration, so a client gone before then leaves nothing behind
+        subscription = await subscribe_user(current_user, last_event_id)
+        try:
+            while True:
+                event = await next_event(subscription)
+                yield format_sse(event.type, event.model_dump_json(), event.id) if event else SSE_HEARTBEAT
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@api_router.websocket("/events/ws")
+async def events_websocket(websocket: WebSocket, token: str = Query(...)):
+    """WebSocket variant of /events/stream; authenticate with ?token="""
+    try:
+        user = await user_from_token(token)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    subscription = await subscribe_user(user)
+    try:
+        while True:
+            event = await next_event(subscription)
+            await websocket.send_json(event.model_dump() if event else {"type": "heartbeat"})
+    except (WebSocketDisconnect, OSError, RuntimeError):
+        pass
+    finally:
+        event_bus.unsubscribe(subscription)
+
+# ==================== TASK ROUTES ====================
+
+@api_router.get("/tasks/{task_id}")
+async def get_task(task_id: str, current_user: dict = Depends(get_current_user)):
+    task = await db.tasks.find_one({"id": task_id}, {"_id": 0, "payload": 0})
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
 # ==================== HOMEPAGE ROUTES ====================
 
 @api_router.get("/homepage/job-roles", response_model=List[JobRole])
+@cached_response(ttl=300)
 async def get_job_roles():
     """Get all job roles for the Key Positions section"""
     job_roles = await db.job_roles.find({}, {"_id": 0}).to_list(100)
-    return job_roles
+    return [JobRole(**job_role) for job_role in job_roles]
 
 @api_router.get("/homepage/market-stats", response_model=MarketStats)
-async def get_market_stats():
+@cached_response()
+async def get_market_stats(read_db=Depends(get_analytics_db)):
     """Get real-time market statistics for the homepage"""
-    # Calculate stats from actual data
-    active_jobs = await db.jobs.count_documents({"status": "open"})
-    
-    # Get unique locations (cities) from GUs
-    gus = await db.gus.find({}, {"city": 1, "_id": 0}).to_list(10000)
-    unique_cities = len(set(gu["city"] for gu in gus))
+    stats = await read_db.stats.find_one({"id": MARKET_STATS_ID}, {"_id": 0})
+    if not stats or "reconciled_at" not in stats:
+        # Lagging secondary, or first boot before the queued recount has run:
+        # serve the primary's counters rather than recounting in the request
+        stats = await db.stats.find_one({"id": MARKET_STATS_ID}, {"_id": 0}) or {}
+        if "reconciled_at" not in stats:
+            await schedule_market_stats_reconcile()
     
-    # Count vendors
-    total_vendors = await db.vendors.count_documents({})
+    # Fill rate: jobs that are committed or fulfilled vs total jobs
+    total_jobs = stats.get("total_jobs", 0)
+    fill_rate = (stats.get("filled_jobs", 0) / total_jobs) * 100 if total_jobs > 0 else 0.0
     
-    # Calculate fill rate (jobs that are committed or fulfilled vs total jobs)
-    total_jobs = await db.jobs.count_documents({})
-    if total_jobs > 0:
-        filled_jobs = await db.jobs.count_documents({"status": {"$in": ["vendor_committed", "fulfilled"]}})
-        fill_rate = (filled_jobs / total_jobs) * 100
-    else:
-        fill_rate = 0.0
-    
-    # Count active workers (job seekers who have applied)
-    active_workers = await db.users.count_documents({"user_type": "job_seeker"})
-    
-    # Count enterprise clients
-    enterprise_clients = await db.enterprises.count_documents({})
-    
-    # For avg response time, we can use a default or calculate from commitments
-    # For now, using a calculated value based on commitment timestamps
-    avg_response_time = 6.0  # Default 6 hours
+    # Average hours from job creation to vendor commitment
+    response_count = stats.get("response_count", 0)
+    avg_response_time = stats.get("response_hours_sum", 0.0) / response_count if response_count else 0.0
     
     return MarketStats(
-        active_jobs=active_jobs,
-        total_locations=unique_cities,
-        total_vendors=total_vendors,
+        active_jobs=stats.get("active_jobs", 0),
+        total_locations=stats.get("total_locations", 0),
+        total_vendors=stats.get("total_vendors", 0),
         fill_rate_percentage=round(fill_rate, 1),
-        avg_response_time_hours=avg_response_time,
-        active_workers=active_workers,
-        enterprise_clients=enterprise_clients
+        avg_response_time_hours=round(avg_response_time, 1),
+        active_workers=stats.get("active_workers", 0),
+        enterprise_clients=stats.get("enterprise_clients", 0)
     )
 
 @api_router.get("/homepage/recent-jobs")
-async def get_recent_jobs():
+@query_budget(2)
+@cached_response()
+async def get_recent_jobs(loader: EntityLoader = Depends(get_entity_loader)):
     """Get recent job postings for the homepage (public endpoint)"""
     # Get recent open jobs with enterprise and GU details
     jobs = await db.jobs.find({"status": "open"}, {"_id": 0}).sort("created_at", -1).limit(10).to_list(10)
     
     # Enrich with enterprise and GU information
     enriched_jobs = []
-    for job in jobs:
-        enterprise = await db.enterprises.find_one({"id": job["enterprise_id"]}, {"_id": 0, "name": 1})
-        gu = await db.gus.find_one({"id": job["gu_id"]}, {"_id": 0, "city": 1, "state": 1, "facility_name": 1})
+    for job in await attach_job_details(jobs, loader):
+        enterprise = job["enterprise_details"]
+        gu = job["gu_details"]
         
         enriched_jobs.append({
             "id": job["id"],
@@ -859,27 +3295,27 @@ async def get_recent_jobs():
     return enriched_jobs
 
 @api_router.get("/admin/dashboard")
-async def get_admin_dashboard():
+async def get_admin_dashboard(read_db=Depends(get_analytics_db)):
     """Get admin dashboard statistics (public for MVP)"""
     # Overall statistics
-    total_jobs = await db.jobs.count_documents({})
-    open_jobs = await db.jobs.count_documents({"status": "open"})
-    committed_jobs = await db.jobs.count_documents({"status": "vendor_committed"})
-    fulfilled_jobs = await db.jobs.count_documents({"status": "fulfilled"})
+    total_jobs = await read_db.jobs.count_documents({})
+    open_jobs = await read_db.jobs.count_documents({"status": "open"})
+    committed_jobs = await read_db.jobs.count_documents({"status": "vendor_committed"})
+    fulfilled_jobs = await read_db.jobs.count_documents({"status": "fulfilled"})
     
-    total_enterprises = await db.enterprises.count_documents({})
-    total_vendors = await db.vendors.count_documents({})
-    total_workers = await db.users.count_documents({"user_type": "job_seeker"})
-    total_applications = await db.applications.count_documents({})
-    total_commitments = await db.commitments.count_documents({})
+    total_enterprises = await read_db.enterprises.count_documents({})
+    total_vendors = await read_db.vendors.count_documents({})
+    total_workers = await read_db.users.count_documents({"user_type": "job_seeker"})
+    total_applications = await read_db.applications.count_documents({})
+    total_commitments = await read_db.commitments.count_documents({})
     
     # Recent activities
-    recent_jobs = await db.jobs.find({}, {"_id": 0}).sort("created_at", -1).limit(5).to_list(5)
-    recent_applications = await db.applications.find({}, {"_id": 0}).sort("applied_at", -1).limit(5).to_list(5)
-    recent_commitments = await db.commitments.find({}, {"_id": 0}).sort("commitment_timestamp", -1).limit(5).to_list(5)
+    recent_jobs = await read_db.jobs.find({}, {"_id": 0}).sort("created_at", -1).limit(5).to_list(5)
+    recent_applications = await read_db.applications.find({}, {"_id": 0}).sort("applied_at", -1).limit(5).to_list(5)
+    recent_commitments = await read_db.commitments.find({}, {"_id": 0}).sort("commitment_timestamp", -1).limit(5).to_list(5)
     
     # Location-wise distribution
-    gus = await db.gus.find({}, {"city": 1, "state": 1, "_id": 0}).to_list(10000)
+    gus = await read_db.gus.find({}, {"city": 1, "state": 1, "_id": 0}).to_list(10000)
     cities_count = len(set(gu["city"] for gu in gus))
     states_count = len(set(gu["state"] for gu in gus))
     
@@ -902,6 +3338,64 @@ async def get_admin_dashboard():
         "recent_commitments": recent_commitments
     }
 
+@api_router.get("/admin/indexes")
+async def get_admin_indexes():
+    """Report drift between declared and existing indexes (public for MVP)"""
+    drift = await get_index_drift(db)
+    return {"in_sync": not drift, "drift": drift}
+
+@api_router.get("/admin/read-routing")
+async def get_read_routing():
+    """Which routes read from secondaries, and with what read preference (public for MVP)"""
+    return {
+        "default": db.read_preference.mongos_mode,
+        "analytics": analytics_read_preference().document,
+        "routes": route_read_preferences(),
+    }
+
+@api_router.get("/admin/events")
+async def get_event_bus_stats():
+    """Event bus subscribers and delivery counters (public for MVP)"""
+    return event_bus.stats()
+
+@api_router.get("/admin/tasks")
+async def get_task_queue_stats():
+    """Task counts by status and dead-lettered tasks (public for MVP)"""
+    return await task_queue_stats()
+
+@api_router.post("/admin/job-view/rebuild")
+async def rebuild_job_view_route(current_user: dict = Depends(get_current_user)):
+    """Queue a rebuild of the denormalized GU/enterprise fields on jobs"""
+    task = await enqueue_task("rebuild_job_view", {}, dedupe_key="rebuild_job_view")
+    if task is None:
+        raise HTTPException(status_code=409, detail="A job view rebuild is already queued")
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content={"task_id": task["id"], "status": "queued"})
+
+@api_router.get("/admin/password-pool")
+async def get_password_pool_stats():
+    """Password hashing pool latency and saturation (public for MVP)"""
+    return password_pool.stats()
+
+@api_router.get("/admin/match-index")
+async def get_match_index_stats():
+    """Vendor/job matching index size (public for MVP)"""
+    return job_match_index.stats()
+
+@api_router.get("/admin/user-cache")
+async def get_user_cache_stats():
+    """Authenticated-user cache hit/miss counters (public for MVP)"""
+    return user_cache.stats()
+
+@api_router.get("/admin/response-cache")
+async def get_response_cache_stats():
+    """Homepage response cache counters (public for MVP)"""
+    return response_cache.stats()
+
+@api_router.post("/admin/response-cache/purge")
+async def purge_response_cache(path: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+    """Drop cached responses, all of them or those whose path starts with `path`"""
+    return {"purged": response_cache.purge(path)}
+
 @api_router.post("/homepage/seed-job-roles")
 async def seed_job_roles():
     """Seed initial job roles data (admin only, one-time)"""
@@ -1036,9 +3530,49 @@ async def seed_job_roles():
     
     # Insert all job roles
     await db.job_roles.insert_many(job_roles_data)
+    response_cache.purge("/api/homepage/job-roles")
     
     return {"message": "Job roles seeded successfully", "count": len(job_roles_data)}
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus text exposition of request, DB and component metrics"""
+    lines = []
+    for metric in METRICS:
+        lines += metric.render()
+    lines += render_component_stats("password_pool", password_pool.stats())
+    lines += render_component_stats("user_cache", user_cache.stats())
+    lines += render_component_stats("response_cache", response_cache.stats())
+    lines += render_component_stats("match_index", job_match_index.stats())
+    lines += render_component_stats("mongo_pool", pool_monitor.stats())
+    lines += render_component_stats("events", event_bus.stats())
+    task_stats = await task_queue_stats()
+    lines += render_component_stats("tasks", {**task_stats["tasks"], "dead_letter": task_stats["dead_letter"]})
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+@app.get("/health", include_in_schema=False)
+async def health():
+    """Liveness plus MongoDB ping latency and connection pool occupancy"""
+    start = time.perf_counter()
+    try:
+        # Slightly longer than server selection so the driver's own error wins
+        await asyncio.wait_for(client.admin.command("ping"), timeout=MONGO_SERVER_SELECTION_TIMEOUT_MS / 1000 + 1)
+    except Exception as e:
+        return JSONResponse(status_code=503, content=jsonable_encoder({
+            "status": "unavailable",
+            "mongo": {"error": f"{type(e).__name__}: {e}"},
+            "pool": pool_monitor.stats(),
+        }))
+    return {
+        "status": "ok",
+        "mongo": {
+            "ping_ms": round((time.perf_counter() - start) * 1000, 2),
+            "read_preference": MONGO_READ_PREFERENCE,
+            "compressors": MONGO_COMPRESSORS,
+        },
+        "pool": pool_monitor.stats(),
+    }
+
 # Include router
 app.include_router(api_router)
 
@@ -1048,7 +3582,9 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+app.add_middleware(MetricsMiddleware)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -1056,6 +3592,70 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_mongo_pool():
+    """Open connections up front so the first requests don't pay for handshakes"""
+    if MONGO_PREWARM_CONNECTIONS <= 0:
+        return
+    start = time.perf_counter()
+    # Concurrent pings each need their own connection
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(MONGO_PREWARM_CONNECTIONS)))
+    logger.info(f"Pre-warmed {pool_monitor.stats()['open_connections']} MongoDB connections "
+                f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+@app.on_event("startup")
+async def startup_indexes():
+    await ensure_indexes(db)
+    drift = await get_index_drift(db)
+    if drift:
+        logger.warning(f"Index drift detected: {drift}")
+
+@app.on_event("startup")
+async def startup_migrations():
+    backfilled = await backfill_application_enterprise_ids(db)
+    if backfilled:
+        logger.info(f"Backfilled enterprise_id on {backfilled} applications")
+    backfilled = await backfill_job_remaining_quantity(db)
+    if backfilled:
+        logger.info(f"Backfilled remaining_quantity on {backfilled} jobs")
+    backfilled = await rebuild_job_view(db, only_missing=True)
+    if backfilled:
+        logger.info(f"Backfilled GU and enterprise fields on {backfilled} jobs")
+
+background_loops = set()
+
+@app.on_event("startup")
+async def startup_match_index():
+    if not MATCH_INDEX_ENABLED:
+        return
+    await job_match_index.rebuild(db)
+    for loop in (rebuild_match_index_periodically(), follow_job_events()):
+        background_loops.add(asyncio.create_task(loop))
+
+@app.on_event("startup")
+async def startup_market_stats():
+    # Queues the first recount now and one per interval; a task worker runs it
+    task = asyncio.create_task(reconcile_market_stats_periodically())
+    background_loops.add(task)
+
+@app.on_event("startup")
+async def startup_task_consumers():
+    background_loops.update(start_task_consumers(TASK_INLINE_WORKERS, "api"))
+
+@app.on_event("startup")
+async def startup_event_bus():
+    if not EVENTS_ENABLED:
+        return
+    for collection in ("jobs", "commitments", "applications", "vendors"):
+        pre_images = collection == "jobs" and await enable_pre_images(db, collection)
+        task = asyncio.create_task(watch_collection(db, collection, pre_images))
+        background_loops.add(task)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    for task in background_loops:
+        task.cancel()
+    # Let loops finish cleanup (e.g. saving resume tokens) before the client closes
+    await asyncio.gather(*background_loops, return_exceptions=True)
+    client.close()
+    password_pool.shutdown()
\ No newline at end of file
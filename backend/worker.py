@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Task queue worker: runs N concurrent consumers against the `tasks` collection
+(bulk CSV imports, market stats recounts) so the API processes don't have to.
+
+Usage:
+    python backend/worker.py [--concurrency 4]
+
+Uses the same MONGO_URL/DB_NAME environment as the API. Large bulk uploads are
+spooled to BULK_UPLOAD_SPOOL_DIR, which must be shared with the API processes.
+Once dedicated workers are running, set TASK_INLINE_WORKERS=0 on the API.
+"""
+
+import argparse
+import asyncio
+import signal
+
+from server import client, ensure_indexes, db, logger, password_pool, start_task_consumers
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent task consumers")
+    args = parser.parse_args()
+
+    await ensure_indexes(db)
+    consumers = start_task_consumers(args.concurrency, "worker")
+    logger.info(f"Task worker started with {args.concurrency} consumers")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    # Tasks cut off mid-run become visible again once their timeout lapses
+    logger.info("Task worker stopping")
+    for consumer in consumers:
+        consumer.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+    client.close()
+    password_pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
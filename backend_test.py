@@ -7,8 +7,10 @@ from datetime import datetime
 import uuid
 
 class SetuHubAPITester:
-    def __init__(self, base_url="https://work-connect-17.preview.emergentagent.com/api"):
+    def __init__(self, base_url="https://work-connect-17.preview.emergentagent.com/api", query_budgets=False):
         self.base_url = base_url
+        # Assert per-endpoint query budgets (server must run with QUERY_BUDGET_MODE=log or raise)
+        self.query_budgets = query_budgets
         self.session = requests.Session()
         self.tokens = {}  # Store tokens for different user types
         self.users = {}   # Store user data
@@ -242,6 +244,21 @@ class SetuHubAPITester:
         else:
             self.log_test("Vendor Profile Creation", False, error=f"Status: {status}, Response: {response}")
 
+    def test_user_cache_invalidation(self):
+        """Test the cached user is dropped when the user gains a vendor profile"""
+        print("\n🔍 Testing User Cache Invalidation...")
+
+        if 'test_vendor' not in self.vendors:
+            self.log_test("User Cache Invalidation", False, error="No vendor available")
+            return
+
+        # Creating the vendor authenticated (and cached) the user before linking the profile
+        success, response, status = self.make_request('GET', 'auth/me', token=self.tokens['vendor'])
+        if success and response.get('vendor_id') == self.vendors['test_vendor']['id']:
+            self.log_test("User Cache Invalidation", True, "auth/me reflects the new vendor_id")
+        else:
+            self.log_test("User Cache Invalidation", False, error=f"Status: {status}, Response: {response}")
+
     def test_vendor_job_view(self):
         """Test vendor job filtering view"""
         print("\n🔍 Testing Vendor Job View...")
@@ -262,6 +279,127 @@ class SetuHubAPITester:
         else:
             self.log_test("Vendor Job View", False, error=f"Status: {status}, Response: {response}")
 
+    def test_job_move_rekeys_matching(self):
+        """Test a job moved to a GU outside the vendor's areas leaves the vendor view"""
+        print("\n🔍 Testing Job Move Re-keys Matching...")
+
+        if 'test_gu' not in self.gus or 'test_vendor' not in self.vendors:
+            self.log_test("Job Move", False, error="No GU or vendor available")
+            return
+
+        enterprise_id = self.enterprises['test_enterprise']['id']
+        success, gu, status = self.make_request('POST', 'gus', {
+            "enterprise_id": enterprise_id, "facility_type": "warehouse", "facility_name": "Bhiwandi DC",
+            "zone_name": "Thane", "address": "7 Logistics Park", "city": "Mumbai", "state": "Maharashtra",
+            "pin_code": "421302"
+        }, token=self.tokens['enterprise'])
+        success2, job, status2 = self.make_request('POST', 'jobs', {
+            "enterprise_id": enterprise_id, "gu_id": self.gus['test_gu']['id'], "role": "picker",
+            "quantity_required": 1, "shift_time": "night", "description": "Moved job"
+        }, token=self.tokens['enterprise'])
+        if not (success and success2):
+            self.log_test("Job Move", False, error=f"Setup failed: {status}, {status2}")
+            return
+
+        def listed():
+            ok, jobs, _ = self.make_request('GET', 'jobs/vendor-view?limit=1000', token=self.tokens['vendor'])
+            return ok and any(item.get('id') == job['id'] for item in jobs)
+
+        before = listed()
+        self.make_request('PUT', f"jobs/{job['id']}/status", {"gu_id": gu['id']}, token=self.tokens['enterprise'])
+        after = listed()
+        success, vendors, status = self.make_request('GET', f"jobs/{job['id']}/matching-vendors",
+                                                     token=self.tokens['enterprise'])
+        still_matched = success and self.vendors['test_vendor']['id'] in vendors.get('vendor_ids', [])
+        if before and not after and not still_matched:
+            self.log_test("Job Move", True, "Job left the Bangalore vendor's view after moving to Mumbai")
+        else:
+            self.log_test("Job Move", False,
+                          error=f"Listed before: {before}, after: {after}, still matched: {still_matched}")
+
+    def test_job_view_details(self):
+        """Test job reads carry the GU and enterprise details denormalized onto jobs"""
+        print("\n🔍 Testing Job View Details...")
+        
+        if 'vendor' not in self.tokens or 'test_job' not in self.jobs:
+            self.log_test("Job View Details", False, error="No vendor token or test job available")
+            return
+        
+        success, response, status = self.make_request('GET', 'jobs/vendor-view',
+                                                    token=self.tokens['vendor'], expected_status=200)
+        job = next((job for job in response if job.get('id') == self.jobs['test_job']['id']), None) if success else None
+        if not job:
+            self.log_test("Job View Details", False, error=f"Test job not in vendor view (status {status})")
+            return
+        
+        gu = self.gus['test_gu']
+        expected = {
+            "facility_name": gu['facility_name'],
+            "city": gu['city'],
+            "state": gu['state'],
+            "pin_code": gu['pin_code'],
+        }
+        gu_details = job.get('gu_details') or {}
+        mismatched = [field for field, value in expected.items() if gu_details.get(field) != value]
+        enterprise_name = (job.get('enterprise_details') or {}).get('name')
+        if mismatched or enterprise_name != self.enterprises['test_enterprise']['name']:
+            self.log_test("Job View Details", False,
+                          error=f"Mismatched GU fields {mismatched}, enterprise name {enterprise_name!r}")
+        else:
+            self.log_test("Job View Details", True, f"{gu['facility_name']}, {gu['city']} ({enterprise_name})")
+
+        success, response, status = self.make_request('POST', 'admin/job-view/rebuild', expected_status=403)
+        if success:
+            self.log_test("Job View Rebuild Auth", True, "Anonymous rebuild rejected")
+        else:
+            self.log_test("Job View Rebuild Auth", False, error=f"Expected 403, got {status}")
+
+    def test_job_search(self):
+        """Test free-text job search with ranked results and facet counts"""
+        print("\n🔍 Testing Job Search...")
+        
+        if 'job_seeker' not in self.tokens or 'test_job' not in self.jobs:
+            self.log_test("Job Search", False, error="No job seeker token or test job available")
+            return
+        
+        job = self.jobs['test_job']
+        gu = self.gus['test_gu']
+        success, response, status = self.make_request('GET', f"jobs/search?q=warehouse+shelves&city={gu['city']}",
+                                                    token=self.tokens['job_seeker'], expected_status=200)
+        if not success:
+            self.log_test("Job Search - Text", False, error=f"Status: {status}, Response: {response}")
+            return
+        
+        found = any(result.get('id') == job['id'] for result in response.get('results', []))
+        facets = response.get('facets', {})
+        missing_facets = [facet for facet in ("role", "city", "state", "nature_of_job", "enterprise") if facet not in facets]
+        city_counts = {bucket['value']: bucket['count'] for bucket in facets.get('city', [])}
+        if not found:
+            self.log_test("Job Search - Text", False, error=f"Test job not found by its description: {response}")
+        elif (missing_facets or response.get('facets_approximate') or set(city_counts) != {gu['city']}
+              or city_counts[gu['city']] != response.get('total')):
+            self.log_test("Job Search - Facets", False, error=f"Missing facets {missing_facets}, city facet {city_counts}")
+        else:
+            self.log_test("Job Search", True, f"{response['total']} matches in {gu['city']}, "
+                                              f"{len(facets['role'])} roles, {len(facets['enterprise'])} enterprises")
+        
+        success, response, status = self.make_request('GET', 'jobs/search?q=zzzqqxnomatch',
+                                                    token=self.tokens['job_seeker'], expected_status=200)
+        if success and response.get('total') == 0 and not response.get('results'):
+            self.log_test("Job Search - No Matches", True, "Empty result set")
+        else:
+            self.log_test("Job Search - No Matches", False, error=f"Status: {status}, Response: {response}")
+
+        # Browsing without a query: newest first, an exact total, facets over the top of the ranking
+        success, response, status = self.make_request('GET', 'jobs/search', token=self.tokens['job_seeker'])
+        created = [result.get('created_at') for result in response.get('results', [])] if success else []
+        sample = response.get('facet_sample_size') if success else None
+        if success and created and created == sorted(created, reverse=True) and sample is not None \
+                and response['facets_approximate'] == (sample < response['total']):
+            self.log_test("Job Search - Browse", True, f"{response['total']} open jobs, facets over {sample}")
+        else:
+            self.log_test("Job Search - Browse", False, error=f"Status: {status}, Response: {response}")
+
     def test_job_commitment(self):
         """Test job commitment by vendor"""
         print("\n🔍 Testing Job Commitment...")
@@ -285,6 +423,189 @@ class SetuHubAPITester:
         else:
             self.log_test("Job Commitment", False, error=f"Status: {status}, Response: {response}")
 
+    def test_concurrent_commitments(self, attempts=200):
+        """Test that simultaneous commitments to one job produce exactly one winner"""
+        print("\n🔍 Testing Concurrent Job Commitments...")
+        
+        if 'test_gu' not in self.gus or 'test_enterprise' not in self.enterprises or 'test_vendor' not in self.vendors:
+            self.log_test("Concurrent Commitments", False, error="No GU, enterprise or vendor available")
+            return
+        
+        job_data = {
+            "enterprise_id": self.enterprises['test_enterprise']['id'],
+            "gu_id": self.gus['test_gu']['id'],
+            "role": "picker",
+            "quantity_required": 10
+        }
+        success, job, status = self.make_request('POST', 'jobs', job_data, token=self.tokens['enterprise'])
+        if not success:
+            self.log_test("Concurrent Commitments", False, error=f"Job creation failed: {status}")
+            return
+        
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def commit(attempt):
+            response = requests.post(f"{self.base_url}/commitments", json={
+                "job_id": job['id'],
+                "vendor_id": self.vendors['test_vendor']['id'],
+                "poc_name": f"Stress POC {attempt}",
+                "poc_contact": "+91 9876543299"
+            }, headers={'Authorization': f'Bearer {self.tokens["vendor"]}'})
+            return response.status_code
+        
+        with ThreadPoolExecutor(max_workers=50) as pool:
+            statuses = list(pool.map(commit, range(attempts)))
+        
+        success, commitments, status = self.make_request('GET', f"commitments?job_id={job['id']}",
+                                                         token=self.tokens['vendor'])
+        winners = statuses.count(200)
+        if winners == 1 and statuses.count(400) == attempts - 1 and len(commitments) == 1:
+            self.log_test("Concurrent Commitments", True, f"1 winner out of {attempts} simultaneous commits")
+        else:
+            self.log_test("Concurrent Commitments", False,
+                          error=f"{winners} winners, {len(commitments)} commitments stored, statuses: {set(statuses)}")
+
+    def test_reopen_and_recommit(self):
+        """Test that a fully committed job can be re-opened and committed again"""
+        print("\n🔍 Testing Re-open and Re-commit...")
+        
+        if 'test_gu' not in self.gus or 'test_enterprise' not in self.enterprises or 'test_vendor' not in self.vendors:
+            self.log_test("Re-open and Re-commit", False, error="No GU, enterprise or vendor available")
+            return
+        
+        success, job, status = self.make_request('POST', 'jobs', {
+            "enterprise_id": self.enterprises['test_enterprise']['id'],
+            "gu_id": self.gus['test_gu']['id'],
+            "role": "picker",
+            "quantity_required": 2
+        }, token=self.tokens['enterprise'])
+        if not success:
+            self.log_test("Re-open and Re-commit", False, error=f"Job creation failed: {status}")
+            return
+        
+        def commit(vendor_id, quantity=None):
+            return self.make_request('POST', 'commitments', {
+                "job_id": job['id'],
+                "vendor_id": vendor_id,
+                "poc_name": "Re-commit POC",
+                "poc_contact": "+91 9876543297",
+                **({"quantity": quantity} if quantity else {})
+            }, token=self.tokens['vendor'])
+        
+        success, _, status = commit(self.vendors['test_vendor']['id'])
+        if not success:
+            self.log_test("Re-open and Re-commit", False, error=f"First commitment failed: {status}")
+            return
+        
+        # The enterprise needs two more workers: re-open the job with a higher quantity
+        self.make_request('PUT', f"jobs/{job['id']}/status", {"status": "open", "quantity_required": 4},
+                          token=self.tokens['enterprise'])
+        success, reopened, status = self.make_request('GET', f"jobs/{job['id']}", token=self.tokens['enterprise'])
+        if not success or reopened.get('remaining_quantity') != 2 or reopened.get('committed_vendor_id'):
+            self.log_test("Re-open and Re-commit", False,
+                          error=f"Re-opened job should have 2 remaining and no committed vendor: {reopened}")
+            return
+        
+        email = f"recommit_{datetime.now().strftime('%H%M%S%f')}@test.com"
+        success, response, status = self.make_request('POST', 'auth/register', {
+            "email": email,
+            "password": "TestPass123!",
+            "user_type": "vendor",
+            "full_name": "Re-commit Vendor",
+            "phone": "+91 9876543297"
+        })
+        if success:
+            success, vendor, status = self.make_request('POST', 'vendors', {
+                "name": "Re-commit Vendor",
+                "email": email,
+                "phone": "+91 9876543297",
+                "operating_states": ["Karnataka"],
+                "operating_cities": ["Bangalore"],
+                "services_offered": ["picker"]
+            }, token=response['token'])
+        if not success:
+            self.log_test("Re-open and Re-commit", False, error=f"Second vendor creation failed: {status}")
+            return
+        success, commitment, status = commit(vendor['id'])
+        success_after, job_after, _ = self.make_request('GET', f"jobs/{job['id']}", token=self.tokens['enterprise'])
+        if success and commitment.get('quantity') == 2 and job_after.get('status') == 'vendor_committed' \
+                and job_after.get('remaining_quantity') == 0:
+            self.log_test("Re-open and Re-commit", True, "Re-opened job committed again for the remaining 2")
+        else:
+            self.log_test("Re-open and Re-commit", False,
+                          error=f"Status: {status}, commitment: {commitment}, job: {job_after}")
+
+    def test_partial_commitments(self, vendors=8, quantity_required=5):
+        """Test that concurrent partial commitments fill a job exactly once without overbooking"""
+        print("\n🔍 Testing Partial Quantity Commitments...")
+        
+        if 'test_gu' not in self.gus or 'test_enterprise' not in self.enterprises:
+            self.log_test("Partial Commitments", False, error="No GU or enterprise available")
+            return
+        
+        # A dedicated vendor user owning several vendor profiles
+        suffix = datetime.now().strftime('%H%M%S%f')
+        success, response, status = self.make_request('POST', 'auth/register', {
+            "email": f"partial_vendor_{suffix}@test.com",
+            "password": "TestPass123!",
+            "user_type": "vendor",
+            "full_name": "Partial Commit Vendor",
+            "phone": "+91 9876543298"
+        })
+        if not success:
+            self.log_test("Partial Commitments", False, error=f"Vendor registration failed: {status}")
+            return
+        token = response['token']
+        
+        vendor_ids = []
+        for i in range(vendors):
+            success, vendor, status = self.make_request('POST', 'vendors', {
+                "name": f"Partial Vendor {i}",
+                "email": f"partial_vendor_{suffix}_{i}@test.com",
+                "phone": "+91 9876543298",
+                "operating_states": ["Karnataka"],
+                "operating_cities": ["Bangalore"],
+                "services_offered": ["picker"]
+            }, token=token)
+            if success:
+                vendor_ids.append(vendor['id'])
+        
+        success, job, status = self.make_request('POST', 'jobs', {
+            "enterprise_id": self.enterprises['test_enterprise']['id'],
+            "gu_id": self.gus['test_gu']['id'],
+            "role": "picker",
+            "quantity_required": quantity_required
+        }, token=self.tokens['enterprise'])
+        if not success or len(vendor_ids) != vendors:
+            self.log_test("Partial Commitments", False, error="Setup failed")
+            return
+        
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def commit(vendor_id):
+            response = requests.post(f"{self.base_url}/commitments", json={
+                "job_id": job['id'],
+                "vendor_id": vendor_id,
+                "poc_name": "Partial POC",
+                "poc_contact": "+91 9876543297",
+                "quantity": 1
+            }, headers={'Authorization': f'Bearer {token}'})
+            return response.status_code
+        
+        with ThreadPoolExecutor(max_workers=vendors) as pool:
+            statuses = list(pool.map(commit, vendor_ids))
+        
+        success, job_after, status = self.make_request('GET', f"jobs/{job['id']}", token=token)
+        winners = statuses.count(200)
+        if winners == quantity_required and job_after.get('remaining_quantity') == 0 \
+                and job_after.get('status') == 'vendor_committed':
+            self.log_test("Partial Commitments", True,
+                          f"{winners} of {vendors} vendors committed 1 each, job fully covered")
+        else:
+            self.log_test("Partial Commitments", False,
+                          error=f"{winners} winners, job state: {job_after.get('status')}, "
+                                f"remaining {job_after.get('remaining_quantity')}")
+
     def test_dashboard_stats(self):
         """Test dashboard statistics"""
         print("\n🔍 Testing Dashboard Statistics...")
@@ -442,6 +763,63 @@ class SetuHubAPITester:
         else:
             self.log_test("Role Filter", False, error=f"Status: {status2}")
 
+    def test_city_filter_consistency(self):
+        """Test server-side city filter matches the GU-by-GU comparison on a seeded dataset"""
+        print("\n🔍 Testing City Filter Consistency...")
+        
+        if 'enterprise' not in self.tokens or 'test_enterprise' not in self.enterprises:
+            self.log_test("City Filter Consistency", False, error="No enterprise token or enterprise available")
+            return
+        
+        enterprise_id = self.enterprises['test_enterprise']['id']
+        token = self.tokens['enterprise']
+        
+        # Seed facilities across cities (mixed case on purpose) with jobs in each
+        for city, state, pin_code in [("Pune", "Maharashtra", "411001"), ("pune", "Maharashtra", "411014"),
+                                      ("Mumbai", "Maharashtra", "400001"), ("Punei", "Maharashtra", "411002")]:
+            gu_data = {
+                "enterprise_id": enterprise_id,
+                "facility_type": "fc",
+                "facility_name": f"{city} Test FC",
+                "zone_name": "Test Zone",
+                "address": "1 Test Road",
+                "city": city,
+                "state": state,
+                "pin_code": pin_code
+            }
+            success, gu, status = self.make_request('POST', 'gus', gu_data, token=token)
+            if not success:
+                self.log_test("City Filter Consistency", False, error=f"GU seeding failed: {status}")
+                return
+            for role in ["picker", "loader"]:
+                job_data = {
+                    "enterprise_id": enterprise_id,
+                    "gu_id": gu['id'],
+                    "role": role,
+                    "quantity_required": 2
+                }
+                self.make_request('POST', 'jobs', job_data, token=token)
+        
+        success, all_jobs, status = self.make_request('GET', f'jobs?enterprise_id={enterprise_id}', token=token)
+        success2, gus, status2 = self.make_request('GET', f'gus?enterprise_id={enterprise_id}', token=token)
+        if not (success and success2):
+            self.log_test("City Filter Consistency", False, error=f"Status: {status}/{status2}")
+            return
+        
+        # Previous behavior: compare each job's GU city case-insensitively
+        gu_cities = {gu['id']: gu['city'] for gu in gus}
+        for city in ["PUNE", "mumbai", "Nowhere"]:
+            expected = sorted(job['id'] for job in all_jobs
+                              if gu_cities.get(job['gu_id'], "").lower() == city.lower())
+            success, response, status = self.make_request('GET', f'jobs?enterprise_id={enterprise_id}&city={city}',
+                                                        token=token)
+            actual = sorted(job['id'] for job in response) if success else None
+            if actual == expected:
+                self.log_test(f"City Filter Consistency ({city})", True, f"{len(actual)} jobs matched")
+            else:
+                self.log_test(f"City Filter Consistency ({city})", False,
+                              error=f"Expected {len(expected)} jobs, got {actual if actual is None else len(actual)}")
+
     def test_application_management(self):
         """Test application management for enterprises"""
         print("\n🔍 Testing Application Management...")
@@ -651,6 +1029,107 @@ class SetuHubAPITester:
         else:
             self.log_test("Market Stats Response Time", False, error=f"Endpoint failed: {status}")
 
+    def test_response_cache(self):
+        """Test cached responses ignore undeclared query params and purging needs auth"""
+        print("\n🔍 Testing Response Cache...")
+
+        url = f"{self.base_url}/homepage/job-roles"
+        self.session.get(url)
+        response = self.session.get(url, params={"cb": str(uuid.uuid4())})
+        if response.status_code == 200 and response.headers.get("X-Cache") == "HIT":
+            self.log_test("Response Cache - Key", True, "Cache-busting query param served from cache")
+        else:
+            self.log_test("Response Cache - Key", False,
+                          error=f"Status: {response.status_code}, X-Cache: {response.headers.get('X-Cache')}")
+
+        success, response, status = self.make_request('POST', 'admin/response-cache/purge', expected_status=403)
+        success2, response2, status2 = self.make_request('POST', 'admin/response-cache/purge',
+                                                         token=self.tokens.get('enterprise'))
+        if success and success2 and 'purged' in response2:
+            self.log_test("Response Cache - Purge Auth", True, f"Purged {response2['purged']} entries when authenticated")
+        else:
+            self.log_test("Response Cache - Purge Auth", False, error=f"Anonymous: {status}, authenticated: {status2}")
+
+    def test_read_routing(self):
+        """Test dashboards are routed to secondaries while transactional routes stay on the primary"""
+        print("\n🔍 Testing Read Routing...")
+        
+        success, response, status = self.make_request('GET', 'admin/read-routing')
+        if not success:
+            self.log_test("Read Routing", False, error=f"Status: {status}")
+            return
+        
+        routes = response.get('routes', {})
+        analytics_mode = response.get('analytics', {}).get('mode')
+        expected = [
+            "GET /api/dashboard/enterprise/{enterprise_id}",
+            "GET /api/dashboard/vendor/{vendor_id}",
+            "GET /api/homepage/market-stats",
+            "GET /api/admin/dashboard",
+        ]
+        missing = [route for route in expected if route not in routes]
+        if missing:
+            self.log_test("Read Routing - Dashboards", False, error=f"Not routed to analytics reads: {missing}")
+        elif any(routes[route] != analytics_mode for route in expected):
+            self.log_test("Read Routing - Dashboards", False, error=f"Unexpected read preferences: {routes}")
+        else:
+            self.log_test("Read Routing - Dashboards", True, f"{len(expected)} routes read with {analytics_mode}")
+
+        # Serve reads through the analytics handle, not just declare them
+        failed = []
+        for endpoint in ["homepage/market-stats", "admin/dashboard"]:
+            success, response, status = self.make_request('GET', endpoint)
+            if not success:
+                failed.append(f"{endpoint}: {status}")
+        if failed:
+            self.log_test("Read Routing - Analytics Reads", False, error=", ".join(failed))
+        else:
+            self.log_test("Read Routing - Analytics Reads", True, "Market stats and admin dashboard served")
+
+        primary_only = [route for route in routes if route.split()[0] != "GET" or "commitments" in route]
+        if primary_only:
+            self.log_test("Read Routing - Primary Writes", False, error=f"Writes routed off the primary: {primary_only}")
+        else:
+            self.log_test("Read Routing - Primary Writes", True, f"Default read preference: {response.get('default')}")
+
+    def test_query_budgets(self):
+        """Test hot endpoints stay within their DB query budgets (no N+1 loops)"""
+        print("\n🔍 Testing Query Budgets...")
+        
+        # endpoint -> (token, max DB round trips per request)
+        budgets = {
+            "jobs": ("enterprise", 4),
+            "jobs?city=Pune": ("enterprise", 4),
+            "jobs/vendor-view": ("vendor", 6),
+            "applications": ("job_seeker", 8),
+            "homepage/recent-jobs": (None, 2),
+        }
+        repeat_limit = 3
+        
+        for endpoint, (token_type, budget) in budgets.items():
+            headers = {'X-Query-Budget': str(budget)}
+            if token_type:
+                if token_type not in self.tokens:
+                    self.log_test(f"Query Budget {endpoint}", False, error=f"No {token_type} token available")
+                    continue
+                headers['Authorization'] = f'Bearer {self.tokens[token_type]}'
+            
+            response = self.session.get(f"{self.base_url}/{endpoint}", headers=headers)
+            query_count = response.headers.get('X-Query-Count')
+            if query_count is None:
+                self.log_test(f"Query Budget {endpoint}", False,
+                              error="No X-Query-Count header; is QUERY_BUDGET_MODE enabled on the server?")
+                continue
+            
+            repeats = int(response.headers.get('X-Query-Repeats', 0))
+            if response.status_code == 200 and int(query_count) <= budget and repeats <= repeat_limit:
+                self.log_test(f"Query Budget {endpoint}", True,
+                              f"{query_count} queries (budget {budget}), max {repeats} same-shape")
+            else:
+                self.log_test(f"Query Budget {endpoint}", False,
+                              error=f"{query_count} queries (budget {budget}), max {repeats} same-shape, "
+                                    f"status {response.status_code}: {response.text[:200]}")
+
     def test_authentication_system_comprehensive(self):
         """Comprehensive authentication system testing as per review request"""
         print("\n🔍 Testing Authentication System Comprehensively...")
@@ -887,12 +1366,21 @@ class SetuHubAPITester:
         self.test_job_creation()
         self.test_bulk_job_upload()  # NEW: Test bulk upload
         self.test_vendor_profile_creation()
+        self.test_user_cache_invalidation()
         self.test_vendor_job_view()
+        self.test_job_move_rekeys_matching()
+        self.test_job_view_details()
+        self.test_job_search()
         self.test_job_commitment()
+        self.test_concurrent_commitments()
+        self.test_partial_commitments()
+        self.test_reopen_and_recommit()
         self.test_job_applications()  # NEW: Test job applications
         self.test_enhanced_filtering()  # NEW: Test enhanced filtering
+        self.test_city_filter_consistency()
         self.test_application_management()  # NEW: Test application management
         self.test_dashboard_with_applications()  # NEW: Test dashboard with applications
+        self.test_read_routing()
         self.test_job_seeker_view()
         self.test_data_persistence()
         
@@ -901,6 +1389,10 @@ class SetuHubAPITester:
         self.test_homepage_job_roles_endpoint()
         self.test_homepage_market_stats_endpoint()
         self.test_homepage_response_times()
+        self.test_response_cache()
+        
+        if self.query_budgets:
+            self.test_query_budgets()
         
         # Print summary
         print(f"\n📊 Test Summary:")
@@ -920,7 +1412,7 @@ class SetuHubAPITester:
 
 def main():
     """Main function to run backend tests"""
-    tester = SetuHubAPITester()
+    tester = SetuHubAPITester(query_budgets="--query-budgets" in sys.argv)
     
     # Check if we should run only authentication tests
     if len(sys.argv) > 1 and sys.argv[1] == "auth":
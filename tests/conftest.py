@@ -0,0 +1,44 @@
+"""
+In-process tests for backend internals (caches, parsers, the task queue) that
+the HTTP suite in backend_test.py can't reach.
+
+Database tests run against TEST_MONGO_URL when it is set (a scratch database
+is created and dropped per test), otherwise against mongomock-motor when it is
+installed, and are skipped when neither is available.
+"""
+
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", os.environ.get("TEST_MONGO_URL", "mongodb://localhost:27017"))
+os.environ.setdefault("DB_NAME", "setuhub_test")
+os.environ.setdefault("EVENTS_ENABLED", "false")
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def database(monkeypatch):
+    """A scratch database, installed as server.db for the duration of the test"""
+    name = f"setuhub_test_{uuid.uuid4().hex[:8]}"
+    if os.environ.get("TEST_MONGO_URL"):
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(os.environ["TEST_MONGO_URL"], event_listeners=[server.CommandMetricsListener()])
+    else:
+        mongomock_motor = pytest.importorskip("mongomock_motor", reason="set TEST_MONGO_URL or install mongomock-motor")
+        client = mongomock_motor.AsyncMongoMockClient()
+    database = client[name]
+    monkeypatch.setattr(server, "client", client)
+    monkeypatch.setattr(server, "db", database)
+    yield database
+    await client.drop_database(name)
@@ -0,0 +1,71 @@
+import io
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+ENTERPRISE = {"id": "ent-1", "name": "Test Enterprise"}
+GU = {"id": "gu-1", "enterprise_id": "ent-1", "facility_name": "Koramangala Hub", "facility_type": "dark_store",
+      "address": "1 Test Street", "city": "Bangalore", "state": "Karnataka", "pin_code": "560034"}
+OTHER_GU = {**GU, "id": "gu-2", "enterprise_id": "ent-2"}
+DESCRIPTION = 'Night shift, "cold" room\nಬೆಂಗಳೂರು — café'
+
+CSV = (
+    "enterprise_id,gu_id,role,quantity_required,description\n"
+    f'ent-1,gu-1,picker,3,"{DESCRIPTION.replace(chr(34), chr(34) * 2)}"\n'
+    "ent-1,,packer,2,missing a GU\n"
+    "ent-1,gu-404,packer,2,unknown GU\n"
+    "ent-1,gu-2,packer,2,another enterprise's GU\n"
+    "ent-1,gu-1,packer,lots,not a number\n"
+    "ent-1,gu-1,loader,1,ಲೋಡರ್\n"
+).encode("utf-8")
+
+
+def chunked_reader(data: bytes):
+    stream = io.BytesIO(data)
+
+    async def read_chunk(size: int) -> bytes:
+        return stream.read(size)
+    return read_chunk
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 2, 3, 7, 64 * 1024])
+def test_splitter_keeps_records_whole_across_chunks(chunk_bytes):
+    splitter = server.CSVRecordSplitter()
+    records = []
+    for start in range(0, len(CSV), chunk_bytes):
+        records += splitter.feed(CSV[start:start + chunk_bytes])
+    records += splitter.feed(b"", final=True)
+
+    assert "".join(records) == CSV.decode("utf-8")
+    assert len(records) == 7
+    assert DESCRIPTION.replace('"', '""') in records[1]
+
+
+def test_splitter_returns_an_unterminated_last_record():
+    splitter = server.CSVRecordSplitter()
+
+    assert splitter.feed("a,b\nc,ಡ".encode("utf-8")[:-1]) == ["a,b\n"]
+    assert splitter.feed("a,b\nc,ಡ".encode("utf-8")[-1:], final=True) == ["c,ಡ"]
+
+
+async def test_import_reports_each_bad_row(database, monkeypatch):
+    monkeypatch.setattr(server, "BULK_UPLOAD_CHUNK_BYTES", 5)
+    monkeypatch.setattr(server, "job_match_index", server.JobMatchIndex())
+    await database.enterprises.insert_many([dict(ENTERPRISE), {"id": "ent-2", "name": "Other"}])
+    await database.gus.insert_many([dict(GU), dict(OTHER_GU)])
+
+    result = await server.import_jobs_csv(chunked_reader(CSV), created_by="user-1")
+
+    assert result["total_rows"] == 6
+    assert result["jobs_created"] == 2
+    assert [error["row"] for error in result["errors"]] == [2, 3, 4, 5]
+    assert result["errors"][0]["error"] == "Missing fields: gu_id"
+    assert result["errors"][1]["error"] == "Unknown gu_id: gu-404"
+    assert result["errors"][2]["error"] == "GU does not belong to the given enterprise"
+    assert "invalid literal" in result["errors"][3]["error"]
+    jobs = {job["role"]: job async for job in database.jobs.find({}, {"_id": 0})}
+    assert jobs["picker"]["description"] == DESCRIPTION
+    assert jobs["loader"]["description"] == "ಲೋಡರ್"
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import os
+
+import pytest
+from starlette.requests import Request
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+USER = {"id": "user-e", "user_type": "enterprise", "enterprise_id": "ent-1"}
+# Resume tokens as two workers reading the same change stream would see them
+TOKENS = ["8265A0000000010000000001", "8265A0000000020000000001", "8265A0000000030000000001"]
+
+
+def event(token: str) -> server.MarketplaceEvent:
+    return server.MarketplaceEvent(id=token, type="job_created", job_id=f"job-{token[-9:]}", enterprise_id="ent-1",
+                                   occurred_at="2026-01-01T00:00:00+00:00")
+
+
+def sse_request(last_event_id=None) -> Request:
+    headers = [(b"last-event-id", last_event_id.encode())] if last_event_id else []
+    return Request({"type": "http", "method": "GET", "path": "/api/events/stream", "headers": headers})
+
+
+async def test_last_event_id_from_another_worker_resumes(monkeypatch):
+    worker_a, worker_b = server.EventBus(10, 10), server.EventBus(10, 10)
+    for token in TOKENS:
+        worker_a.publish(event(token))
+        worker_b.publish(event(token))
+    monkeypatch.setattr(server, "event_bus", worker_b)
+
+    # The client saw the first event on worker A, then reconnected to worker B
+    response = await server.stream_events(sse_request(TOKENS[0]), current_user=USER)
+    events = response.body_iterator
+    replayed = [await events.__anext__(), await events.__anext__()]
+    await events.aclose()
+
+    assert [f"id: {token}" in chunk for token, chunk in zip(TOKENS[1:], replayed)] == [True, True]
+    assert not worker_b.subscribers
+
+
+async def test_stream_subscribes_only_once_iterated(monkeypatch):
+    bus = server.EventBus(10, 10)
+    monkeypatch.setattr(server, "event_bus", bus)
+
+    response = await server.stream_events(sse_request(), current_user=USER)
+    assert not bus.subscribers
+
+    events = response.body_iterator
+    pending = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0)
+    assert len(bus.subscribers) == 1
+    bus.publish(event(TOKENS[0]))
+    assert f"id: {TOKENS[0]}" in await pending
+    await events.aclose()
+    assert not bus.subscribers
+
+
+async def test_unsupported_watch_disables_events_once(database, caplog):
+    if os.environ.get("TEST_MONGO_URL"):
+        pytest.skip("needs a client without change streams (mongomock)")
+    caplog.set_level(logging.WARNING, logger="server")
+
+    await asyncio.wait_for(server.watch_collection(database, "jobs"), timeout=2)
+
+    warnings = [record.message for record in caplog.records if "Change streams are not supported" in record.message]
+    assert len(warnings) == 1
+    assert not [record for record in caplog.records if record.exc_info]
@@ -0,0 +1,58 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+GU = {"id": "gu-blr", "enterprise_id": "ent-1", "city": "Bangalore", "state": "Karnataka", "pin_code": "560034"}
+JOB = {"id": "job-1", "enterprise_id": "ent-1", "gu_id": GU["id"], "role": "picker", "status": "open",
+       "created_at": "2026-01-01T00:00:00+00:00"}
+VENDOR = {"id": "vendor-1", "operating_cities": ["Bangalore"], "operating_states": [], "operating_pin_codes": [],
+          "services_offered": ["picker"], "created_at": "2026-01-01T00:00:00+00:00"}
+
+
+def vendor_change(operation, vendor, updated=None):
+    change = {"_id": {"_data": "82650000000100000001"}, "operationType": operation, "fullDocument": vendor}
+    if updated is not None:
+        change["updateDescription"] = {"updatedFields": updated}
+    return change
+
+
+async def test_vendor_changes_rekey_the_index(database):
+    index = server.JobMatchIndex()
+    index.add_vendor(VENDOR)
+    moved = {**VENDOR, "operating_cities": ["Mumbai"]}
+
+    [event] = await server.change_to_events(database, "vendors",
+                                            vendor_change("update", moved, {"operating_cities": ["Mumbai"]}))
+    index.apply_event(event)
+
+    assert event.type == "vendor_updated"
+    assert index.vendors_for_job(JOB, GU) == set()
+    assert index.vendors_for_job(JOB, {**GU, "city": "Mumbai"}) == {VENDOR["id"]}
+
+
+async def test_unrelated_vendor_updates_are_not_events(database):
+    change = vendor_change("update", VENDOR, {"company_name": "Renamed"})
+
+    assert await server.change_to_events(database, "vendors", change) == []
+
+
+async def test_matching_vendors_uses_the_database_while_the_index_may_be_stale(database, monkeypatch):
+    index = server.JobMatchIndex()
+    await index.rebuild(database)
+    monkeypatch.setattr(server, "job_match_index", index)
+    await database.gus.insert_one(dict(GU))
+    await database.jobs.insert_one(dict(JOB))
+    # Registered on another worker after this one's rebuild
+    await database.vendors.insert_one(dict(VENDOR))
+
+    index.rebuilt_at -= server.MATCH_INDEX_MAX_STALENESS_SECONDS + 1
+    result = await server.get_matching_vendors(JOB["id"], current_user={})
+    assert result["vendor_ids"] == [VENDOR["id"]]
+
+    # With the vendors change stream live the index answers, and has the vendor
+    index.live.add("vendors")
+    [event] = await server.change_to_events(database, "vendors", vendor_change("insert", VENDOR))
+    index.apply_event(event)
+    assert (await server.get_matching_vendors(JOB["id"], current_user={}))["vendor_ids"] == [VENDOR["id"]]
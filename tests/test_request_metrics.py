@@ -0,0 +1,117 @@
+import asyncio
+import os
+import re
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+# (command, collection, filter, duration in microseconds, outcome)
+COMMANDS = [
+    ("find", "jobs", {"id": "job-1"}, 1500, "succeeded"),
+    ("find", "jobs", {"id": "job-2"}, 2500, "succeeded"),
+    ("aggregate", "jobs", {"status": "open"}, 1000, "failed"),
+]
+
+
+def server_timing_db(response: httpx.Response):
+    """(db milliseconds, command count) from the Server-Timing header"""
+    match = re.search(r'db;dur=([\d.]+);desc="(\d+) commands"', response.headers["server-timing"])
+    return float(match.group(1)), int(match.group(2))
+
+
+def db_command_totals():
+    """Commands and seconds observed by every driver command so far, across all labels"""
+    with server.DB_COMMAND_SECONDS.lock:
+        series = list(server.DB_COMMAND_SECONDS.values.values())
+    return sum(count for _, _, count in series), sum(total for _, total, _ in series)
+
+
+@pytest.fixture
+def reporting(monkeypatch):
+    monkeypatch.setattr(server, "SERVER_TIMING_ENABLED", True)
+    monkeypatch.setattr(server, "QUERY_BUDGET_MODE", "log")
+
+
+async def test_commands_are_attributed_to_the_request_that_issued_them(reporting):
+    listener = server.CommandMetricsListener()
+    app = FastAPI()
+    app.add_middleware(server.MetricsMiddleware)
+
+    def driver(name, collection, query, duration_micros, outcome):
+        event = SimpleNamespace(command_name=name, duration_micros=duration_micros,
+                                command={name: collection, "filter": query} if name == "find" else
+                                {name: collection, "pipeline": [{"$match": query}]})
+        listener.started(event)
+        getattr(listener, outcome)(event)
+
+    @app.get("/known")
+    async def known():
+        # Motor runs driver calls on executor threads with a copy of the request's context
+        for command in COMMANDS:
+            await asyncio.to_thread(driver, *command)
+        # A thread without that context (e.g. a monitor) isn't charged to the request
+        await asyncio.get_running_loop().run_in_executor(None, driver, "find", "users", {}, 9000, "succeeded")
+        return {}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        response = await http.get("/known")
+
+    assert response.headers["x-query-count"] == "3"
+    assert response.headers["x-query-repeats"] == "2"  # the two finds share a shape
+    assert server_timing_db(response) == (5.0, 3)
+
+
+async def test_endpoint_reports_its_commands_and_db_time(database, reporting, monkeypatch):
+    if not os.environ.get("TEST_MONGO_URL"):
+        pytest.skip("needs a real mongod: mongomock issues no driver command events")
+    monkeypatch.setattr(server, "user_cache", server.UserCache(server.LocalCacheBackend(10), ttl=30))
+    monkeypatch.setattr(server, "job_match_index", server.JobMatchIndex())
+    user = {"id": "user-1", "email": "user1@test.com", "user_type": "enterprise", "full_name": "User One"}
+    await database.users.insert_one(dict(user))
+    await database.gus.insert_one({"id": "gu-1", "city": "Bangalore", "state": "Karnataka", "pin_code": "560034"})
+    await database.jobs.insert_one({"id": "job-1", "gu_id": "gu-1", "role": "picker", "status": "open"})
+    token = server.create_token({"user_id": user["id"], "user_type": user["user_type"]})
+
+    commands_before, seconds_before = db_command_totals()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://test") as http:
+        response = await http.get("/api/jobs/job-1/matching-vendors", headers={"Authorization": f"Bearer {token}"})
+    commands_after, seconds_after = db_command_totals()
+
+    assert response.status_code == 200
+    # The user (an auth cache miss), the job, its GU, and the vendors query:
+    # the match index isn't ready, so the route falls back to the database
+    assert response.headers["x-query-count"] == "4"
+    assert commands_after - commands_before == 4
+    db_ms, commands = server_timing_db(response)
+    assert commands == 4
+    assert db_ms == pytest.approx((seconds_after - seconds_before) * 1000, abs=0.051)  # rounded to 0.1 ms
+
+
+async def test_reconcile_sums_commitment_response_times(database):
+    if not os.environ.get("TEST_MONGO_URL"):
+        pytest.skip("needs a real mongod: mongomock has no $dateFromString")
+    await database.jobs.insert_many([
+        {"id": "job-1", "status": "vendor_committed", "created_at": "2026-01-01T00:00:00+00:00"},
+        {"id": "job-2", "status": "open", "created_at": "2026-01-01T00:00:00.500000+00:00"},
+        {"id": "job-3", "status": "open", "created_at": "not a timestamp"},
+    ])
+    await database.commitments.insert_many([
+        {"id": "c-1", "job_id": "job-1", "commitment_timestamp": "2026-01-01T02:00:00+00:00"},
+        {"id": "c-2", "job_id": "job-2", "commitment_timestamp": "2026-01-01T04:30:00.500000+00:00"},
+        # Skipped: unparseable on either side, or no job
+        {"id": "c-3", "job_id": "job-3", "commitment_timestamp": "2026-01-01T01:00:00+00:00"},
+        {"id": "c-4", "job_id": "job-1", "commitment_timestamp": None},
+        {"id": "c-5", "job_id": "job-404", "commitment_timestamp": "2026-01-01T01:00:00+00:00"},
+    ])
+
+    stats = await server.reconcile_market_stats(database)
+
+    assert stats["response_count"] == 2
+    assert stats["response_hours_sum"] == pytest.approx(6.5)
+    assert (stats["total_jobs"], stats["active_jobs"]) == (3, 2)
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """Test task types; the retry backoff is zeroed so a failed task is due again at once"""
+    monkeypatch.setattr(server, "TASK_RETRY_BASE_SECONDS", 0)
+    calls = []
+
+    async def flaky(payload):
+        calls.append(payload)
+        raise RuntimeError("downstream unavailable")
+
+    async def ok(payload):
+        calls.append(payload)
+        return {"done": payload["n"]}
+
+    monkeypatch.setitem(server.task_handlers, "test_flaky", flaky)
+    monkeypatch.setitem(server.task_handlers, "test_ok", ok)
+    return calls
+
+
+async def drain(worker_id: str) -> int:
+    """Claim and run tasks until none is due; returns how many runs there were"""
+    runs = 0
+    while (task := await server.claim_task(worker_id)) is not None:
+        await server.run_task(task)
+        runs += 1
+    return runs
+
+
+async def test_failing_task_is_retried_then_dead_lettered(database, handlers):
+    task = await server.enqueue_task("test_flaky", {"n": 1}, max_attempts=3)
+
+    assert await drain("worker-a") == 3
+
+    stored = await database.tasks.find_one({"id": task["id"]}, {"_id": 0})
+    assert stored["status"] == "dead" and stored["attempts"] == 3
+    assert stored["error"] == "RuntimeError: downstream unavailable"
+    dead = await database.tasks_dead_letter.find({"id": task["id"]}, {"_id": 0}).to_list(None)
+    assert len(dead) == 1 and dead[0]["attempts"] == 3
+    assert len(handlers) == 3
+
+
+async def test_expired_lease_is_reclaimed_by_another_consumer(database, handlers):
+    task = await server.enqueue_task("test_ok", {"n": 1})
+    stalled = await server.claim_task("worker-a")
+    assert await server.claim_task("worker-b") is None
+
+    # worker-a stops heartbeating and its visibility timeout lapses
+    await database.tasks.update_one({"id": task["id"]}, {"$set": {"visible_until": server.task_time(-1)}})
+    reclaimed = await server.claim_task("worker-b")
+
+    assert reclaimed["id"] == task["id"]
+    assert reclaimed["worker_id"] == "worker-b" and reclaimed["attempts"] == 2
+    await server.run_task(reclaimed)
+    # The stalled worker finishing late can't overwrite the new owner's outcome
+    await server.fail_task(stalled, "late failure")
+    stored = await database.tasks.find_one({"id": task["id"]}, {"_id": 0})
+    assert stored["status"] == "succeeded" and stored["result"] == {"done": 1}
+
+
+async def test_concurrent_consumers_never_claim_the_same_task(database, handlers):
+    tasks = [await server.enqueue_task("test_ok", {"n": n}) for n in range(40)]
+
+    claims = await asyncio.gather(*(server.claim_task(f"worker-{i}") for i in range(80)))
+
+    claimed = [task["id"] for task in claims if task is not None]
+    assert len(claimed) == len(set(claimed)) == len(tasks)
+    assert await database.tasks.count_documents({"status": "running", "attempts": 1}) == len(tasks)
+
+
+async def test_worker_consumers_run_queued_tasks(database, handlers, monkeypatch):
+    monkeypatch.setattr(server, "TASK_POLL_SECONDS", 0.01)
+    tasks = [await server.enqueue_task("test_ok", {"n": n}) for n in range(5)]
+
+    # What worker.py starts
+    consumers = server.start_task_consumers(2, "worker")
+    try:
+        for _ in range(200):
+            if await database.tasks.count_documents({"status": "succeeded"}) == len(tasks):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        for consumer in consumers:
+            consumer.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+
+    stored = await database.tasks.find({}, {"_id": 0}).to_list(None)
+    assert sorted(task["result"]["done"] for task in stored if task["status"] == "succeeded") == list(range(5))
+    assert all(task["worker_id"].startswith("worker-") for task in stored)
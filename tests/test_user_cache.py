@@ -0,0 +1,67 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+redis = pytest.importorskip("redis.asyncio", reason="the shared user cache needs redis-py")
+
+USER = {"id": "user-1", "email": "user1@test.com", "user_type": "vendor", "full_name": "User One"}
+
+
+class RecordingRedis(redis.Redis):
+    """A real redis-py client (argument validation included) that records commands instead of sending them"""
+
+    def __init__(self):
+        super().__init__()
+        self.commands = []
+
+    async def execute_command(self, *args, **options):
+        self.commands.append(args)
+        return True
+
+
+def unreachable_redis():
+    return redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.5)
+
+
+async def test_redis_set_uses_whole_seconds():
+    backend = RecordingRedis()
+    cache = server.UserCache(backend, ttl=30.5)
+
+    await cache.set(USER)
+
+    assert cache.errors == 0
+    assert backend.commands == [("SET", "user:user-1", server.json.dumps(USER), "EX", 31)]
+
+
+async def test_redis_errors_count_as_misses():
+    cache = server.UserCache(unreachable_redis(), ttl=30)
+
+    assert await cache.get(USER["id"]) is None
+    await cache.set(USER)
+    await cache.invalidate(USER["id"])
+
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["errors"] == 3
+
+
+async def test_auth_falls_back_to_the_database_when_redis_is_down(database, monkeypatch):
+    monkeypatch.setattr(server, "user_cache", server.UserCache(unreachable_redis(), ttl=30))
+    await database.users.insert_one({**USER, "password": "hash"})
+
+    user = await server.user_from_token(server.create_token({"user_id": USER["id"], "user_type": "vendor"}))
+
+    assert user == USER
+    assert server.user_cache.errors == 2  # the failed get and the failed set
+
+
+async def test_local_backend_invalidation():
+    cache = server.UserCache(server.LocalCacheBackend(10), ttl=30)
+    await cache.set(USER)
+    assert await cache.get(USER["id"]) == USER
+
+    await cache.invalidate(USER["id"])
+
+    assert await cache.get(USER["id"]) is None
+    assert cache.stats()["invalidations"] == 1
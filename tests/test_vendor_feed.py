@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+VENDOR_USER = {"id": "user-v", "user_type": "vendor"}
+BANGALORE_GU = {"id": "gu-blr", "enterprise_id": "ent-1", "facility_name": "Koramangala Hub", "facility_type": "dark_store",
+                "address": "1 Test Street", "city": "Bangalore", "state": "Karnataka", "pin_code": "560034"}
+MUMBAI_GU = {**BANGALORE_GU, "id": "gu-bom", "city": "Mumbai", "state": "Maharashtra", "pin_code": "421302"}
+VENDOR = {"id": "vendor-1", "operating_cities": ["Bangalore"], "operating_states": [], "operating_pin_codes": [],
+          "services_offered": ["picker"]}
+
+
+def job_doc(job_id="job-1", gu=BANGALORE_GU, status="open"):
+    return {"id": job_id, "enterprise_id": "ent-1", "gu_id": gu["id"], "role": "picker", "status": status,
+            "quantity_required": 1, "remaining_quantity": 1, "created_at": "2026-01-01T00:00:00+00:00",
+            **server.job_view_fields(gu, {"name": "Test Enterprise"})}
+
+
+async def test_subscribes_only_once_the_feed_is_iterated(database):
+    before = len(server.event_bus.subscribers)
+
+    response = await server.stream_vendor_jobs(limit=10, current_user=VENDOR_USER)
+    # A client that drops before the body is iterated leaves nothing behind
+    assert len(server.event_bus.subscribers) == before
+
+    feed = response.body_iterator
+    assert "event: ready" in await feed.__anext__()
+    assert len(server.event_bus.subscribers) == before + 1
+
+    await feed.aclose()
+    assert len(server.event_bus.subscribers) == before
+
+
+async def test_job_is_read_once_per_event(database, monkeypatch):
+    await database.jobs.insert_one(job_doc())
+    enrichments = []
+    attach_job_details = server.attach_job_details
+
+    async def counting_attach(jobs, loader):
+        enrichments.append([job["id"] for job in jobs])
+        return await attach_job_details(jobs, loader)
+
+    monkeypatch.setattr(server, "attach_job_details", counting_attach)
+    monkeypatch.setattr(server, "vendor_feed_payloads", server.EventPayloads(10))
+    event = server.MarketplaceEvent(id="82650000000100000001", type="job_created", job_id="job-1",
+                                    occurred_at="2026-01-01T00:00:00+00:00")
+
+    payloads = await asyncio.gather(*(server.vendor_feed_job(event) for _ in range(20)))
+
+    assert enrichments == [["job-1"]]
+    assert len(set(payloads)) == 1 and '"id": "job-1"' in payloads[0]
+
+
+async def test_closed_job_has_no_payload(database):
+    await database.jobs.insert_one(job_doc(status="vendor_committed"))
+    event = server.MarketplaceEvent(id="82650000000200000001", type="job_status_changed", job_id="job-1",
+                                    occurred_at="2026-01-01T00:00:00+00:00")
+
+    assert await server.vendor_feed_job(event) is None
+
+
+async def test_moved_job_still_reaches_vendors_it_left(database):
+    await database.gus.insert_many([dict(BANGALORE_GU), dict(MUMBAI_GU)])
+    moved = job_doc(gu=MUMBAI_GU)
+    change = {
+        "_id": {"_data": "82650000000300000001"},
+        "operationType": "update",
+        "fullDocument": moved,
+        "fullDocumentBeforeChange": job_doc(),
+        "updateDescription": {"updatedFields": {"gu_id": MUMBAI_GU["id"]}},
+    }
+
+    [event] = await server.change_to_events(database, "jobs", change)
+
+    assert event.type == "job_moved"
+    assert ("picker", "city", "Mumbai") in event.match_keys
+    assert ("picker", "city", "Bangalore") in event.previous_match_keys
+    matches = server.event_filter(VENDOR_USER, VENDOR)
+    assert matches(event)
+    # ...and is sent as a removal: the new location is outside the vendor's keys
+    assert server.JobMatchIndex.vendor_keys(VENDOR).isdisjoint(event.match_keys)